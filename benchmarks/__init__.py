@@ -0,0 +1 @@
+"""Benchmarks for IMCA report table (run with ``python -m benchmarks.<name>``)."""
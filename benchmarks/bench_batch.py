@@ -0,0 +1,77 @@
+"""Compare one batch invocation against one CLI invocation per trip.
+
+Usage::
+
+    python -m benchmarks.bench_batch [--trips N] [--pucks-per-site N] [--jobs N]
+
+Both variants write an HTML report and a JSON cache per trip; the batch run
+also writes the combined index. Each variant runs as subprocesses, so
+interpreter start-up and imports are included just as in a nightly script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .synthetic import generate_trip
+
+_CLI = [sys.executable, "-m", "imca_report_table", "--no-console", "--quiet"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trips", type=int, default=24)
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--pucks-per-site", type=int, default=4)
+    parser.add_argument("--pins-per-puck", type=int, default=8)
+    parser.add_argument("--collections-per-pin", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=4, help="Worker threads for the batch run.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trips_dir = Path(tmp) / "trips"
+        for index in range(args.trips):
+            generate_trip(
+                trips_dir / f"trip{index:03d}",
+                sites=args.sites,
+                pucks_per_site=args.pucks_per_site,
+                pins_per_puck=args.pins_per_puck,
+                collections_per_pin=args.collections_per_pin,
+            )
+        roots = sorted(str(path) for path in trips_dir.iterdir())
+        out = Path(tmp) / "out"
+
+        start = time.perf_counter()
+        for root in roots:
+            name = Path(root).name
+            subprocess.run(
+                [*_CLI, root, "--output-html", str(out / "seq" / f"{name}.html"),
+                 "--output-json", str(out / "seq" / f"{name}.json")],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        subprocess.run(
+            [*_CLI, str(trips_dir / "*"), "--jobs", str(args.jobs),
+             "--output-html", str(out / "batch" / "index.html"),
+             "--output-json", str(out / "batch" / "index.json")],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        batch = time.perf_counter() - start
+
+    print(f"trips:       {args.trips}")
+    print(f"sequential:  {sequential:.2f}s ({sequential / args.trips:.3f}s per trip)")
+    print(f"batch:       {batch:.2f}s ({batch / args.trips:.3f}s per trip, --jobs {args.jobs})")
+    print(f"speed-up:    {sequential / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
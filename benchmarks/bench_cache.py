@@ -0,0 +1,74 @@
+"""Compare JSON and binary hierarchy cache save/load performance.
+
+Usage::
+
+    python -m benchmarks.bench_cache [--collections-per-pin N] [--images-per-camera N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from imca_report_table.traversal import build_hierarchy
+from imca_report_table.utils import (
+    load_hierarchy_binary,
+    load_hierarchy_json,
+    write_hierarchy_binary,
+    write_hierarchy_json,
+)
+
+from .synthetic import generate_trip
+
+
+def _best(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=2)
+    parser.add_argument("--pucks-per-site", type=int, default=10)
+    parser.add_argument("--pins-per-puck", type=int, default=10)
+    parser.add_argument("--collections-per-pin", type=int, default=2)
+    parser.add_argument("--images-per-camera", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generate_trip(
+            Path(tmp) / "trip",
+            sites=args.sites,
+            pucks_per_site=args.pucks_per_site,
+            pins_per_puck=args.pins_per_puck,
+            collections_per_pin=args.collections_per_pin,
+            images_per_camera=args.images_per_camera,
+        )
+        result = build_hierarchy(root)
+        image_paths = sum(
+            len(entry.metadata.get("image_files", []))
+            for *_, collection in result.trip.iter_collections()
+            for entry in collection.expected
+        )
+        print(f"collections: {sum(1 for _ in result.trip.iter_collections())}, image paths: {image_paths}")
+        print(f"{'format':<8} {'save':>8} {'load':>8} {'size':>10}")
+        for label, suffix, write, load in (
+            ("json", ".json", write_hierarchy_json, load_hierarchy_json),
+            ("binary", ".imcache", write_hierarchy_binary, load_hierarchy_binary),
+        ):
+            path = Path(tmp) / f"cache{suffix}"
+            save_time = _best(lambda: write(path, result), args.repeat)
+            load_time = _best(lambda: load(path), args.repeat)
+            size = path.stat().st_size
+            print(f"{label:<8} {save_time:7.3f}s {load_time:7.3f}s {size / 2**20:8.2f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare serial and parallel preview embedding on slow storage.
+
+Usage::
+
+    python -m benchmarks.bench_embedding [--workers 1,4,8] [--latency-ms MS] [--image-kb KB]
+
+Streams the report for a synthetic trip with each `--workers` value,
+reporting wall-clock time and the tracemalloc peak. `--latency-ms` adds a
+sleep before every image read to stand in for network filesystem latency
+(the synthetic tree otherwise sits in the page cache).
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from imca_report_table.render.assets import AssetResolver
+from imca_report_table.render.html import generate_html_report, write_html_report
+from imca_report_table.traversal import build_hierarchy
+
+from .synthetic import generate_trip
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,4,8")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--budget-mb", type=int, default=64)
+    parser.add_argument("--pucks-per-site", type=int, default=4)
+    parser.add_argument("--pins-per-puck", type=int, default=10)
+    parser.add_argument("--collections-per-pin", type=int, default=2)
+    parser.add_argument("--image-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    read_preview = AssetResolver._preview
+
+    def slow_preview(self: AssetResolver, path_str: str):
+        time.sleep(args.latency_ms / 1000)
+        return read_preview(self, path_str)
+
+    AssetResolver._preview = slow_preview
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generate_trip(
+            Path(tmp) / "trip",
+            sites=1,
+            pucks_per_site=args.pucks_per_site,
+            pins_per_puck=args.pins_per_puck,
+            collections_per_pin=args.collections_per_pin,
+            images_per_camera=3,
+            image_bytes=args.image_kb * 1024,
+            with_summary=True,
+        )
+        result = build_hierarchy(root)
+        output = Path(tmp) / "report.html"
+        for workers in (int(value) for value in args.workers.split(",")):
+            tracemalloc.start()
+            start = time.perf_counter()
+            write_html_report(
+                output,
+                generate_html_report(
+                    result, embed_workers=workers, embed_budget_bytes=args.budget_mb * 1024 * 1024
+                ),
+            )
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"workers {workers:>3}  {elapsed:7.2f}s  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
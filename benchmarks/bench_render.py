@@ -0,0 +1,68 @@
+"""Compare peak memory of string and streaming HTML rendering.
+
+Usage::
+
+    python -m benchmarks.bench_render [--collections-per-pin N] [--image-kb KB]
+
+Renders the same synthetic trip with ``render_html_report`` followed by
+``write_html_report`` and with ``generate_html_report`` streamed to disk,
+reporting wall-clock time and the tracemalloc peak for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from imca_report_table.render.html import (
+    generate_html_report,
+    render_html_report,
+    write_html_report,
+)
+from imca_report_table.traversal import build_hierarchy
+
+from .synthetic import generate_trip
+
+
+def _measure(label: str, render) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = render()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = output.stat().st_size
+    print(f"{label:<8} {elapsed:7.2f}s  peak {peak / 2**20:8.1f} MiB  report {size / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=1)
+    parser.add_argument("--pucks-per-site", type=int, default=4)
+    parser.add_argument("--pins-per-puck", type=int, default=10)
+    parser.add_argument("--collections-per-pin", type=int, default=2)
+    parser.add_argument("--images-per-camera", type=int, default=3)
+    parser.add_argument("--image-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generate_trip(
+            Path(tmp) / "trip",
+            sites=args.sites,
+            pucks_per_site=args.pucks_per_site,
+            pins_per_puck=args.pins_per_puck,
+            collections_per_pin=args.collections_per_pin,
+            images_per_camera=args.images_per_camera,
+            image_bytes=args.image_kb * 1024,
+        )
+        result = build_hierarchy(root)
+        output = Path(tmp) / "report.html"
+        _measure("string", lambda: write_html_report(output, render_html_report(result)))
+        _measure("stream", lambda: write_html_report(output, generate_html_report(result)))
+
+
+if __name__ == "__main__":
+    main()
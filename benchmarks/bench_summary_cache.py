@@ -0,0 +1,72 @@
+"""Compare cold and warm scans with the persistent summary parse cache.
+
+Usage::
+
+    python -m benchmarks.bench_summary_cache [--collections-per-pin N] [--summary-bytes N]
+        [--keep DIR]
+
+The cold scan starts from an empty cache and parses every ``00_summary.html``;
+warm scans reuse the entries it wrote. A scan without a cache is the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from imca_report_table.summary_cache import SummaryCache
+from imca_report_table.traversal import build_hierarchy
+
+from .synthetic import generate_trip
+
+
+def _timed_scan(root: Path, cache_dir: Path | None) -> tuple[float, SummaryCache | None]:
+    cache = SummaryCache(cache_dir) if cache_dir is not None else None
+    start = time.perf_counter()
+    build_hierarchy(root, summary_cache=cache)
+    if cache is not None:
+        cache.close()
+    return time.perf_counter() - start, cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=2)
+    parser.add_argument("--pucks-per-site", type=int, default=5)
+    parser.add_argument("--pins-per-puck", type=int, default=20)
+    parser.add_argument("--collections-per-pin", type=int, default=2)
+    parser.add_argument("--summary-bytes", type=int, default=400_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", type=Path, help="Generate (or reuse) the tree in this directory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.keep or Path(tmp) / "trip"
+        if not root.exists():
+            generate_trip(
+                root,
+                sites=args.sites,
+                pucks_per_site=args.pucks_per_site,
+                pins_per_puck=args.pins_per_puck,
+                collections_per_pin=args.collections_per_pin,
+                with_summary=True,
+                summary_bytes=args.summary_bytes,
+            )
+        cache_dir = Path(tmp) / "cache"
+
+        baseline = min(_timed_scan(root, None)[0] for _ in range(args.repeat))
+        cold, cache = _timed_scan(root, cache_dir)
+        warm = [_timed_scan(root, cache_dir) for _ in range(args.repeat)]
+        size = (cache_dir / "summaries.sqlite3").stat().st_size
+
+    print(f"summaries:   {cache.misses}")
+    print(f"no cache:    best {baseline:.3f}s of {args.repeat}")
+    print(f"cold cache:  {cold:.3f}s")
+    print(f"warm cache:  best {min(t for t, _ in warm):.3f}s of {args.repeat} ({warm[-1][1].hits} hits)")
+    print(f"cache file:  {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare cold and warm template startup with the Jinja bytecode cache.
+
+Usage::
+
+    python -m benchmarks.bench_templates [--repeat N]
+
+Each run is a fresh interpreter (as for a CLI invocation) that imports the
+renderer, loads the report template, and renders a small synthetic trip.
+Cold runs start from an empty template cache and compile every template;
+warm runs load the bytecode written by an earlier run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .synthetic import generate_trip
+
+_CHILD = """
+import sys, time
+start = time.perf_counter()
+import jinja2
+from imca_report_table.render.html import _environment, render_html_report
+from imca_report_table.traversal import build_hierarchy
+imported = time.perf_counter()
+_environment().get_template("report.html.j2")
+loaded = time.perf_counter()
+result = build_hierarchy(sys.argv[1])
+rendered = time.perf_counter()
+render_html_report(result)
+print(imported - start, loaded - imported, time.perf_counter() - rendered)
+"""
+
+
+def _run(root: Path, cache_home: Path) -> tuple[float, float, float]:
+    env = {**os.environ, "XDG_CACHE_HOME": str(cache_home)}
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(root)], env=env, capture_output=True, text=True, check=True
+    )
+    imports, load, render = completed.stdout.split()
+    return float(imports), float(load), float(render)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = generate_trip(Path(tmp) / "trip", sites=1, pucks_per_site=1, pins_per_puck=2, collections_per_pin=2)
+        cache_home = Path(tmp) / "cache"
+
+        cold = []
+        for _ in range(args.repeat):
+            shutil.rmtree(cache_home, ignore_errors=True)
+            cold.append(_run(root, cache_home))
+        warm = [_run(root, cache_home) for _ in range(args.repeat)]
+
+        for label, runs in (("cold", cold), ("warm", warm)):
+            imports, load, render = (min(run[index] for run in runs) for index in range(3))
+            print(
+                f"{label:<5} imports {imports * 1000:7.1f} ms  template load {load * 1000:7.1f} ms  "
+                f"first render {render * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
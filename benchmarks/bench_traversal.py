@@ -0,0 +1,82 @@
+"""Benchmark ``build_hierarchy`` on a synthetic trip tree.
+
+Usage::
+
+    python -m benchmarks.bench_traversal [--collections-per-pin N] [--with-summary]
+        [--summary-bytes N] [--workers N] [--metadata-processes N]
+        [--follow-symlinks] [--keep DIR]
+
+Reports wall-clock time and filesystem call counts for a full scan. Run it
+against two revisions to compare traversal strategies, or with increasing
+``--metadata-processes`` to measure how summary parsing scales across cores.
+Filesystem calls made inside worker processes are not counted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from imca_report_table.traversal import build_hierarchy
+
+from .fscount import count_fs_calls
+from .synthetic import generate_trip
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=4)
+    parser.add_argument("--pucks-per-site", type=int, default=25)
+    parser.add_argument("--pins-per-puck", type=int, default=20)
+    parser.add_argument("--collections-per-pin", type=int, default=5)
+    parser.add_argument("--with-summary", action="store_true", help="Add XDS summaries to processing dirs.")
+    parser.add_argument("--summary-bytes", type=int, default=0, help="Pad each summary to about this size.")
+    parser.add_argument("--workers", type=int, default=None, help="Puck-level worker threads.")
+    parser.add_argument(
+        "--metadata-processes", type=int, default=None, help="Metadata extraction processes."
+    )
+    parser.add_argument("--follow-symlinks", action="store_true", help="Resolve every path (pre-lexical mode).")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", type=Path, help="Generate (or reuse) the tree in this directory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.keep or Path(tmp) / "trip"
+        if not root.exists():
+            generate_trip(
+                root,
+                sites=args.sites,
+                pucks_per_site=args.pucks_per_site,
+                pins_per_puck=args.pins_per_puck,
+                collections_per_pin=args.collections_per_pin,
+                with_summary=args.with_summary,
+                summary_bytes=args.summary_bytes,
+            )
+
+        options = {
+            "workers": args.workers,
+            "follow_symlinks": args.follow_symlinks,
+            "metadata_processes": args.metadata_processes,
+        }
+        with count_fs_calls() as counts:
+            result = build_hierarchy(root, **options)
+        collections = sum(1 for _ in result.trip.iter_collections())
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            build_hierarchy(root, **options)
+            timings.append(time.perf_counter() - start)
+
+    total_calls = sum(counts.values())
+    print(f"collections: {collections}")
+    print(f"wall clock:  best {min(timings):.3f}s of {args.repeat}")
+    print(f"fs calls:    {total_calls} ({total_calls / max(collections, 1):.1f} per collection)")
+    for name, count in sorted(counts.items()):
+        print(f"  {name:<14} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Count Python-level filesystem calls made while a block runs."""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class _CountingEntry:
+    """Proxy around ``os.DirEntry`` that counts calls needing a ``stat``."""
+
+    __slots__ = ("_entry", "_counter")
+
+    def __init__(self, entry: os.DirEntry[str], counter: Counter[str]) -> None:
+        self._entry = entry
+        self._counter = counter
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._counter["DirEntry.stat"] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._counter["DirEntry.stat"] += 1
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._counter["DirEntry.stat"] += 1
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+
+class _CountingScandir:
+    def __init__(self, iterator: Any, counter: Counter[str]) -> None:
+        self._iterator = iterator
+        self._counter = counter
+
+    def __enter__(self) -> _CountingScandir:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._iterator.close()
+
+    def __iter__(self) -> Iterator[_CountingEntry]:
+        for entry in self._iterator:
+            yield _CountingEntry(entry, self._counter)
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+@contextmanager
+def count_fs_calls() -> Iterator[Counter[str]]:
+    """Patch ``os`` so stat/lstat/scandir/listdir calls are tallied.
+
+    This is a proxy for syscalls: each counted call issues at least one.
+    """
+    counter: Counter[str] = Counter()
+    originals = {name: getattr(os, name) for name in ("stat", "lstat", "listdir", "scandir")}
+
+    def wrap(name: str) -> Any:
+        original = originals[name]
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            counter[f"os.{name}"] += 1
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    def scandir(*args: Any, **kwargs: Any) -> _CountingScandir:
+        counter["os.scandir"] += 1
+        return _CountingScandir(originals["scandir"](*args, **kwargs), counter)
+
+    for name in ("stat", "lstat", "listdir"):
+        setattr(os, name, wrap(name))
+    os.scandir = scandir  # type: ignore[assignment]
+    try:
+        yield counter
+    finally:
+        for name, original in originals.items():
+            setattr(os, name, original)
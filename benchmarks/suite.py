@@ -0,0 +1,166 @@
+"""Time the main pipeline stages at several synthetic trip scales.
+
+Usage::
+
+    python -m benchmarks.suite [--scales small,medium] [--repeat N]
+        [--output results.json] [--baseline results.json] [--threshold 0.2]
+
+Each scale is generated with `benchmarks.synthetic.generate_trip` (seeded, so
+runs are comparable) and the suite times ``build_hierarchy``,
+``flatten_collections``, ``render_html_report``, a JSON cache round-trip, and
+the Rich console render, keeping the fastest of `--repeat` runs per stage.
+Results are written as JSON; passing an earlier file as `--baseline` prints
+the change per stage and exits non-zero when a stage slowed down by more than
+`--threshold`. Everything runs offline against a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+
+import imca_report_table
+from imca_report_table.render.console import render_hierarchy_console
+from imca_report_table.render.html import flatten_collections, render_html_report
+from imca_report_table.traversal import build_hierarchy
+from imca_report_table.utils import load_hierarchy_json, write_hierarchy_json
+
+from .synthetic import generate_trip
+
+SCALES: dict[str, dict[str, Any]] = {
+    "small": dict(sites=1, pucks_per_site=2, pins_per_puck=10, collections_per_pin=3),
+    "medium": dict(sites=2, pucks_per_site=10, pins_per_puck=10, collections_per_pin=3),
+    "large": dict(sites=4, pucks_per_site=25, pins_per_puck=20, collections_per_pin=5),
+}
+# Shape shared by every scale: a couple of small previews, a nested summary,
+# and a sprinkling of the incomplete collections real trips contain.
+COMMON_SHAPE: dict[str, Any] = dict(
+    images_per_camera=2,
+    image_bytes=2048,
+    with_summary=True,
+    processing_depth=1,
+    missing_dir_ratio=0.05,
+    empty_pin_ratio=0.02,
+    seed=0,
+)
+STAGES = ("build_hierarchy", "flatten_collections", "render_html_report", "json_round_trip", "console_render")
+
+
+def _best_of(repeat: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scale(name: str, workdir: Path, repeat: int) -> dict[str, Any]:
+    """Generate the `name` trip under `workdir` and time every stage on it."""
+    shape = {**SCALES[name], **COMMON_SHAPE}
+    root = generate_trip(workdir / name, **shape)
+    cache_path = workdir / f"{name}.json"
+    result = build_hierarchy(root)
+    collections = sum(1 for _ in result.trip.iter_collections())
+
+    def json_round_trip() -> None:
+        write_hierarchy_json(cache_path, result)
+        load_hierarchy_json(cache_path)
+
+    def console_render() -> None:
+        render_hierarchy_console(result, Console(file=io.StringIO(), width=120, color_system=None))
+
+    timings = {
+        "build_hierarchy": _best_of(repeat, lambda: build_hierarchy(root)),
+        "flatten_collections": _best_of(repeat, lambda: flatten_collections(result)),
+        "render_html_report": _best_of(repeat, lambda: render_html_report(result)),
+        "json_round_trip": _best_of(repeat, json_round_trip),
+        "console_render": _best_of(repeat, console_render),
+    }
+    return {
+        "shape": shape,
+        "collections": collections,
+        "seconds": {stage: round(timings[stage], 6) for stage in STAGES},
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Print per-stage changes against `baseline`; return the stages that regressed."""
+    regressions = []
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        for stage in STAGES:
+            before = previous["seconds"].get(stage)
+            after = current["seconds"][stage]
+            if not before:
+                continue
+            change = after / before - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{scale}/{stage}")
+            print(f"{scale:<8} {stage:<20} {before:9.4f}s -> {after:9.4f}s  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default="small,medium",
+        help=f"Comma-separated scales to run ({', '.join(SCALES)}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against results from an earlier run.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown that counts as a regression against --baseline (default: 0.2).",
+    )
+    args = parser.parse_args(argv)
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    results: dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "package_version": imca_report_table.__version__,
+        "repeat": args.repeat,
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            entry = run_scale(scale, Path(tmp), args.repeat)
+            results["scales"][scale] = entry
+            for stage in STAGES:
+                print(f"{scale:<8} {entry['collections']:>6} collections  {stage:<20} {entry['seconds'][stage]:9.4f}s")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Synthetic trip directory generator used by the benchmarks."""
+
+from __future__ import annotations
+
+import random
+import string
+from pathlib import Path
+
+EXPECTED_SUBDIRS = ("camera", "diff-center", "images", "processing")
+SUMMARY_IMAGES = (
+    "SPOT.XDS.SpotsPerImage.png",
+    "INTEGRATE_select2.mrfana.fitness_batch_select2.png",
+)
+SUMMARY_HTML = "<html><body>" + "".join(f'<img src="images/{name}"/>' for name in SUMMARY_IMAGES) + "</body></html>"
+
+
+def generate_trip(
+    root: Path,
+    *,
+    sites: int = 4,
+    pucks_per_site: int = 25,
+    pins_per_puck: int = 20,
+    collections_per_pin: int = 5,
+    images_per_camera: int = 2,
+    image_bytes: int = 0,
+    with_summary: bool = False,
+    summary_bytes: int = 0,
+    processing_depth: int = 0,
+    missing_dir_ratio: float = 0.0,
+    empty_pin_ratio: float = 0.0,
+    seed: int = 0,
+) -> Path:
+    """Create a trip tree under `root` and return it.
+
+    The default shape yields 10,000 collections with empty placeholder images;
+    `image_bytes` fills each image with that many pseudo-random bytes instead.
+    `with_summary` adds an XDS-style ``00_summary.html`` and its plots to every
+    processing directory, padded with roughly `summary_bytes` of table markup
+    to mimic large real summaries, and nested `processing_depth` directories
+    below ``processing/``.
+
+    `missing_dir_ratio` is the fraction of collections lacking one expected
+    directory and `empty_pin_ratio` the fraction of pins without lettered
+    collections. Both, and the image bytes, are drawn from generators seeded
+    with `seed`, so a given set of arguments always builds the same tree down
+    to the file contents.
+    """
+    if collections_per_pin > len(string.ascii_uppercase):
+        raise ValueError("collections_per_pin cannot exceed 26 lettered directories")
+    rng = random.Random(seed)
+    # A separate generator keeps the layout independent of `image_bytes`.
+    content_rng = random.Random(f"{seed}:contents")
+    root.mkdir(parents=True, exist_ok=True)
+    padding = "<tr><td>XDS statistics row</td></tr>" * (summary_bytes // 36)
+    summary_html = SUMMARY_HTML.replace("<body>", "<body><table>" + padding + "</table>")
+    for site_index in range(sites):
+        site_dir = root / f"site{site_index + 1:02d}"
+        for puck_index in range(pucks_per_site):
+            puck_dir = site_dir / f"puck{puck_index + 1:03d}"
+            for pin_index in range(pins_per_puck):
+                pin_dir = puck_dir / f"pin{pin_index + 1:02d}"
+                if rng.random() < empty_pin_ratio:
+                    (pin_dir / "notes").mkdir(parents=True, exist_ok=True)
+                    continue
+                for letter in string.ascii_uppercase[:collections_per_pin]:
+                    collection_dir = pin_dir / letter
+                    missing = rng.choice(EXPECTED_SUBDIRS) if rng.random() < missing_dir_ratio else None
+                    for sub in EXPECTED_SUBDIRS:
+                        if sub != missing:
+                            (collection_dir / sub).mkdir(parents=True, exist_ok=True)
+                    camera_dir = collection_dir / "camera"
+                    if missing != "camera":
+                        for image_index in range(images_per_camera):
+                            image = camera_dir / f"loop-inter_4_{image_index * 45:03d}.jpeg"
+                            image.write_bytes(content_rng.randbytes(image_bytes))
+                    if with_summary and missing != "processing":
+                        processing_dir = collection_dir / "processing"
+                        for level in range(processing_depth):
+                            processing_dir = processing_dir / f"xds_run{level + 1}"
+                        (processing_dir / "images").mkdir(parents=True)
+                        for name in SUMMARY_IMAGES:
+                            (processing_dir / "images" / name).write_bytes(content_rng.randbytes(image_bytes))
+                        (processing_dir / "00_summary.html").write_text(summary_html, encoding="utf-8")
+    return root
@@ -11,11 +11,21 @@ from .models import (
     SiteStatus,
     TripHierarchy,
 )
-from .traversal import DEFAULT_EXPECTED_COLLECTION_DIRS, build_hierarchy
+from .profiling import Profiler
+from .traversal import (
+    DEFAULT_EXPECTED_COLLECTION_DIRS,
+    ScanLimits,
+    abuild_hierarchy,
+    build_hierarchy,
+)
 from .utils import (
     hierarchy_from_dict,
     hierarchy_to_dict,
+    load_hierarchy,
+    load_hierarchy_binary,
     load_hierarchy_json,
+    write_hierarchy,
+    write_hierarchy_binary,
     write_hierarchy_json,
 )
 
@@ -27,11 +37,18 @@ __all__ = [
     "PuckStatus",
     "SiteStatus",
     "TripHierarchy",
+    "Profiler",
     "DEFAULT_EXPECTED_COLLECTION_DIRS",
+    "ScanLimits",
+    "abuild_hierarchy",
     "build_hierarchy",
     "hierarchy_from_dict",
     "hierarchy_to_dict",
+    "load_hierarchy",
+    "load_hierarchy_binary",
     "load_hierarchy_json",
+    "write_hierarchy",
+    "write_hierarchy_binary",
     "write_hierarchy_json",
 ]
 
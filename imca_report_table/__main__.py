@@ -3,28 +3,79 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import re
 import sys
 from pathlib import Path
-from typing import Sequence
-
-from rich.console import Console
+from typing import TYPE_CHECKING, Callable, Sequence
 
+# Rich, Jinja, Pillow, watchdog, and sqlite3 are imported only by the code
+# paths that produce their output; cron runs that just convert or refresh a
+# cache never load them.
 from . import __version__
-from .render.console import render_hierarchy_console
-from .render.html import render_html_report, write_html_report
-from .traversal import DEFAULT_EXPECTED_COLLECTION_DIRS, build_hierarchy
-from .utils import load_hierarchy_json, write_hierarchy_json
+from .models import HierarchyResult
+from .profiling import Profiler, phase
+from .render.assets import ASSET_MODES
+from .render.prefetch import DEFAULT_EMBED_BUDGET_BYTES, DEFAULT_EMBED_WORKERS
+from .render.sharded import SHARD_MODES
+from .render.thumbnails import DEFAULT_CACHE_LIMIT_BYTES, ThumbnailCache
+from .summary_cache import DEFAULT_SUMMARY_CACHE_LIMIT_BYTES, SummaryCache
+from .traversal import DEFAULT_EXPECTED_COLLECTION_DIRS, ScanLimits, build_hierarchy
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL
+from .utils import BINARY_CACHE_SUFFIX, CACHE_FORMATS, load_hierarchy, write_hierarchy
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {value}")
+    return number
+
+
+class _PlainConsole:
+    """Stand-in for a Rich console in ``--quiet --no-console`` runs.
+
+    Those runs only print a few status lines, so Rich is not worth importing;
+    the markup used in them is stripped instead.
+    """
+
+    _MARKUP = re.compile(r"\[/?(?:bold red|green|yellow)\]")
+
+    def print(self, message: str) -> None:
+        print(self._MARKUP.sub("", message))
+
+
+def _make_console(args: argparse.Namespace) -> Console | _PlainConsole:
+    if args.quiet and args.no_console and not (args.profile or args.profile_json):
+        return _PlainConsole()
+    from rich.console import Console
+
+    return Console()
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Inspect IMCA trip directory structures and produce reports."
+        description="Inspect IMCA trip directory structures and produce reports.",
     )
     parser.add_argument(
         "root",
-        nargs="?",
-        default=None,
-        help="Path to the trip directory to analyse (optional when --input-json is provided).",
+        nargs="*",
+        metavar="ROOT",
+        help=(
+            "Trip directory to analyse (optional when --input-json is provided). Several "
+            "directories or glob patterns run in batch mode: --output-html becomes a combined "
+            "index and per-trip outputs go to <stem>_trips/."
+        ),
     )
     parser.add_argument(
         "--strict",
@@ -39,12 +90,52 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--output-json",
         type=str,
-        help="Write the collected hierarchy to a JSON file at the given path.",
+        help=(
+            "Write the collected hierarchy cache to the given path (binary when the path ends "
+            f"in {BINARY_CACHE_SUFFIX}, JSON otherwise)."
+        ),
     )
     parser.add_argument(
         "--input-json",
         type=str,
-        help="Load hierarchy data from a JSON file and skip filesystem traversal.",
+        help="Load hierarchy data from a JSON or binary cache file and skip filesystem traversal.",
+    )
+    parser.add_argument(
+        "--cache-format",
+        choices=CACHE_FORMATS,
+        help="Force the hierarchy cache format instead of inferring it from the file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Rescan the trip directory but reuse collections from --input-json whose "
+            "directory mtimes are unchanged."
+        ),
+    )
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help="Resolve symlinks for every recorded file path instead of deriving paths from the trip root.",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=_non_negative_int,
+        metavar="N",
+        help="Descend at most N subdirectory levels below camera/ and processing/.",
+    )
+    parser.add_argument(
+        "--prune",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip camera/processing subdirectories whose name matches GLOB (repeatable).",
+    )
+    parser.add_argument(
+        "--max-files",
+        type=_positive_int,
+        metavar="N",
+        help="Visit at most N files per camera or processing directory.",
     )
     parser.add_argument(
         "--no-console",
@@ -61,39 +152,350 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         type=str,
         help="Optional HTML report title.",
     )
+    parser.add_argument(
+        "--asset-mode",
+        choices=ASSET_MODES,
+        default="inline",
+        help=(
+            "How the HTML report references preview images: embed them as base64 (inline), "
+            "link to them by relative path (linked), or copy them into an assets/ directory "
+            "beside the report (copy). Default: %(default)s."
+        ),
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=_positive_int,
+        default=DEFAULT_EMBED_WORKERS,
+        metavar="N",
+        help="Read and encode HTML preview images on N threads ahead of the rows (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--embed-budget",
+        type=_positive_int,
+        default=DEFAULT_EMBED_BUDGET_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Hold at most this much preview image data read ahead of the rows (default: %(default)s MB).",
+    )
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        "--shard-by",
+        choices=SHARD_MODES,
+        help="Write an index page plus one HTML page per site or puck (requires --output-html).",
+    )
+    shard_group.add_argument(
+        "--rows-per-page",
+        type=_positive_int,
+        metavar="N",
+        help="Write an index page plus HTML pages of at most N collection rows (requires --output-html).",
+    )
+    parser.add_argument(
+        "--thumbnail-size",
+        type=_positive_int,
+        metavar="PX",
+        help="Embed previews downscaled to at most PX pixels per edge (requires Pillow).",
+    )
+    parser.add_argument(
+        "--thumbnail-cache",
+        type=str,
+        metavar="DIR",
+        help="Directory for cached thumbnails (default: ~/.cache/imca-report-table/thumbnails).",
+    )
+    parser.add_argument(
+        "--thumbnail-cache-limit",
+        type=_positive_int,
+        default=DEFAULT_CACHE_LIMIT_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Evict least recently used thumbnails beyond this size (default: %(default)s MB).",
+    )
     parser.add_argument(
         "--no-site-level",
         action="store_true",
         help="Treat trip directories as containing pucks directly (no site level).",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Scan pucks concurrently using N worker threads (default: 1).",
+    )
+    parser.add_argument(
+        "--metadata-processes",
+        type=_positive_int,
+        metavar="N",
+        help="Extract camera and processing metadata on N worker processes after the walk.",
+    )
+    parser.add_argument(
+        "--summary-cache",
+        action="store_true",
+        help="Reuse image references parsed from unchanged 00_summary.html files in earlier runs.",
+    )
+    parser.add_argument(
+        "--summary-cache-dir",
+        type=str,
+        metavar="DIR",
+        help="Directory holding the summary parse cache (default: ~/.cache/imca-report-table).",
+    )
+    parser.add_argument(
+        "--summary-cache-limit",
+        type=_positive_int,
+        default=DEFAULT_SUMMARY_CACHE_LIMIT_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Evict least recently used summary entries beyond this size (default: %(default)s MB).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep the requested outputs up to date as new collections land in a single trip "
+            "directory; --input-json, if given, seeds the initial scan like --incremental."
+        ),
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help="Watch mode: seconds between scans when inotify is unavailable (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        metavar="SECONDS",
+        help="Watch mode: wait this long after the last change before updating (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time per phase plus file, directory, and byte counters when done.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=str,
+        metavar="PATH",
+        help="Write the --profile phases and counters as JSON to the given path (implies --profile).",
+    )
     parser.add_argument(
         "--version",
         action="version",
         version=f"%(prog)s {__version__}",
         help="Show the installed version and exit.",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    args.roots = args.root
+    args.batch = len(args.roots) > 1 or any(glob.has_magic(root) for root in args.roots)
+    args.root = args.roots[0] if len(args.roots) == 1 and not args.batch else None
+    return args
+
+
+def _write_outputs(
+    args: argparse.Namespace,
+    result: HierarchyResult,
+    console: Console,
+    log: Callable[[str], None],
+    thumbnails: ThumbnailCache | None,
+    profiler: Profiler | None = None,
+) -> None:
+    """Write the HTML report and hierarchy cache requested on the command line."""
+    if args.output_html:
+        from .render.html import generate_html_report, write_html_report
+        from .render.sharded import write_sharded_html_report
+
+        log(f"Rendering HTML report → {args.output_html}")
+        if args.shard_by or args.rows_per_page:
+            output_path = write_sharded_html_report(
+                result,
+                args.output_html,
+                shard_by=args.shard_by,
+                rows_per_page=args.rows_per_page,
+                workers=args.jobs,
+                expected_collection_dirs=DEFAULT_EXPECTED_COLLECTION_DIRS,
+                title=args.title,
+                thumbnails=thumbnails,
+                asset_mode=args.asset_mode,
+                profiler=profiler,
+                embed_workers=args.embed_workers,
+                embed_budget_bytes=args.embed_budget * 1024 * 1024,
+            )
+        else:
+            html_chunks = generate_html_report(
+                result,
+                expected_collection_dirs=DEFAULT_EXPECTED_COLLECTION_DIRS,
+                title=args.title,
+                thumbnails=thumbnails,
+                asset_mode=args.asset_mode,
+                output_path=args.output_html,
+                profiler=profiler,
+                embed_workers=args.embed_workers,
+                embed_budget_bytes=args.embed_budget * 1024 * 1024,
+            )
+            output_path = write_html_report(args.output_html, html_chunks, profiler=profiler)
+        if thumbnails is not None:
+            log(f"Thumbnails: {thumbnails.generated} generated, {thumbnails.reused} reused from cache")
+        console.print(f"[green]HTML report written to[/green] {output_path}")
+    elif args.shard_by or args.rows_per_page:
+        console.print("[yellow]warning:[/yellow] --shard-by/--rows-per-page have no effect without --output-html")
+
+    if args.output_json:
+        log(f"Writing hierarchy cache → {args.output_json}")
+        with phase(profiler, "write_cache"):
+            output_json_path = write_hierarchy(args.output_json, result, cache_format=args.cache_format)
+        console.print(f"[green]Hierarchy cache written to[/green] {output_json_path}")
+
+
+def _open_thumbnails(
+    args: argparse.Namespace, console: Console
+) -> tuple[ThumbnailCache | None, bool]:
+    """Return the thumbnail cache requested on the command line and whether it opened."""
+    if not (args.output_html and args.thumbnail_size):
+        return None, True
+    try:
+        thumbnails = ThumbnailCache(
+            args.thumbnail_cache,
+            max_size=args.thumbnail_size,
+            limit_bytes=args.thumbnail_cache_limit * 1024 * 1024,
+        )
+    except RuntimeError as exc:
+        console.print(f"[bold red]error:[/bold red] {exc}")
+        return None, False
+    return thumbnails, True
+
+
+def _run_batch(
+    args: argparse.Namespace,
+    console: Console,
+    log: Callable[[str], None],
+    limits: ScanLimits | None,
+    summary_cache: SummaryCache | None,
+    profiler: Profiler | None = None,
+) -> int:
+    """Scan and report on every trip given on the command line in one process."""
+    from .batch import expand_roots, run_batch
+    from .render.console import render_hierarchy_console
+    roots = expand_roots(args.roots)
+    if not roots:
+        console.print("[bold red]error:[/bold red] no trip directories match the given patterns.")
+        return 2
+    if args.shard_by or args.rows_per_page:
+        console.print("[yellow]warning:[/yellow] --shard-by/--rows-per-page are ignored in batch mode")
+    thumbnails, opened = _open_thumbnails(args, console)
+    if not opened:
+        return 1
+
+    log(f"Batch mode: {len(roots)} trips on {args.jobs} worker thread(s)")
+    try:
+        outcomes = run_batch(
+            roots,
+            output_html=args.output_html,
+            output_json=args.output_json,
+            cache_format=args.cache_format,
+            workers=args.jobs,
+            expected_collection_dirs=DEFAULT_EXPECTED_COLLECTION_DIRS,
+            no_site_level=args.no_site_level,
+            follow_symlinks=args.follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            title=args.title,
+            thumbnails=thumbnails,
+            asset_mode=args.asset_mode,
+            logger=log,
+            profiler=profiler,
+            embed_workers=args.embed_workers,
+            embed_budget_bytes=args.embed_budget * 1024 * 1024,
+        )
+    finally:
+        if summary_cache is not None:
+            summary_cache.close()
+
+    if not args.no_console:
+        with phase(profiler, "console_render"):
+            for outcome in outcomes:
+                if outcome.result is not None:
+                    render_hierarchy_console(outcome.result, console, DEFAULT_EXPECTED_COLLECTION_DIRS)
+    _report_profile(args, console, profiler)
+    failed = [outcome for outcome in outcomes if outcome.error]
+    for outcome in failed:
+        console.print(f"[bold red]error:[/bold red] {outcome.root}: {outcome.error}")
+    if args.output_html:
+        console.print(f"[green]Trip index written to[/green] {Path(args.output_html).expanduser().resolve()}")
+    if failed:
+        return 1
+    if args.strict and not all(outcome.ok for outcome in outcomes):
+        log("Strict mode enabled and missing directories detected; exiting with status 1.")
+        return 1
+    return 0
+
+
+def _report_profile(args: argparse.Namespace, console: Console, profiler: Profiler | None) -> None:
+    if profiler is None:
+        return
+    from .render.console import render_profile_console
+
+    render_profile_console(profiler, console)
+    if args.profile_json:
+        console.print(f"[green]Profile written to[/green] {profiler.write_json(args.profile_json)}")
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv)
-    console = Console()
+    console = _make_console(args)
     log_console = console if not args.quiet else None
 
     def log(message: str) -> None:
         if log_console:
             log_console.log(message)
 
+    if args.watch and args.root is None:
+        console.print("[bold red]error:[/bold red] watch mode requires a single trip directory.")
+        return 2
+    if args.batch and (args.input_json or args.incremental):
+        console.print("[bold red]error:[/bold red] --input-json/--incremental take a single trip directory.")
+        return 2
+
     result_source = ""
-    if args.input_json:
+    previous = None
+    limits = None
+    if args.max_depth is not None or args.prune or args.max_files is not None:
+        limits = ScanLimits(max_depth=args.max_depth, prune=tuple(args.prune), max_files=args.max_files)
+    summary_cache = None
+    if args.summary_cache:
+        summary_cache = SummaryCache(
+            args.summary_cache_dir, limit_bytes=args.summary_cache_limit * 1024 * 1024
+        )
+    profiler = Profiler() if args.profile or args.profile_json else None
+    if args.batch:
+        return _run_batch(args, console, log, limits, summary_cache, profiler)
+
+    incremental = args.incremental or (args.watch and bool(args.input_json))
+    if incremental:
+        if args.root is None or not args.input_json:
+            console.print(
+                "[bold red]error:[/bold red] --incremental requires both a trip directory and --input-json."
+            )
+            return 2
+        if Path(args.input_json).expanduser().exists():
+            try:
+                previous = load_hierarchy(args.input_json, cache_format=args.cache_format)
+            except Exception as exc:
+                console.print(f"[bold red]error:[/bold red] failed to load hierarchy cache: {exc}")
+                return 1
+            if log_console:
+                log(f"Loaded previous hierarchy for incremental rescan: {args.input_json}")
+        elif log_console:
+            log(f"No cached hierarchy at {args.input_json}; performing a full scan.")
+
+    if args.input_json and not incremental:
         try:
-            result = load_hierarchy_json(args.input_json)
+            with phase(profiler, "load_cache"):
+                result = load_hierarchy(args.input_json, cache_format=args.cache_format)
         except Exception as exc:
-            console.print(f"[bold red]error:[/bold red] failed to load hierarchy JSON: {exc}")
+            console.print(f"[bold red]error:[/bold red] failed to load hierarchy cache: {exc}")
             return 1
         result_source = args.input_json
         if log_console:
-            log(f"Loaded hierarchy from JSON: {args.input_json}")
+            log(f"Loaded hierarchy from cache: {args.input_json}")
     else:
         if args.root is None:
             console.print(
@@ -109,16 +511,35 @@ def main(argv: Sequence[str] | None = None) -> int:
                         DEFAULT_EXPECTED_COLLECTION_DIRS,
                         logger=log,
                         no_site_level=args.no_site_level,
+                        workers=args.jobs,
+                        previous=previous,
+                        follow_symlinks=args.follow_symlinks,
+                        limits=limits,
+                        metadata_processes=args.metadata_processes,
+                        summary_cache=summary_cache,
+                        profiler=profiler,
                     )
             else:
                 result = build_hierarchy(
                     root_path,
                     DEFAULT_EXPECTED_COLLECTION_DIRS,
                     no_site_level=args.no_site_level,
+                    workers=args.jobs,
+                    previous=previous,
+                    follow_symlinks=args.follow_symlinks,
+                    limits=limits,
+                    metadata_processes=args.metadata_processes,
+                    summary_cache=summary_cache,
+                    profiler=profiler,
                 )
         except (FileNotFoundError, NotADirectoryError) as exc:
             console.print(f"[bold red]error:[/bold red] {exc}")
             return 1
+        finally:
+            if summary_cache is not None:
+                summary_cache.close()
+        if log_console and summary_cache is not None:
+            log(f"Summaries: {summary_cache.misses} parsed, {summary_cache.hits} reused from cache")
         result_source = str(root_path)
 
     if log_console:
@@ -130,24 +551,46 @@ def main(argv: Sequence[str] | None = None) -> int:
         )
 
     if not args.no_console:
-        render_hierarchy_console(result, console, DEFAULT_EXPECTED_COLLECTION_DIRS)
+        from .render.console import render_hierarchy_console
 
-    if args.output_html:
-        if log_console:
-            log(f"Rendering HTML report → {args.output_html}")
-        html = render_html_report(
+        with phase(profiler, "console_render"):
+            render_hierarchy_console(result, console, DEFAULT_EXPECTED_COLLECTION_DIRS)
+
+    thumbnails, opened = _open_thumbnails(args, console)
+    if not opened:
+        return 1
+    _write_outputs(args, result, console, log, thumbnails, profiler)
+    _report_profile(args, console, profiler)
+
+    if args.watch:
+        from .watch import TripWatcher, watch_trip
+
+        watcher = TripWatcher(
             result,
-            expected_collection_dirs=DEFAULT_EXPECTED_COLLECTION_DIRS,
-            title=args.title,
+            DEFAULT_EXPECTED_COLLECTION_DIRS,
+            no_site_level=args.no_site_level,
+            follow_symlinks=args.follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
         )
-        output_path = write_html_report(args.output_html, html)
-        console.print(f"[green]HTML report written to[/green] {output_path}")
 
-    if args.output_json:
-        if log_console:
-            log(f"Writing hierarchy JSON → {args.output_json}")
-        output_json_path = write_hierarchy_json(args.output_json, result)
-        console.print(f"[green]Hierarchy JSON written to[/green] {output_json_path}")
+        def on_update(updated: HierarchyResult, changed: int) -> None:
+            if summary_cache is not None:
+                summary_cache.close()
+            log(f"{changed} pin(s) changed; updating outputs.")
+            _write_outputs(args, updated, console, log, thumbnails)
+
+        try:
+            watch_trip(
+                watcher,
+                on_update,
+                poll_interval=args.poll_interval,
+                debounce=args.debounce,
+                logger=log,
+            )
+        except KeyboardInterrupt:
+            log("Stopped watching.")
+        return 0
 
     if log_console and args.strict and not result.all_expected_present:
         log("Strict mode enabled and missing directories detected; exiting with status 1.")
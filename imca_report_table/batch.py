@@ -0,0 +1,174 @@
+"""Report on many trip directories in a single run."""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+from .models import HierarchyResult
+from .profiling import Profiler, phase
+from .render.batch import write_trips_index
+from .render.html import generate_html_report, write_html_report
+from .render.prefetch import DEFAULT_EMBED_BUDGET_BYTES, DEFAULT_EMBED_WORKERS
+from .render.thumbnails import ThumbnailCache
+from .summary_cache import SummaryCache
+from .traversal import ScanLimits, build_hierarchy
+from .utils import write_hierarchy
+
+_SLUG_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass(slots=True)
+class TripOutcome:
+    """What a batch run produced for one trip directory."""
+
+    root: Path
+    result: HierarchyResult | None = None
+    html_path: Path | None = None
+    json_path: Path | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.result is not None and self.result.all_expected_present
+
+
+def expand_roots(patterns: Sequence[str]) -> list[Path]:
+    """Expand glob patterns into trip directories, keeping order and dropping duplicates.
+
+    Arguments without glob characters are kept as given so that missing
+    directories are reported per trip instead of silently skipped.
+    """
+    roots: list[Path] = []
+    seen: set[str] = set()
+    for pattern in patterns:
+        expanded = os.path.expanduser(pattern)
+        if glob.has_magic(expanded):
+            matches = sorted(path for path in glob.glob(expanded) if os.path.isdir(path))
+        else:
+            matches = [expanded]
+        for match in matches:
+            key = os.path.abspath(match)
+            if key not in seen:
+                seen.add(key)
+                roots.append(Path(match))
+    return roots
+
+
+def _trip_filenames(roots: Sequence[Path]) -> list[str]:
+    """Return a unique file stem per trip, based on the directory name."""
+    names: list[str] = []
+    used: set[str] = set()
+    for root in roots:
+        base = _SLUG_PATTERN.sub("-", os.path.basename(os.path.abspath(root))).strip("-") or "trip"
+        name, counter = base, 2
+        while name in used:
+            name, counter = f"{base}-{counter}", counter + 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def run_batch(
+    roots: Sequence[Path | str],
+    *,
+    output_html: Path | str | None = None,
+    output_json: Path | str | None = None,
+    cache_format: str | None = None,
+    workers: int = 1,
+    expected_collection_dirs: Sequence[str] | None = None,
+    no_site_level: bool = False,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    title: str | None = None,
+    thumbnails: ThumbnailCache | None = None,
+    asset_mode: str = "inline",
+    generated_at: datetime | None = None,
+    logger: Callable[[str], None] | None = None,
+    profiler: Profiler | None = None,
+    embed_workers: int = DEFAULT_EMBED_WORKERS,
+    embed_budget_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+) -> list[TripOutcome]:
+    """Scan and write reports for several trips on one shared thread pool.
+
+    Each trip is scanned, rendered, and cached as a single job on a pool of
+    `workers` threads, so one process serves the whole batch. Per-trip reports
+    go to ``<stem>_trips/<trip>.html`` beside `output_html`, which becomes a
+    combined index page; hierarchy caches go to ``<stem>_trips/<trip><suffix>``
+    beside `output_json`. A trip that fails to scan or write is recorded in its
+    outcome (and on the index) without stopping the others. `profiler` accumulates
+    the phases of every trip; `embed_workers` and `embed_budget_bytes` apply
+    to each trip's report.
+    """
+    roots = [Path(root) for root in roots]
+    generated_at = generated_at or datetime.now(timezone.utc)
+    index_path = Path(output_html).expanduser().resolve() if output_html else None
+    json_base = Path(output_json).expanduser().resolve() if output_json else None
+    names = _trip_filenames(roots)
+
+    def log(message: str) -> None:
+        if logger:
+            logger(message)
+
+    def process(root: Path, name: str) -> TripOutcome:
+        outcome = TripOutcome(root=root)
+        try:
+            write_trip(outcome, name)
+        except OSError as exc:
+            outcome.error = f"{type(exc).__name__}: {exc}"
+            log(f"Trip {root}: {outcome.error}")
+            return outcome
+        log(f"Trip {outcome.result.trip_name}: done ({'OK' if outcome.ok else 'issues found'})")
+        return outcome
+
+    def write_trip(outcome: TripOutcome, name: str) -> None:
+        result = outcome.result = build_hierarchy(
+            outcome.root,
+            expected_collection_dirs,
+            no_site_level=no_site_level,
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            profiler=profiler,
+        )
+        if index_path is not None:
+            html_path = index_path.parent / f"{index_path.stem}_trips" / f"{name}.html"
+            outcome.html_path = write_html_report(
+                html_path,
+                generate_html_report(
+                    result,
+                    expected_collection_dirs=expected_collection_dirs,
+                    generated_at=generated_at,
+                    title=f"{title} — {result.trip_name}" if title else None,
+                    thumbnails=thumbnails,
+                    asset_mode=asset_mode,
+                    output_path=html_path,
+                    index_href=Path(os.path.relpath(index_path, html_path.parent)).as_posix(),
+                    profiler=profiler,
+                    embed_workers=embed_workers,
+                    embed_budget_bytes=embed_budget_bytes,
+                ),
+                profiler=profiler,
+            )
+        if json_base is not None:
+            json_path = json_base.parent / f"{json_base.stem}_trips" / f"{name}{json_base.suffix}"
+            with phase(profiler, "write_cache"):
+                outcome.json_path = write_hierarchy(json_path, result, cache_format=cache_format)
+
+    if workers > 1 and len(roots) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imca-trip") as executor:
+            outcomes = list(executor.map(process, roots, names))
+    else:
+        outcomes = [process(root, name) for root, name in zip(roots, names)]
+
+    if index_path is not None:
+        write_trips_index(outcomes, index_path, generated_at=generated_at, title=title)
+    return outcomes
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterable
@@ -9,17 +10,42 @@ from typing import Any, Iterable
 
 @dataclass(slots=True)
 class ExpectedDirectoryStatus:
-    """Status for an expected collection subdirectory."""
+    """Status for an expected collection subdirectory.
+
+    `stamps` maps the directories and files `metadata` was derived from, stored
+    like metadata paths (``"."`` is the directory itself), to their mtimes.
+    """
 
     name: str
     present: bool
     path: Path | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    mtime_ns: int | None = None
+    stamps: dict[str, int] = field(default_factory=dict)
 
     @property
     def status_label(self) -> str:
         return "OK" if self.present else "missing"
 
+    def absolute_path(self, value: str) -> str:
+        """Return a metadata path as an absolute path string.
+
+        Metadata paths are stored relative to `path`; absolute values (written by
+        older caches or pointing outside the directory) are returned unchanged.
+        """
+        if self.path is None or os.path.isabs(value):
+            return value
+        return os.path.join(self.path, value)
+
+    def metadata_path(self, key: str) -> str | None:
+        """Return the single metadata path stored under `key` as an absolute path."""
+        value = self.metadata.get(key)
+        return self.absolute_path(value) if value else None
+
+    def metadata_paths(self, key: str) -> list[str]:
+        """Return the metadata path list stored under `key` as absolute paths."""
+        return [self.absolute_path(value) for value in self.metadata.get(key) or []]
+
 
 @dataclass(slots=True)
 class CollectionStatus:
@@ -29,6 +55,7 @@ class CollectionStatus:
     path: Path
     expected: list[ExpectedDirectoryStatus] = field(default_factory=list)
     extras: list[str] = field(default_factory=list)
+    mtime_ns: int | None = None
 
     @property
     def missing_expected(self) -> bool:
@@ -75,6 +102,7 @@ class PinStatus:
     path: Path
     collections: list[CollectionStatus] = field(default_factory=list)
     missing_collections: bool = False
+    mtime_ns: int | None = None
 
     def add_collection(self, collection: CollectionStatus) -> None:
         self.collections.append(collection)
@@ -93,6 +121,7 @@ class PuckStatus:
     name: str
     path: Path
     pins: list[PinStatus] = field(default_factory=list)
+    mtime_ns: int | None = None
 
     def add_pin(self, pin: PinStatus) -> None:
         self.pins.append(pin)
@@ -105,6 +134,7 @@ class SiteStatus:
     name: str
     path: Path
     pucks: list[PuckStatus] = field(default_factory=list)
+    mtime_ns: int | None = None
 
     def add_puck(self, puck: PuckStatus) -> None:
         self.pucks.append(puck)
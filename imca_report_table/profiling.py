@@ -0,0 +1,112 @@
+"""Per-phase timing and counters for scans and report rendering."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+
+class Profiler:
+    """Thread-safe accumulator of wall time per phase and named counters.
+
+    Phases nest (``summary_parse`` runs inside ``processing_metadata``, which
+    runs inside ``build_hierarchy``) and their times are summed across worker
+    threads and processes, so parallel phases can exceed the enclosing wall time.
+
+    Instances can be pickled for process pools; merge the copy's `take` result
+    back into the original with `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"phases": self.phases, "counters": self.counters}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__()
+        self.phases = state["phases"]
+        self.counters = state["counters"]
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add `seconds` spread over `calls` calls to phase `name`."""
+        with self._lock:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase counter `name` by `amount`."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as one call of phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed_chunks(self, name: str, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield `chunks`, adding the time spent producing them to phase `name`."""
+        iterator = iter(chunks)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield chunk
+        finally:
+            self.add_time(name, elapsed)
+
+    def take(self) -> Profiler:
+        """Return the data recorded so far as a new profiler and reset this one."""
+        with self._lock:
+            taken = Profiler()
+            taken.phases, self.phases = self.phases, {}
+            taken.counters, self.counters = self.counters, {}
+            return taken
+
+    def merge(self, other: Profiler) -> None:
+        """Add the phases and counters of `other` to this profiler."""
+        for name, (seconds, calls) in other.phases.items():
+            self.add_time(name, seconds, int(calls))
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable snapshot of phases and counters."""
+        with self._lock:
+            return {
+                "phases": {
+                    name: {"seconds": round(seconds, 6), "calls": int(calls)}
+                    for name, (seconds, calls) in self.phases.items()
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def write_json(self, path: Path | str) -> Path:
+        """Write `to_dict` to `path` and return the resolved path."""
+        output = Path(path).expanduser().resolve()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return output
+
+
+def phase(profiler: Profiler | None, name: str) -> AbstractContextManager[None]:
+    """Return `profiler.phase(name)`, or a no-op context when profiling is off."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
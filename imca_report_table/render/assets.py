@@ -0,0 +1,260 @@
+"""Resolve preview images into ``src`` values for HTML reports."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import mimetypes
+import os
+import shutil
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+
+from ..profiling import Profiler, phase
+from .prefetch import DEFAULT_EMBED_BUDGET_BYTES, DEFAULT_EMBED_WORKERS, PreviewPrefetcher
+
+if TYPE_CHECKING:
+    from .thumbnails import ThumbnailCache
+
+ASSET_MODES: tuple[str, ...] = ("inline", "linked", "copy")
+ASSETS_DIRNAME = "assets"
+
+
+class AssetResolver:
+    """Produce preview dictionaries for image paths according to an asset mode.
+
+    ``inline`` embeds base64 ``data:`` URIs, ``linked`` references the images by
+    path relative to the report, and ``copy`` hardlinks (or copies) them into an
+    ``assets/`` directory next to the report. Only ``inline`` reads image bytes.
+
+    With `deduplicate`, inline previews carry an ``image_id`` hash of their
+    content and a report writes each distinct image once: `src_for` returns
+    the data URI on an image's first appearance and None afterwards. Each file
+    (also when seen again through a symlink) is read once and each distinct
+    image encoded once, even when prefetch threads ask for it concurrently;
+    encodings are held only until the image is written.
+
+    With `profiler`, lookups are timed as ``image_embedding`` and the image
+    bytes read and base64 bytes embedded are counted.
+    """
+
+    def __init__(
+        self,
+        mode: str = "inline",
+        *,
+        output_path: Path | str | None = None,
+        thumbnails: ThumbnailCache | None = None,
+        profiler: Profiler | None = None,
+        deduplicate: bool = False,
+    ) -> None:
+        if mode not in ASSET_MODES:
+            raise ValueError(f"unknown asset mode {mode!r}; expected one of {', '.join(ASSET_MODES)}")
+        if mode != "inline" and output_path is None:
+            raise ValueError(f"asset mode {mode!r} requires the report output path")
+        self.mode = mode
+        self.thumbnails = thumbnails
+        self.profiler = profiler
+        self.deduplicate = deduplicate and mode == "inline"
+        self.repeated_images = 0
+        self._prefetcher: PreviewPrefetcher | None = None
+        # Guards the three tables below. A thread that finds no entry for a key
+        # adds a future and fills it; others wait on that future instead.
+        self._lock = threading.Lock()
+        self._digests: dict[tuple[int, int, int, int], Future[str | None]] = {}
+        self._encodings: dict[str, Future[str]] = {}
+        self._written: set[str] = set()
+        self.output_dir = (
+            Path(output_path).expanduser().resolve().parent if output_path is not None else None
+        )
+
+    def preview(self, path_str: str) -> dict[str, str] | None:
+        """Return ``{"path", "basename", "src"}`` for an image, or None if unavailable."""
+        if self._prefetcher is not None:
+            return self._prefetcher.take(path_str)
+        return self._timed_preview(path_str)
+
+    def src_for(self, preview: dict[str, str]) -> str | None:
+        """Return the ``src`` to write for `preview` at its place in the document.
+
+        Returns None when an identical image was already written, in which case
+        the report points the element at that copy by its ``image_id``.
+        """
+        image_id = preview.get("image_id")
+        if image_id is None:
+            return preview["src"]
+        with self._lock:
+            first = image_id not in self._written
+            if first:
+                self._written.add(image_id)
+                self._encodings.pop(image_id, None)
+        if first:
+            return preview["src"]
+        self.repeated_images += 1
+        if self.profiler is not None:
+            self.profiler.count("images_deduplicated")
+        return None
+
+    @contextmanager
+    def prefetching(
+        self,
+        paths: Iterable[str],
+        *,
+        workers: int = DEFAULT_EMBED_WORKERS,
+        max_inflight_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+    ) -> Iterator[None]:
+        """Resolve `paths` ahead on `workers` threads while the block runs.
+
+        `paths` should follow the order in which `preview` will be called; see
+        `PreviewPrefetcher` for how `max_inflight_bytes` bounds memory. With a
+        single worker previews are resolved on demand as before.
+        """
+        if workers <= 1:
+            yield
+            return
+        with PreviewPrefetcher(
+            self._timed_preview,
+            paths,
+            workers=workers,
+            max_inflight_bytes=max_inflight_bytes,
+            measure_bytes=self.mode == "inline",
+        ) as prefetcher:
+            self._prefetcher = prefetcher
+            try:
+                yield
+            finally:
+                self._prefetcher = None
+
+    def _timed_preview(self, path_str: str) -> dict[str, str] | None:
+        with phase(self.profiler, "image_embedding"):
+            return self._preview(path_str)
+
+    def _preview(self, path_str: str) -> dict[str, str] | None:
+        path = Path(path_str)
+        source = path
+        if self.thumbnails is not None:
+            source = self.thumbnails.thumbnail(path) or path
+        if self.mode == "inline":
+            return self._inline(path_str, path, source)
+        if self.mode == "linked":
+            src = self._link(source)
+        else:
+            src = self._copy(source)
+        if src is None:
+            return None
+        return {"path": path_str, "basename": path.name, "src": src}
+
+    def _inline(self, path_str: str, path: Path, source: Path) -> dict[str, str] | None:
+        if self.deduplicate:
+            return self._inline_deduplicated(path_str, path, source)
+        try:
+            data = source.read_bytes()
+        except OSError:
+            return None
+        if self.profiler is not None:
+            self.profiler.count("bytes_read", len(data))
+        data_uri = self._encode(data, source)
+        return {"path": path_str, "basename": path.name, "src": data_uri, "data_uri": data_uri}
+
+    def _inline_deduplicated(self, path_str: str, path: Path, source: Path) -> dict[str, str] | None:
+        try:
+            stat = source.stat()
+        except OSError:
+            return None
+        # Symlinks and hardlinks to one file share its device and inode.
+        file_key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(file_key)
+            reader = digest is None
+            if reader:
+                digest = self._digests[file_key] = Future()
+        if reader:
+            try:
+                data = source.read_bytes()
+            except OSError:
+                digest.set_result(None)
+                return None
+            if self.profiler is not None:
+                self.profiler.count("bytes_read", len(data))
+            image_id = hashlib.sha256(data).hexdigest()[:24]
+            # Claim the encoding before publishing the digest so that threads
+            # waiting on this file find it.
+            data_uri = self._encoding(image_id, lambda: self._encode(data, source))
+            digest.set_result(image_id)
+        else:
+            image_id = digest.result()
+            if image_id is None:
+                return None
+            data_uri = self._encoding(image_id, None)
+        preview = {"path": path_str, "basename": path.name, "image_id": image_id}
+        if data_uri is not None:
+            preview["src"] = preview["data_uri"] = data_uri
+        return preview
+
+    def _encoding(self, image_id: str, encode: Callable[[], str] | None) -> str | None:
+        """Return the data URI for `image_id`, running `encode` only for its first request.
+
+        Returns None once the image has been written.
+        """
+        with self._lock:
+            if image_id in self._written:
+                return None
+            encoding = self._encodings.get(image_id)
+            owner = encoding is None
+            if owner:
+                encoding = self._encodings[image_id] = Future()
+        if owner:
+            try:
+                encoding.set_result(encode())
+            except BaseException as exc:
+                with self._lock:
+                    self._encodings.pop(image_id, None)
+                encoding.set_exception(exc)
+                raise
+        return encoding.result()
+
+    def _encode(self, data: bytes, source: Path) -> str:
+        mime, _ = mimetypes.guess_type(source.name)
+        if mime is None:
+            mime = "image/jpeg"
+        encoded = base64.b64encode(data).decode("ascii")
+        if self.profiler is not None:
+            self.profiler.count("images_embedded")
+            self.profiler.count("bytes_embedded", len(encoded))
+        return f"data:{mime};base64,{encoded}"
+
+    def _link(self, source: Path) -> str | None:
+        if not source.is_file():
+            return None
+        try:
+            relative = os.path.relpath(source.resolve(), self.output_dir)
+        except ValueError:
+            return source.resolve().as_uri()
+        return quote(Path(relative).as_posix())
+
+    def _copy(self, source: Path) -> str | None:
+        try:
+            stat = source.stat()
+        except OSError:
+            return None
+        token = f"{source.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        digest = hashlib.sha256(token.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        name = f"{digest}_{source.name}"
+        assets_dir = self.output_dir / ASSETS_DIRNAME
+        target = assets_dir / name
+        if not target.exists():
+            assets_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, target)
+            except FileExistsError:
+                pass
+            except OSError:
+                try:
+                    shutil.copy2(source, target)
+                except OSError:
+                    return None
+        return f"{ASSETS_DIRNAME}/{quote(name)}"
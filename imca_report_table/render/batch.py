@@ -0,0 +1,56 @@
+"""Combined index page for multi-trip batch runs."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+from .html import _environment, report_stats, write_html_report
+
+if TYPE_CHECKING:
+    from ..batch import TripOutcome
+
+_STAT_KEYS = ("sites", "pucks", "pins", "collections", "pins_with_issues")
+
+
+def write_trips_index(
+    outcomes: Sequence[TripOutcome],
+    output_path: Path | str,
+    *,
+    generated_at: datetime | None = None,
+    title: str | None = None,
+) -> Path:
+    """Write an index page linking every trip report with its summary counts."""
+    output = Path(output_path).expanduser().resolve()
+    generated_at = generated_at or datetime.now(timezone.utc)
+
+    def href(path: Path | None) -> str | None:
+        return Path(os.path.relpath(path, output.parent)).as_posix() if path else None
+
+    trips = []
+    totals = dict.fromkeys(_STAT_KEYS, 0)
+    for outcome in outcomes:
+        stats = report_stats(outcome.result) if outcome.result is not None else None
+        if stats:
+            for key in _STAT_KEYS:
+                totals[key] += stats[key]
+        trips.append(
+            {
+                "name": outcome.root.name,
+                "path": outcome.root,
+                "href": href(outcome.html_path),
+                "json_href": href(outcome.json_path),
+                "stats": stats,
+                "error": outcome.error,
+                "ok": outcome.ok,
+            }
+        )
+    index = _environment().get_template("trips_index.html.j2").generate(
+        title=title or f"IMCA Trip Reports ({len(trips)} trips)",
+        generated_at=generated_at,
+        stats=totals,
+        trips=trips,
+    )
+    return write_html_report(output, index)
@@ -5,10 +5,12 @@ from __future__ import annotations
 from typing import Sequence
 
 from rich.console import Console
+from rich.table import Table
 from rich.text import Text
 from rich.tree import Tree
 
 from ..models import CollectionStatus, HierarchyResult, PinStatus, TripHierarchy
+from ..profiling import Profiler
 from ..traversal import DEFAULT_EXPECTED_COLLECTION_DIRS
 
 
@@ -81,3 +83,24 @@ def render_hierarchy_console(
     else:
         console.print("[bold red]Missing collection directories detected.[/bold red]")
     return console
+
+
+def render_profile_console(profiler: Profiler, console: Console | None = None) -> Console:
+    """Render recorded phase timings and counters as Rich tables."""
+    console = console or Console()
+    profile = profiler.to_dict()
+    phases = Table(title="Profile", title_justify="left")
+    phases.add_column("Phase")
+    phases.add_column("Seconds", justify="right")
+    phases.add_column("Calls", justify="right")
+    for name, entry in sorted(profile["phases"].items(), key=lambda item: -item[1]["seconds"]):
+        phases.add_row(name, f"{entry['seconds']:.3f}", f"{entry['calls']:,}")
+    console.print(phases)
+    if profile["counters"]:
+        counters = Table()
+        counters.add_column("Counter")
+        counters.add_column("Value", justify="right")
+        for name, value in profile["counters"].items():
+            counters.add_row(name, f"{value:,}")
+        console.print(counters)
+    return console
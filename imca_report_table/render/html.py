@@ -2,23 +2,35 @@
 
 from __future__ import annotations
 
-import base64
-import mimetypes
-import re
+import os
+import tempfile
+import time
+from contextlib import suppress
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Sequence
+from collections.abc import Callable
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from ..models import ExpectedDirectoryStatus, HierarchyResult
+from ..profiling import Profiler, phase
+from ..traversal import DEFAULT_EXPECTED_COLLECTION_DIRS, index_camera_images
+from .assets import AssetResolver
+from .prefetch import DEFAULT_EMBED_BUDGET_BYTES, DEFAULT_EMBED_WORKERS
 
-from ..models import HierarchyResult
-from ..traversal import DEFAULT_EXPECTED_COLLECTION_DIRS
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
+    from .thumbnails import ThumbnailCache
+
+
+@cache
+def _environment() -> Environment:
+    """Return the shared template environment, importing Jinja on first use."""
+    from .templates import create_environment
+
+    return create_environment()
 
-_ENV = Environment(
-    loader=PackageLoader("imca_report_table", "templates"),
-    autoescape=select_autoescape(["html", "xml"]),
-)
 
 CAMERA_PREVIEW_COLUMNS: list[dict[str, str]] = [
     {
@@ -53,7 +65,9 @@ CAMERA_PREVIEW_COLUMNS: list[dict[str, str]] = [
     },
 ]
 
-_RASTER_PATTERN = re.compile(r"raster_(\d+)", re.IGNORECASE)
+_LOOP_COLUMNS = [column for column in CAMERA_PREVIEW_COLUMNS if not column["key"].startswith("raster_")]
+_RASTER_COLUMNS = [column for column in CAMERA_PREVIEW_COLUMNS if column["key"].startswith("raster_")]
+_LOOP_FRAGMENTS = tuple(column["search"] for column in _LOOP_COLUMNS)
 
 PROCESSING_PREVIEW_COLUMNS: list[dict[str, str]] = [
     {
@@ -71,38 +85,116 @@ PROCESSING_PREVIEW_COLUMNS: list[dict[str, str]] = [
 ]
 
 
-def _embed_images(image_paths: Sequence[str], *, name_filter: str | None = None) -> list[dict[str, str]]:
+def _embed_images(
+    image_paths: Sequence[str],
+    *,
+    name_filter: str | None = None,
+    assets: AssetResolver,
+) -> list[dict[str, str]]:
     previews: list[dict[str, str]] = []
     for path_str in image_paths:
-        path = Path(path_str)
-        if name_filter and name_filter not in path.name:
-            continue
-        try:
-            data = path.read_bytes()
-        except OSError:
+        if name_filter and name_filter not in Path(path_str).name:
             continue
-        mime, _ = mimetypes.guess_type(path.name)
-        if mime is None:
-            mime = "image/jpeg"
-        encoded = base64.b64encode(data).decode("ascii")
-        previews.append(
-            {
-                "path": path_str,
-                "basename": path.name,
-                "data_uri": f"data:{mime};base64,{encoded}",
-            }
-        )
+        preview = assets.preview(path_str)
+        if preview is not None:
+            previews.append(preview)
     return previews
 
 
-def flatten_collections(result: HierarchyResult) -> list[dict]:
-    """Return flattened collection rows for tabular reporting."""
-    rows: list[dict] = []
+_CAMERA_PREVIEW_KEYS = ("camera_previews", "camera_preview_cells", "camera_preview_missing")
+_PROCESSING_PREVIEW_KEYS = (
+    "processing_summary_preview",
+    "processing_summary_cells",
+    "processing_summary_missing",
+)
+
+
+class FlatRow(dict):
+    """Flattened row whose preview keys are embedded on first access.
+
+    Each group of keys is produced by a loader the first time any key in the
+    group is looked up (via ``row[key]``, ``row.get(key)``, or Jinja attribute
+    access), so images are read only when a template reaches the preview cells.
+    """
+
+    __slots__ = ("_loaders",)
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        loaders: dict[tuple[str, ...], Callable[[], dict[str, Any]]],
+    ) -> None:
+        super().__init__(data)
+        self._loaders = loaders
+
+    def __missing__(self, key: str) -> Any:
+        for keys, loader in self._loaders.items():
+            if key in keys:
+                del self._loaders[keys]
+                self.update(loader())
+                return self[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def materialize(self) -> dict[str, Any]:
+        """Load every pending preview group and return the row as a plain dict."""
+        for keys, loader in list(self._loaders.items()):
+            del self._loaders[keys]
+            self.update(loader())
+        return dict(self)
+
+
+def flatten_collections(
+    result: HierarchyResult,
+    *,
+    thumbnails: ThumbnailCache | None = None,
+    assets: AssetResolver | None = None,
+    profiler: Profiler | None = None,
+    embed_workers: int = DEFAULT_EMBED_WORKERS,
+    embed_budget_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+) -> list[dict]:
+    """Return flattened collection rows for tabular reporting.
+
+    Preview cells are produced by `assets` (inline ``data:`` URIs by default).
+    When `thumbnails` is given, previews use cached downscaled copies instead
+    of the full-size images. Every row is fully embedded; use `iter_flat_rows`
+    to load previews on demand. Images are read ahead on `embed_workers`
+    threads holding at most `embed_budget_bytes` of unread previews; the rows
+    are the same for any worker count. `profiler` times the call as
+    ``flatten_collections`` and, for the default resolver, its image embedding.
+    """
+    if assets is None:
+        assets = AssetResolver("inline", thumbnails=thumbnails, profiler=profiler)
+    with phase(profiler, "flatten_collections"), assets.prefetching(
+        _preview_plan(result), workers=embed_workers, max_inflight_bytes=embed_budget_bytes
+    ):
+        return [row.materialize() for row in iter_flat_rows(result, assets=assets)]
+
+
+def iter_flat_rows(
+    result: HierarchyResult,
+    *,
+    thumbnails: ThumbnailCache | None = None,
+    assets: AssetResolver | None = None,
+    profiler: Profiler | None = None,
+) -> Iterator[FlatRow]:
+    """Yield flattened collection rows one at a time.
+
+    Rows carry the same keys as `flatten_collections`, but the camera and
+    processing preview keys are only embedded when first accessed.
+    """
+    if assets is None:
+        assets = AssetResolver("inline", thumbnails=thumbnails, profiler=profiler)
     for site, puck, pin, collection in result.trip.iter_collections():
         row = collection.to_flat_row(pin, puck, site, result.trip)
-        expected_info = row.get("expected", {})
-        camera_metadata = expected_info.get("camera", {}).get("metadata", {}) if expected_info else {}
-        processing_metadata = expected_info.get("processing", {}).get("metadata", {}) if expected_info else {}
+        expected_lookup = {entry.name: entry for entry in collection.expected}
+        camera_status = expected_lookup.get("camera")
+        processing_status = expected_lookup.get("processing")
         row["missing_expected_list"] = row.get("missing_expected_names", [])
         row["issues"] = []
         if row["pin_missing_collections"]:
@@ -113,128 +205,167 @@ def flatten_collections(result: HierarchyResult) -> list[dict]:
             )
         if row["extras"]:
             row["issues"].append("Extras: " + ", ".join(row["extras"]))
-        image_files = camera_metadata.get("image_files", []) or []
-        camera_cells: dict[str, dict[str, str] | None] = {}
-        camera_previews: list[dict[str, str]] = []
-        used_camera_paths: set[str] = set()
-        camera_entries: list[tuple[str, str]] = [
-            (Path(path_str).name.lower(), path_str) for path_str in image_files
+        truncated = [
+            f"{entry.name} ({', '.join(entry.metadata['truncated'])})"
+            for entry in collection.expected
+            if entry.metadata.get("truncated")
         ]
+        if truncated:
+            row["issues"].append("Scan truncated: " + ", ".join(truncated))
+        yield FlatRow(
+            row,
+            {
+                _CAMERA_PREVIEW_KEYS: partial(_camera_preview_fields, camera_status, assets),
+                _PROCESSING_PREVIEW_KEYS: partial(
+                    _processing_preview_fields, processing_status, assets
+                ),
+            },
+        )
 
-        def embed_candidate(path_str: str) -> dict[str, str] | None:
-            previews = _embed_images([path_str])
-            if not previews:
-                return None
-            preview = previews[0]
-            used_camera_paths.add(path_str)
-            return preview
 
-        def embed_first_match(candidates: list[str]) -> dict[str, str] | None:
-            for candidate in candidates:
-                if candidate in used_camera_paths:
-                    continue
-                preview = embed_candidate(candidate)
-                if preview is None:
-                    continue
-                return preview
-            return None
+def _camera_candidates(
+    camera_status: ExpectedDirectoryStatus | None,
+) -> tuple[dict[str, list[str]], list[tuple[int, str]]]:
+    """Return the images that can fill each loop column and the rasters by angle.
 
-        def fragments_to_paths(fragment: str | None) -> list[str]:
-            if not fragment:
-                return []
-            key = fragment.lower()
-            return [
-                path_str
-                for basename, path_str in camera_entries
-                if key in basename
-            ]
-
-        def take_preview_for_name(fragment: str | None) -> dict[str, str] | None:
-            return embed_first_match(fragments_to_paths(fragment))
-
-        loop_columns = [
-            column for column in CAMERA_PREVIEW_COLUMNS if not column["key"].startswith("raster_")
-        ]
-        raster_columns = [
-            column for column in CAMERA_PREVIEW_COLUMNS if column["key"].startswith("raster_")
-        ]
+    Uses the ``image_index`` stored by the scan; for caches written without
+    one it is built on first use and kept in the metadata.
+    """
+    if camera_status is None or "image_files" not in camera_status.metadata:
+        return {fragment: [] for fragment in _LOOP_FRAGMENTS}, []
+    metadata = camera_status.metadata
+    image_files = metadata["image_files"] or []
+    index = metadata.get("image_index")
+    if index is None or not all(fragment in index["loop"] for fragment in _LOOP_FRAGMENTS):
+        index = metadata["image_index"] = index_camera_images(image_files, _LOOP_FRAGMENTS)
+    absolute_path = camera_status.absolute_path
+    loop_candidates = {
+        fragment: [absolute_path(image_files[position]) for position in index["loop"][fragment]]
+        for fragment in _LOOP_FRAGMENTS
+    }
+    raster_candidates = [
+        (angle, absolute_path(image_files[position])) for angle, position in index["raster"]
+    ]
+    return loop_candidates, raster_candidates
 
-        for column in loop_columns:
-            preview = take_preview_for_name(column["search"])
-            camera_cells[column["key"]] = preview
-            if preview and preview not in camera_previews:
-                camera_previews.append(preview)
 
-        raster_candidates: list[tuple[int, str]] = []
-        for basename, path_str in camera_entries:
-            match = _RASTER_PATTERN.search(basename)
-            if not match:
-                continue
-            try:
-                angle = int(match.group(1))
-            except ValueError:
+def _summary_image_paths(processing_status: ExpectedDirectoryStatus | None) -> list[str]:
+    if processing_status is None:
+        return []
+    summary_images = processing_status.metadata_paths("summary_images")
+    if not summary_images:
+        summary_image = processing_status.metadata_path("summary_image")
+        summary_images = [summary_image] if summary_image else []
+    return summary_images
+
+
+def _preview_plan(result: HierarchyResult) -> Iterator[str]:
+    """Yield image paths in the order rows request their previews.
+
+    Mirrors `_camera_preview_fields` and `_processing_preview_fields` on the
+    assumption that every image loads; a failed image makes those fall back
+    to candidates that were not planned, which are then resolved on demand.
+    """
+    for _, _, _, collection in result.trip.iter_collections():
+        expected_lookup = {entry.name: entry for entry in collection.expected}
+        loop_candidates, raster_candidates = _camera_candidates(expected_lookup.get("camera"))
+        used: set[str] = set()
+        for fragment in _LOOP_FRAGMENTS:
+            path_str = next((path for path in loop_candidates[fragment] if path not in used), None)
+            if path_str is not None:
+                used.add(path_str)
+                yield path_str
+        rasters = [path_str for _, path_str in raster_candidates if path_str not in used]
+        yield from rasters[: len(_RASTER_COLUMNS)]
+        yield from _summary_image_paths(expected_lookup.get("processing"))
+
+
+def _camera_preview_fields(
+    camera_status: ExpectedDirectoryStatus | None, assets: AssetResolver
+) -> dict[str, Any]:
+    camera_cells: dict[str, dict[str, str] | None] = {}
+    camera_previews: list[dict[str, str]] = []
+    used_camera_paths: set[str] = set()
+    loop_candidates, raster_candidates = _camera_candidates(camera_status)
+
+    def embed_candidate(path_str: str) -> dict[str, str] | None:
+        previews = _embed_images([path_str], assets=assets)
+        if not previews:
+            return None
+        preview = previews[0]
+        used_camera_paths.add(path_str)
+        return preview
+
+    def embed_first_match(candidates: list[str]) -> dict[str, str] | None:
+        for candidate in candidates:
+            if candidate in used_camera_paths:
                 continue
-            if path_str in used_camera_paths:
+            preview = embed_candidate(candidate)
+            if preview is None:
                 continue
-            raster_candidates.append((angle, path_str))
-        raster_candidates.sort(key=lambda item: item[0])
-
-        for index, column in enumerate(raster_columns):
-            preview = None
-            if index < len(raster_candidates):
-                _, path_str = raster_candidates[index]
-                preview = embed_candidate(path_str)
-                if preview and preview not in camera_previews:
-                    camera_previews.append(preview)
-            camera_cells[column["key"]] = preview
-        row["camera_previews"] = camera_previews
-        row["camera_preview_cells"] = camera_cells
-        row["camera_preview_missing"] = [
+            return preview
+        return None
+
+    for column in _LOOP_COLUMNS:
+        preview = embed_first_match(loop_candidates[column["search"]])
+        camera_cells[column["key"]] = preview
+        if preview and preview not in camera_previews:
+            camera_previews.append(preview)
+
+    raster_candidates = [
+        (angle, path_str) for angle, path_str in raster_candidates if path_str not in used_camera_paths
+    ]
+    for index, column in enumerate(_RASTER_COLUMNS):
+        preview = None
+        if index < len(raster_candidates):
+            _, path_str = raster_candidates[index]
+            preview = embed_candidate(path_str)
+            if preview and preview not in camera_previews:
+                camera_previews.append(preview)
+        camera_cells[column["key"]] = preview
+    return {
+        "camera_previews": camera_previews,
+        "camera_preview_cells": camera_cells,
+        "camera_preview_missing": [
             column["missing"]
             for column in CAMERA_PREVIEW_COLUMNS
             if camera_cells[column["key"]] is None
-        ]
-        summary_images = processing_metadata.get("summary_images") or []
-        if not summary_images:
-            summary_image = processing_metadata.get("summary_image")
-            summary_images = [summary_image] if summary_image else []
-        processing_previews = _embed_images(summary_images) if summary_images else []
-        row["processing_summary_preview"] = processing_previews
-        processing_cells: dict[str, dict[str, str] | None] = {}
-        for column in PROCESSING_PREVIEW_COLUMNS:
-            marker = column["search"].lower()
-            preview = next(
-                (
-                    candidate
-                    for candidate in processing_previews
-                    if marker in candidate["basename"].lower()
-                ),
-                None,
-            )
-            processing_cells[column["key"]] = preview
-        row["processing_summary_cells"] = processing_cells
-        row["processing_summary_missing"] = [
+        ],
+    }
+
+
+def _processing_preview_fields(
+    processing_status: ExpectedDirectoryStatus | None, assets: AssetResolver
+) -> dict[str, Any]:
+    summary_images = _summary_image_paths(processing_status)
+    processing_previews = (
+        _embed_images(summary_images, assets=assets) if summary_images else []
+    )
+    processing_cells: dict[str, dict[str, str] | None] = {}
+    for column in PROCESSING_PREVIEW_COLUMNS:
+        marker = column["search"].lower()
+        preview = next(
+            (
+                candidate
+                for candidate in processing_previews
+                if marker in candidate["basename"].lower()
+            ),
+            None,
+        )
+        processing_cells[column["key"]] = preview
+    return {
+        "processing_summary_preview": processing_previews,
+        "processing_summary_cells": processing_cells,
+        "processing_summary_missing": [
             column["missing"]
             for column in PROCESSING_PREVIEW_COLUMNS
             if processing_cells[column["key"]] is None
-        ]
-        rows.append(row)
-    return rows
-
+        ],
+    }
 
-def render_html_report(
-    result: HierarchyResult,
-    *,
-    expected_collection_dirs: Sequence[str] | None = None,
-    generated_at: datetime | None = None,
-    title: str | None = None,
-) -> str:
-    """Render the hierarchy into an HTML document."""
-    template = _ENV.get_template("report.html.j2")
-    expected_dirs = expected_collection_dirs or DEFAULT_EXPECTED_COLLECTION_DIRS
-    generated_at = generated_at or datetime.now(timezone.utc)
-    title = title or f"IMCA Trip Report - {result.trip_name}"
 
+def report_stats(result: HierarchyResult) -> dict[str, int]:
+    """Return the summary counts shown at the top of a report."""
     stats = {
         "sites": len(result.trip.sites),
         "pucks": sum(len(site.pucks) for site in result.trip.sites),
@@ -247,15 +378,32 @@ def render_html_report(
         ),
     }
     stats["pins_with_issues"] = sum(1 for pin in result.trip.iter_pins() if pin.has_issues)
+    return stats
 
-    return template.render(
-        title=title,
-        result=result,
-        generated_at=generated_at,
-        stats=stats,
-        expected_collection_dirs=expected_dirs,
-        flattened_rows=flatten_collections(result),
-        camera_preview_columns=[
+
+def _report_context(
+    result: HierarchyResult,
+    *,
+    expected_collection_dirs: Sequence[str] | None,
+    generated_at: datetime | None,
+    title: str | None,
+    assets: AssetResolver,
+    index_href: str | None = None,
+) -> dict:
+    expected_dirs = expected_collection_dirs or DEFAULT_EXPECTED_COLLECTION_DIRS
+    generated_at = generated_at or datetime.now(timezone.utc)
+    title = title or f"IMCA Trip Report - {result.trip_name}"
+
+    return {
+        "title": title,
+        "result": result,
+        "generated_at": generated_at,
+        "stats": report_stats(result),
+        "index_href": index_href,
+        "assets": assets,
+        "expected_collection_dirs": expected_dirs,
+        "flattened_rows": iter_flat_rows(result, assets=assets),
+        "camera_preview_columns": [
             {
                 "key": column["key"],
                 "header": column["header"],
@@ -263,7 +411,7 @@ def render_html_report(
             }
             for column in CAMERA_PREVIEW_COLUMNS
         ],
-        processing_preview_columns=[
+        "processing_preview_columns": [
             {
                 "key": column["key"],
                 "header": column["header"],
@@ -271,12 +419,153 @@ def render_html_report(
             }
             for column in PROCESSING_PREVIEW_COLUMNS
         ],
+    }
+
+
+def render_html_report(
+    result: HierarchyResult,
+    *,
+    expected_collection_dirs: Sequence[str] | None = None,
+    generated_at: datetime | None = None,
+    title: str | None = None,
+    thumbnails: ThumbnailCache | None = None,
+    asset_mode: str = "inline",
+    output_path: Path | str | None = None,
+    profiler: Profiler | None = None,
+    embed_workers: int = DEFAULT_EMBED_WORKERS,
+    embed_budget_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+) -> str:
+    """Render the hierarchy into an HTML document.
+
+    `asset_mode` selects how previews are referenced: ``inline`` embeds base64
+    ``data:`` URIs, ``linked`` uses paths relative to `output_path`, and ``copy``
+    places the images in an ``assets/`` directory beside `output_path`. The
+    non-inline modes need `output_path`, which should match the path later
+    passed to `write_html_report`. Previews are prepared ahead of the rows on
+    `embed_workers` threads (``1`` renders serially) with at most
+    `embed_budget_bytes` of image data read but not yet rendered. `profiler`
+    times the rendering as ``render_html_report`` with image lookups nested as
+    ``image_embedding``.
+    """
+    return "".join(
+        generate_html_report(
+            result,
+            expected_collection_dirs=expected_collection_dirs,
+            generated_at=generated_at,
+            title=title,
+            thumbnails=thumbnails,
+            asset_mode=asset_mode,
+            output_path=output_path,
+            profiler=profiler,
+            embed_workers=embed_workers,
+            embed_budget_bytes=embed_budget_bytes,
+        )
     )
 
 
-def write_html_report(output_path: Path | str, html_content: str) -> Path:
-    """Write the HTML report to disk."""
+def generate_html_report(
+    result: HierarchyResult,
+    *,
+    expected_collection_dirs: Sequence[str] | None = None,
+    generated_at: datetime | None = None,
+    title: str | None = None,
+    thumbnails: ThumbnailCache | None = None,
+    asset_mode: str = "inline",
+    output_path: Path | str | None = None,
+    index_href: str | None = None,
+    profiler: Profiler | None = None,
+    embed_workers: int = DEFAULT_EMBED_WORKERS,
+    embed_budget_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+) -> Iterator[str]:
+    """Yield the HTML document in chunks as the template renders.
+
+    Rows are flattened (and their previews embedded) only when the template
+    reaches them, so passing the result to `write_html_report` keeps peak memory
+    proportional to a single row. Arguments match `render_html_report`;
+    `index_href` adds a link back to a sharded report's index page.
+    """
+    assets = AssetResolver(
+        asset_mode,
+        output_path=output_path,
+        thumbnails=thumbnails,
+        profiler=profiler,
+        deduplicate=True,
+    )
+    context = _report_context(
+        result,
+        expected_collection_dirs=expected_collection_dirs,
+        generated_at=generated_at,
+        title=title,
+        assets=assets,
+        index_href=index_href,
+    )
+    chunks = _prefetched(
+        _environment().get_template("report.html.j2").generate(**context),
+        assets,
+        _preview_plan(result),
+        workers=embed_workers,
+        max_inflight_bytes=embed_budget_bytes,
+    )
+    if profiler is not None:
+        return profiler.timed_chunks("render_html_report", chunks)
+    return chunks
+
+
+def _prefetched(
+    chunks: Iterator[str],
+    assets: AssetResolver,
+    plan: Iterable[str],
+    *,
+    workers: int,
+    max_inflight_bytes: int,
+) -> Iterator[str]:
+    with assets.prefetching(plan, workers=workers, max_inflight_bytes=max_inflight_bytes):
+        yield from chunks
+
+
+def _file_mode(output: Path) -> int:
+    try:
+        return output.stat().st_mode & 0o777
+    except OSError:
+        return 0o644
+
+
+def write_html_report(
+    output_path: Path | str,
+    html_content: str | Iterable[str],
+    *,
+    profiler: Profiler | None = None,
+) -> Path:
+    """Write the HTML report to disk.
+
+    `html_content` may be a complete document or an iterable of chunks (such as
+    the output of `generate_html_report`), which is streamed to the file. The
+    report is written to a temporary file beside `output_path` and moved over
+    it once complete, so readers never see a partial report and a failed
+    render leaves the previous one in place. `profiler` times the writes alone
+    as ``write_html`` and counts ``bytes_written``; producing streamed chunks
+    is not included.
+    """
     output = Path(output_path).expanduser().resolve()
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(html_content, encoding="utf-8")
+    chunks = [html_content] if isinstance(html_content, str) else html_content
+    elapsed = 0.0
+    handle = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=output.parent, prefix=f".{output.name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with handle:
+            for chunk in chunks:
+                start = time.perf_counter()
+                handle.write(chunk)
+                elapsed += time.perf_counter() - start
+        os.chmod(handle.name, _file_mode(output))
+        os.replace(handle.name, output)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(handle.name)
+        raise
+    if profiler is not None:
+        profiler.add_time("write_html", elapsed)
+        profiler.count("bytes_written", output.stat().st_size)
     return output
@@ -0,0 +1,150 @@
+"""Resolve report previews on a thread pool ahead of the rows that use them."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_EMBED_WORKERS = 8
+DEFAULT_EMBED_BUDGET_BYTES = 64 * 1024 * 1024
+
+Preview = dict[str, str]
+
+
+class _Task:
+    __slots__ = ("path", "size", "dropped", "future")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = 0
+        self.dropped = False
+        self.future: Future[Preview | None] | None = None
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+class PreviewPrefetcher:
+    """Read previews ahead on `workers` threads while holding at most a byte budget.
+
+    `paths` is consumed lazily and should list images in the order `take` will
+    ask for them; up to ``4 * workers`` are queued at a time. With
+    `measure_bytes`, each worker reserves the image's size before reading it
+    and the reservation is released when `take` hands the preview over, so at
+    most `max_inflight_bytes` of image data waits between the two (a larger
+    single image is still read once nothing else is held). The preview the
+    caller is waiting for always proceeds, and one that has not started yet is
+    resolved on the calling thread instead.
+
+    `take` returns exactly what `resolve` returns for the path. Paths that are
+    skipped over are discarded, and paths that were never planned (or were
+    discarded) are resolved directly. Call `take` from a single thread.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Preview | None],
+        paths: Iterable[str],
+        *,
+        workers: int = DEFAULT_EMBED_WORKERS,
+        max_inflight_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+        measure_bytes: bool = True,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if max_inflight_bytes < 1:
+            raise ValueError(f"max_inflight_bytes must be positive, got {max_inflight_bytes}")
+        self._resolve = resolve
+        self._paths = iter(paths)
+        self._window = workers * 4
+        self._budget = max_inflight_bytes
+        self._measure_bytes = measure_bytes
+        self._used = 0
+        self._head: _Task | None = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._pending: deque[_Task] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imca-embed")
+
+    def __enter__(self) -> PreviewPrefetcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _load(self, task: _Task) -> Preview | None:
+        size = _file_size(task.path) if self._measure_bytes else 0
+        with self._cond:
+            while (
+                self._used
+                and self._used + size > self._budget
+                and self._head is not task
+                and not task.dropped
+                and not self._closed
+            ):
+                self._cond.wait()
+            if task.dropped or self._closed:
+                return None
+            self._used += size
+            task.size = size
+        return self._resolve(task.path)
+
+    def _release(self, size: int) -> None:
+        if size:
+            with self._cond:
+                self._used -= size
+                self._cond.notify_all()
+
+    def _fill(self) -> None:
+        while len(self._pending) < self._window:
+            path = next(self._paths, None)
+            if path is None:
+                return
+            task = _Task(path)
+            task.future = self._executor.submit(self._load, task)
+            self._pending.append(task)
+
+    def _drop(self, task: _Task) -> None:
+        if task.future.cancel():
+            return
+        with self._cond:
+            task.dropped = True
+            self._cond.notify_all()
+        task.future.add_done_callback(lambda _: self._release(task.size))
+
+    def take(self, path: str) -> Preview | None:
+        """Return the preview for `path`, waiting for its prefetch if needed."""
+        self._fill()
+        if not any(task.path == path for task in self._pending):
+            return self._resolve(path)
+        while True:
+            task = self._pending.popleft()
+            if task.path == path:
+                break
+            self._drop(task)
+        self._fill()
+        if task.future.cancel():
+            return self._resolve(path)
+        with self._cond:
+            self._head = task
+            self._cond.notify_all()
+        try:
+            return task.future.result()
+        finally:
+            self._release(task.size)
+
+    def close(self) -> None:
+        """Discard outstanding prefetches and stop the worker threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
@@ -0,0 +1,172 @@
+"""Multi-page HTML reports for very large trips."""
+
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+from ..models import HierarchyResult, PinStatus, PuckStatus, SiteStatus, TripHierarchy
+from ..profiling import Profiler
+from .html import _environment, generate_html_report, report_stats, write_html_report
+from .prefetch import DEFAULT_EMBED_BUDGET_BYTES, DEFAULT_EMBED_WORKERS
+from .thumbnails import ThumbnailCache
+
+SHARD_MODES: tuple[str, ...] = ("site", "puck")
+
+_SLUG_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+
+PinSelection = list[tuple[SiteStatus, PuckStatus, PinStatus]]
+
+
+def _subset(result: HierarchyResult, pins: PinSelection) -> HierarchyResult:
+    """Build a HierarchyResult holding only `pins`, keeping their site and puck parents."""
+    trip = TripHierarchy(name=result.trip.name, path=result.trip.path)
+    site_nodes: dict[int, SiteStatus] = {}
+    puck_nodes: dict[int, PuckStatus] = {}
+    for site, puck, pin in pins:
+        site_node = site_nodes.get(id(site))
+        if site_node is None:
+            site_node = SiteStatus(name=site.name, path=site.path, mtime_ns=site.mtime_ns)
+            site_nodes[id(site)] = site_node
+            trip.add_site(site_node)
+        puck_node = puck_nodes.get(id(puck))
+        if puck_node is None:
+            puck_node = PuckStatus(name=puck.name, path=puck.path, mtime_ns=puck.mtime_ns)
+            puck_nodes[id(puck)] = puck_node
+            site_node.add_puck(puck_node)
+        puck_node.add_pin(pin)
+    return HierarchyResult(
+        trip=trip,
+        all_expected_present=not any(pin.has_issues for _, _, pin in pins),
+    )
+
+
+def shard_hierarchy(
+    result: HierarchyResult,
+    *,
+    shard_by: str | None = None,
+    rows_per_page: int | None = None,
+) -> list[tuple[str, HierarchyResult]]:
+    """Split a hierarchy into labelled shards by site, by puck, or by row count.
+
+    Row-count pages never split a pin, so a pin with more collections than
+    `rows_per_page` gets a page of its own.
+    """
+    if (shard_by is None) == (rows_per_page is None):
+        raise ValueError("specify exactly one of shard_by or rows_per_page")
+    if shard_by is not None and shard_by not in SHARD_MODES:
+        raise ValueError(f"unknown shard mode {shard_by!r}; expected one of {', '.join(SHARD_MODES)}")
+    if rows_per_page is not None and rows_per_page < 1:
+        raise ValueError(f"rows_per_page must be at least 1, got {rows_per_page}")
+
+    groups: list[tuple[str, PinSelection]] = []
+    if shard_by == "site":
+        for site in result.trip.sites:
+            groups.append(
+                (f"Site {site.name}", [(site, puck, pin) for puck in site.pucks for pin in puck.pins])
+            )
+    elif shard_by == "puck":
+        for site in result.trip.sites:
+            for puck in site.pucks:
+                groups.append(
+                    (f"Site {site.name} / Puck {puck.name}", [(site, puck, pin) for pin in puck.pins])
+                )
+    else:
+        current: PinSelection = []
+        current_rows = 0
+        for site in result.trip.sites:
+            for puck in site.pucks:
+                for pin in puck.pins:
+                    rows = len(pin.collections)
+                    if current and current_rows + rows > rows_per_page:
+                        groups.append((f"Page {len(groups) + 1}", current))
+                        current, current_rows = [], 0
+                    current.append((site, puck, pin))
+                    current_rows += rows
+        if current:
+            groups.append((f"Page {len(groups) + 1}", current))
+    return [(label, _subset(result, pins)) for label, pins in groups]
+
+
+def write_sharded_html_report(
+    result: HierarchyResult,
+    output_path: Path | str,
+    *,
+    shard_by: str | None = None,
+    rows_per_page: int | None = None,
+    workers: int | None = None,
+    expected_collection_dirs: Sequence[str] | None = None,
+    generated_at: datetime | None = None,
+    title: str | None = None,
+    thumbnails: ThumbnailCache | None = None,
+    asset_mode: str = "inline",
+    profiler: Profiler | None = None,
+    embed_workers: int = DEFAULT_EMBED_WORKERS,
+    embed_budget_bytes: int = DEFAULT_EMBED_BUDGET_BYTES,
+) -> Path:
+    """Write an index page at `output_path` plus one report page per shard.
+
+    Pages are written to ``<stem>_pages/`` beside the index and rendered on a
+    thread pool of `workers` threads; each page embeds only its own previews.
+    `profiler`, `embed_workers`, and `embed_budget_bytes` are passed on to
+    every page render. Returns the index path.
+    """
+    output = Path(output_path).expanduser().resolve()
+    pages_dir = output.parent / f"{output.stem}_pages"
+    generated_at = generated_at or datetime.now(timezone.utc)
+    title = title or f"IMCA Trip Report - {result.trip_name}"
+    index_href = Path(os.path.relpath(output, pages_dir)).as_posix()
+
+    shards = shard_hierarchy(result, shard_by=shard_by, rows_per_page=rows_per_page)
+    pages = []
+    for number, (label, shard) in enumerate(shards, start=1):
+        slug = _SLUG_PATTERN.sub("-", label).strip("-")
+        filename = f"{number:03d}-{slug}.html"
+        pages.append(
+            {
+                "label": label,
+                "href": f"{pages_dir.name}/{filename}",
+                "path": pages_dir / filename,
+                "result": shard,
+                "stats": report_stats(shard),
+            }
+        )
+
+    def render_page(page: dict) -> Path:
+        return write_html_report(
+            page["path"],
+            generate_html_report(
+                page["result"],
+                expected_collection_dirs=expected_collection_dirs,
+                generated_at=generated_at,
+                title=f"{title} — {page['label']}",
+                thumbnails=thumbnails,
+                asset_mode=asset_mode,
+                output_path=page["path"],
+                index_href=index_href,
+                profiler=profiler,
+                embed_workers=embed_workers,
+                embed_budget_bytes=embed_budget_bytes,
+            ),
+            profiler=profiler,
+        )
+
+    if workers and workers > 1 and len(pages) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imca-page") as executor:
+            list(executor.map(render_page, pages))
+    else:
+        for page in pages:
+            render_page(page)
+
+    index = _environment().get_template("index.html.j2").generate(
+        title=title,
+        result=result,
+        generated_at=generated_at,
+        stats=report_stats(result),
+        pages=pages,
+    )
+    return write_html_report(output, index, profiler=profiler)
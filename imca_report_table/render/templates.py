@@ -0,0 +1,52 @@
+"""Jinja environment for the report templates, backed by a bytecode cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader, select_autoescape
+from jinja2.bccache import Bucket
+
+from ..utils import default_cache_dir
+
+TEMPLATE_CACHE_DIRNAME = "templates"
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Compiled templates stored on disk and shared between runs.
+
+    Jinja keys each entry by template name and checks a hash of its source
+    (and the Python bytecode version) on load, so edited templates are simply
+    recompiled. A cache directory that cannot be read or written only costs
+    the compilation; it never fails a render.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        super().__init__(str(directory), pattern="%s.jinja-cache")
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def create_environment(cache_dir: Path | str | None = None) -> Environment:
+    """Return an environment loading the packaged templates.
+
+    Compiled templates are cached in `cache_dir` (default:
+    ``~/.cache/imca-report-table/templates``).
+    """
+    directory = Path(cache_dir).expanduser() if cache_dir else default_cache_dir() / TEMPLATE_CACHE_DIRNAME
+    return Environment(
+        loader=PackageLoader("imca_report_table", "templates"),
+        autoescape=select_autoescape(["html", "xml"]),
+        bytecode_cache=TemplateBytecodeCache(directory),
+    )
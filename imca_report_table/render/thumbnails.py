@@ -0,0 +1,147 @@
+"""Persistent thumbnail cache for HTML report previews."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..utils import default_cache_dir
+
+DEFAULT_THUMBNAIL_SIZE = 480
+DEFAULT_CACHE_LIMIT_BYTES = 512 * 1024 * 1024
+# Eviction frees space down to this fraction of the limit, so a full cache is
+# rescanned once per batch of new thumbnails rather than for every one.
+EVICTION_LOW_WATER = 0.8
+
+
+def _pillow_image() -> Any:
+    """Return ``PIL.Image``, or None without Pillow (an optional, slow-to-import dependency)."""
+    try:  # ``pip install imca-report-table[thumbnails]``
+        from PIL import Image
+    except ImportError:  # pragma: no cover - exercised only without Pillow
+        return None
+    return Image
+
+
+class ThumbnailCache:
+    """Content-addressed store of downscaled preview images.
+
+    Entries are keyed by source path, size, mtime, and the requested maximum
+    edge length, so a re-render only generates thumbnails for new or changed
+    images. Each hit refreshes the entry's mtime, and the least recently used
+    entries are evicted once the cache grows beyond `limit_bytes`, down to
+    `EVICTION_LOW_WATER` of it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        *,
+        max_size: int = DEFAULT_THUMBNAIL_SIZE,
+        limit_bytes: int = DEFAULT_CACHE_LIMIT_BYTES,
+    ) -> None:
+        self._image = _pillow_image()
+        if self._image is None:
+            raise RuntimeError(
+                "thumbnails require Pillow; install it with `pip install imca-report-table[thumbnails]`"
+            )
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else default_cache_dir() / "thumbnails"
+        self.max_size = max_size
+        self.limit_bytes = limit_bytes
+        self.generated = 0
+        self.reused = 0
+        self._usage: int | None = None
+        self._lock = threading.Lock()
+
+    def _key(self, source: str, stat: os.stat_result) -> str:
+        token = f"{source}\0{stat.st_size}\0{stat.st_mtime_ns}\0{self.max_size}"
+        return hashlib.sha256(token.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def thumbnail(self, source: Path | str) -> Path | None:
+        """Return a cached thumbnail for `source`, generating it when needed.
+
+        Returns None when the source cannot be read or decoded.
+        """
+        source_path = os.path.abspath(source)
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        key = self._key(source_path, stat)
+        suffix = ".png" if source_path.lower().endswith(".png") else ".jpg"
+        target = self.cache_dir / key[:2] / f"{key}{suffix}"
+        try:
+            os.utime(target)
+        except OSError:
+            pass
+        else:
+            with self._lock:
+                self.reused += 1
+            return target
+
+        Image = self._image
+        try:
+            with Image.open(source_path) as image:
+                image.thumbnail((self.max_size, self.max_size))
+                if suffix == ".jpg" and image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=suffix)
+                try:
+                    with os.fdopen(fd, "wb") as handle:
+                        image.save(handle, format="PNG" if suffix == ".png" else "JPEG")
+                    os.replace(tmp_name, target)
+                except BaseException:
+                    os.unlink(tmp_name)
+                    raise
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+
+        size = target.stat().st_size
+        with self._lock:
+            self.generated += 1
+            if self._usage is None:
+                self._usage = self._measure_usage()
+            else:
+                self._usage += size
+            if self._usage > self.limit_bytes:
+                self._evict(keep=str(target))
+        return target
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries: list[tuple[float, int, str]] = []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _measure_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used entries (never `keep`) down to the low-water mark."""
+        target = int(self.limit_bytes * EVICTION_LOW_WATER)
+        entries = sorted(self._entries())
+        usage = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if usage <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            usage -= size
+        self._usage = usage
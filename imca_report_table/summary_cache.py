@@ -0,0 +1,210 @@
+"""Persistent cache of image references parsed from XDS ``00_summary.html`` files."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .utils import default_cache_dir
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DEFAULT_SUMMARY_CACHE_LIMIT_BYTES = 64 * 1024 * 1024
+SUMMARY_CACHE_FILENAME = "summaries.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    refs TEXT NOT NULL,
+    used INTEGER NOT NULL
+)
+"""
+# Rough per-row overhead (key, integers, b-tree cell) used for the size budget.
+_ROW_OVERHEAD = 48
+# Eviction frees space down to this fraction of the limit, so a full cache
+# evicts once per batch of new summaries rather than on every run.
+EVICTION_LOW_WATER = 0.8
+# SQLite reuses freed pages; the file is only compacted once they dominate it.
+_VACUUM_FREE_FRACTION = 0.5
+
+
+@dataclass(slots=True)
+class SummaryCacheDelta:
+    """Cache activity recorded by a pickled `SummaryCache` copy."""
+
+    entries: list[tuple[str, int, int, str]] = field(default_factory=list)
+    used: list[str] = field(default_factory=list)
+    hits: int = 0
+    misses: int = 0
+
+
+class SummaryCache:
+    """SQLite store of the ``<img src>`` references found in summary files.
+
+    Entries are keyed by summary path and only reused while the file's size
+    and mtime are unchanged, so finished datasets are parsed once. New entries
+    and hit timestamps are buffered and written on `close`, which also evicts
+    the least recently used entries once they exceed `limit_bytes`, down to
+    `EVICTION_LOW_WATER` of it.
+
+    Instances can be pickled for process pools: the copy opens its own
+    connection and never writes; hand its `take_pending` entries to `merge` on
+    the original instead.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        *,
+        limit_bytes: int = DEFAULT_SUMMARY_CACHE_LIMIT_BYTES,
+    ) -> None:
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+        self.limit_bytes = limit_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection: sqlite3.Connection | None = None
+        self._pending: dict[str, tuple[int, int, str]] = {}
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / SUMMARY_CACHE_FILENAME
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"cache_dir": self.cache_dir, "limit_bytes": self.limit_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["cache_dir"], limit_bytes=state["limit_bytes"])
+
+    def __enter__(self) -> SummaryCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        import sqlite3  # deferred so CLI runs without --summary-cache never load it
+
+        if self._connection is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get(self, summary_path: str, stat: os.stat_result) -> list[str] | None:
+        """Return the cached references for an unchanged summary, else None."""
+        import sqlite3
+
+        with self._lock:
+            pending = self._pending.get(summary_path)
+            if pending is not None:
+                row: tuple[int, int, str] | None = pending
+            else:
+                try:
+                    row = self._connect().execute(
+                        "SELECT size, mtime_ns, refs FROM summaries WHERE path = ?",
+                        (summary_path,),
+                    ).fetchone()
+                except (OSError, sqlite3.Error):
+                    row = None
+            if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used.add(summary_path)
+            return json.loads(row[2])
+
+    def put(self, summary_path: str, stat: os.stat_result, refs: list[str]) -> None:
+        """Record the references parsed from `summary_path`."""
+        with self._lock:
+            self._pending[summary_path] = (stat.st_size, stat.st_mtime_ns, json.dumps(refs))
+
+    def take_pending(self) -> SummaryCacheDelta:
+        """Return and forget the entries, hits, and counters recorded so far."""
+        with self._lock:
+            delta = SummaryCacheDelta(
+                entries=[(path, *entry) for path, entry in self._pending.items()],
+                used=sorted(self._used),
+                hits=self.hits,
+                misses=self.misses,
+            )
+            self._pending.clear()
+            self._used.clear()
+            self.hits = self.misses = 0
+            return delta
+
+    def merge(self, delta: SummaryCacheDelta) -> None:
+        """Fold a delta taken from a pickled copy into this cache."""
+        with self._lock:
+            self.hits += delta.hits
+            self.misses += delta.misses
+            self._used.update(delta.used)
+            for path, size, mtime_ns, refs in delta.entries:
+                self._pending[path] = (size, mtime_ns, refs)
+
+    def close(self) -> None:
+        """Write buffered entries, evict beyond the size limit, and disconnect."""
+        import sqlite3
+
+        with self._lock:
+            if not self._pending and not self._used and self._connection is None:
+                return
+            now = time.time_ns()
+            rows = [
+                (path, size, mtime_ns, refs, now)
+                for path, (size, mtime_ns, refs) in self._pending.items()
+            ]
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)", rows)
+                    connection.executemany(
+                        "UPDATE summaries SET used = ? WHERE path = ?",
+                        [(now, path) for path in self._used - self._pending.keys()],
+                    )
+                if self._evict(connection):
+                    self._compact(connection)
+            except (OSError, sqlite3.Error):
+                pass
+            finally:
+                if self._connection is not None:
+                    self._connection.close()
+                self._connection = None
+                self._pending.clear()
+                self._used.clear()
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        (total,) = connection.execute(
+            f"SELECT COALESCE(SUM(LENGTH(path) + LENGTH(refs) + {_ROW_OVERHEAD}), 0) FROM summaries"
+        ).fetchone()
+        if total <= self.limit_bytes:
+            return 0
+        target = int(self.limit_bytes * EVICTION_LOW_WATER)
+        doomed: list[tuple[str]] = []
+        for path, row_bytes in connection.execute(
+            f"SELECT path, LENGTH(path) + LENGTH(refs) + {_ROW_OVERHEAD} FROM summaries ORDER BY used, path"
+        ).fetchall():
+            if total <= target:
+                break
+            doomed.append((path,))
+            total -= row_bytes
+        with connection:
+            connection.executemany("DELETE FROM summaries WHERE path = ?", doomed)
+        return len(doomed)
+
+    def _compact(self, connection: sqlite3.Connection) -> None:
+        """Rewrite the database file only when most of its pages are free."""
+        (free,) = connection.execute("PRAGMA freelist_count").fetchone()
+        (pages,) = connection.execute("PRAGMA page_count").fetchone()
+        if pages and free > pages * _VACUUM_FREE_FRACTION:
+            connection.execute("VACUUM")
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from functools import partial
+import os
 from pathlib import Path
 import re
-from typing import Iterable, Sequence
+import threading
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, TypeVar
 
 from .models import (
     CollectionStatus,
@@ -16,6 +22,14 @@ from .models import (
     SiteStatus,
     TripHierarchy,
 )
+from .profiling import Profiler, phase
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .summary_cache import SummaryCache, SummaryCacheDelta
+
+_T = TypeVar("_T")
 
 DEFAULT_EXPECTED_COLLECTION_DIRS: Sequence[str] = (
     "camera",
@@ -25,31 +39,180 @@ DEFAULT_EXPECTED_COLLECTION_DIRS: Sequence[str] = (
 )
 
 
-def _iter_dirs(path: Path) -> Iterable[Path]:
-    """Yield child directories sorted alphabetically."""
-    return sorted((child for child in path.iterdir() if child.is_dir()), key=lambda p: p.name)
+def _scan_dirs(path: str | os.PathLike[str]) -> list[os.DirEntry[str]]:
+    """Return child directory entries sorted alphabetically.
+
+    Uses the type information cached on each ``DirEntry`` so that no extra
+    ``stat`` call is needed per child on filesystems that report ``d_type``.
+    """
+    with os.scandir(path) as entries:
+        children = [entry for entry in entries if entry.is_dir()]
+    children.sort(key=lambda entry: entry.name)
+    return children
+
+
+@dataclass(frozen=True, slots=True)
+class ScanLimits:
+    """Bounds applied when walking camera and processing directories.
+
+    `max_depth` is the number of subdirectory levels descended below the
+    expected directory (0 keeps only its direct files), `prune` holds glob
+    patterns for directory names that are never entered, and `max_files` caps
+    the number of files visited per expected directory.
+    """
+
+    max_depth: int | None = None
+    prune: tuple[str, ...] = ()
+    max_files: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_depth is not None and self.max_depth < 0:
+            raise ValueError(f"max_depth must not be negative, got {self.max_depth}")
+        if self.max_files is not None and self.max_files < 1:
+            raise ValueError(f"max_files must be at least 1, got {self.max_files}")
+
+
+def _walk_files(
+    directory: str | os.PathLike[str],
+    limits: ScanLimits | None = None,
+    truncated: set[str] | None = None,
+    profiler: Profiler | None = None,
+    directories: dict[str, int] | None = None,
+) -> Iterator[os.DirEntry[str]]:
+    """Yield file entries below `directory`, mirroring ``Path.rglob("*")``.
+
+    Symlinked directories are not descended into; unreadable directories are skipped.
+    Directories or files left out because of `limits` add the name of the limit
+    (``max_depth``, ``prune``, or ``max_files``) to `truncated`. Each directory
+    listed is recorded in `directories` by its path relative to `directory`
+    (``"."`` for `directory` itself) with its mtime. The directories listed and
+    files yielded are added to `profiler` once the walk ends.
+    """
+    max_depth = limits.max_depth if limits else None
+    prune = limits.prune if limits else ()
+    max_files = limits.max_files if limits else None
+    visited = 0
+    listed = 0
+    top = os.fspath(directory)
+    pending = [(top, 0)]
+    try:
+        while pending:
+            current, depth = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    listed += 1
+                    if directories is not None:
+                        key = "." if current == top else _relative_to(current, top)
+                        directories[key] = os.stat(current).st_mtime_ns
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if prune and any(fnmatchcase(entry.name, pattern) for pattern in prune):
+                                if truncated is not None:
+                                    truncated.add("prune")
+                            elif max_depth is not None and depth >= max_depth:
+                                if truncated is not None:
+                                    truncated.add("max_depth")
+                            else:
+                                pending.append((entry.path, depth + 1))
+                        elif entry.is_file():
+                            if max_files is not None and visited >= max_files:
+                                if truncated is not None:
+                                    truncated.add("max_files")
+                                return
+                            visited += 1
+                            yield entry
+            except OSError:
+                continue
+    finally:
+        if profiler is not None:
+            profiler.count("directories", listed)
+            profiler.count("files", visited)
 
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp"}
 CSV_EXTENSIONS = {".csv"}
 
+CAMERA_LOOP_FRAGMENTS: Sequence[str] = ("loop-inter_4_000", "loop-inter_4_045", "loop-inter_4_090")
+_RASTER_PATTERN = re.compile(r"raster_(\d+)", re.IGNORECASE)
+
+
+def _relative_to(path: str, base: str) -> str:
+    """Return `path` relative to `base` when it lies inside it, otherwise unchanged."""
+    prefix = base.rstrip(os.sep) + os.sep
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def _truncation_metadata(truncated: set[str]) -> dict[str, list[str]]:
+    return {"truncated": sorted(truncated)} if truncated else {}
+
 
-def _collect_camera_metadata(camera_dir: Path) -> dict[str, list[str]]:
-    """Collect absolute image and CSV file paths from a camera directory."""
+def index_camera_images(
+    image_files: Sequence[str], loop_fragments: Sequence[str] = CAMERA_LOOP_FRAGMENTS
+) -> dict[str, Any]:
+    """Classify camera images by the report preview they can fill.
+
+    Returns ``{"loop": {fragment: [position, ...]}, "raster": [[angle, position], ...]}``
+    where positions index `image_files`: ``loop`` lists, per fragment, the
+    images whose basename contains it (ignoring case), and ``raster`` lists the
+    ``raster_<angle>`` images ordered by angle.
+    """
+    loop: dict[str, list[int]] = {fragment: [] for fragment in loop_fragments}
+    searches = [(fragment.lower(), positions) for fragment, positions in loop.items()]
+    raster: list[list[int]] = []
+    for position, value in enumerate(image_files):
+        basename = os.path.basename(value).lower()
+        for search, positions in searches:
+            if search in basename:
+                positions.append(position)
+        match = _RASTER_PATTERN.search(basename)
+        if match:
+            raster.append([int(match.group(1)), position])
+    raster.sort(key=lambda item: item[0])
+    return {"loop": loop, "raster": raster}
+
+
+def _collect_camera_metadata(
+    camera_dir: Path,
+    *,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    profiler: Profiler | None = None,
+    stamps: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """Collect image and CSV file paths from a camera directory.
+
+    Paths are stored relative to the camera directory; use
+    `ExpectedDirectoryStatus.metadata_paths` to get absolute paths back. With
+    `follow_symlinks` every file is resolved first, and files resolving outside
+    the resolved directory stay absolute. ``image_index`` classifies the images
+    with `index_camera_images`. Limits that cut the walk short are listed
+    under ``truncated``. The mtime of every directory walked is recorded in
+    `stamps`.
+    """
+    base = os.path.realpath(camera_dir) if follow_symlinks else os.fspath(camera_dir)
     image_files: list[str] = []
     csv_files: list[str] = []
-    for file_path in camera_dir.rglob("*"):
-        if not file_path.is_file():
-            continue
-        suffix = file_path.suffix.lower()
-        resolved = str(file_path.resolve())
-        if suffix in IMAGE_EXTENSIONS:
-            image_files.append(resolved)
-        elif suffix in CSV_EXTENSIONS:
-            csv_files.append(resolved)
-    image_files.sort()
-    csv_files.sort()
-    return {"image_files": image_files, "csv_files": csv_files}
+    truncated: set[str] = set()
+    with phase(profiler, "camera_metadata"):
+        for entry in _walk_files(camera_dir, limits, truncated, profiler, stamps):
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix not in IMAGE_EXTENSIONS and suffix not in CSV_EXTENSIONS:
+                continue
+            file_path = os.path.realpath(entry.path) if follow_symlinks else entry.path
+            resolved = _relative_to(file_path, base)
+            if suffix in IMAGE_EXTENSIONS:
+                image_files.append(resolved)
+            elif suffix in CSV_EXTENSIONS:
+                csv_files.append(resolved)
+        image_files.sort()
+        csv_files.sort()
+        image_index = index_camera_images(image_files)
+    return {
+        "image_files": image_files,
+        "image_index": image_index,
+        "csv_files": csv_files,
+        **_truncation_metadata(truncated),
+    }
 
 
 _SUMMARY_IMG_PATTERN = re.compile(
@@ -58,7 +221,18 @@ _SUMMARY_IMG_PATTERN = re.compile(
 )
 
 
-def _normalize_summary_path(raw_ref: str, processing_dir: Path, summary_file: Path) -> Path | None:
+def _normalize_summary_path(
+    raw_ref: str,
+    processing_dir: Path,
+    summary_file: Path,
+    *,
+    follow_symlinks: bool = False,
+) -> Path | None:
+    """Return the existing file an ``<img src>`` reference points at, if any.
+
+    Candidates are normalised lexically unless `follow_symlinks` is set, so each
+    costs a single ``stat``.
+    """
     ref = raw_ref.split("?")[0].split("#")[0]
     if ref.startswith("file://"):
         ref = ref[7:]
@@ -72,182 +246,834 @@ def _normalize_summary_path(raw_ref: str, processing_dir: Path, summary_file: Pa
         candidates.append((summary_file.parent / path_candidate))
         candidates.append((processing_dir / path_candidate.name))
     for candidate in candidates:
-        try:
-            resolved = candidate.resolve()
-        except FileNotFoundError:
-            resolved = candidate
-        if resolved.exists():
-            return resolved
+        if follow_symlinks:
+            normalized = candidate.resolve()
+        else:
+            normalized = Path(os.path.normpath(candidate))
+        if normalized.exists():
+            return normalized
     return None
 
 
-def _collect_processing_metadata(processing_dir: Path) -> dict[str, str | list[str]]:
-    """Extract summary image paths from processing directory."""
-    candidate_summaries = [
-        processing_dir / "00_summary.html",
-        processing_dir / "00_summary" / "00_summary.html",
-    ]
-    if processing_dir.exists():
-        candidate_summaries.extend(processing_dir.glob("**/00_summary.html"))
-
-    summary_file: Path | None = None
-    for candidate in candidate_summaries:
-        if candidate.exists():
-            summary_file = candidate
-            break
+_SUMMARY_NAME = "00_summary.html"
+_FALLBACK_IMAGE_PATTERNS = (
+    "SPOT.XDS*SpotsPerImage*.png",
+    "INTEGRATE_select2.mrfana.fitness_batch_select2.png",
+)
+
+
+class _ProcessingScan:
+    """One walk of a processing tree for its summary HTML and fallback images.
+
+    `summary` walks until one of the two preferred summaries is seen and
+    `fallbacks` resumes the same walk to the end, so no directory is listed
+    twice. Limits that the walk ran into are only reported (see `truncation`)
+    once it has run to the end: a walk that stops at a preferred summary finds
+    the same one with or without limits.
+    """
+
+    __slots__ = ("_top", "_nested", "_entries", "_best", "_fallbacks", "_truncated", "complete")
+
+    def __init__(
+        self,
+        processing_dir: Path,
+        limits: ScanLimits | None = None,
+        profiler: Profiler | None = None,
+        directories: dict[str, int] | None = None,
+    ) -> None:
+        self._top = os.fspath(processing_dir)
+        self._nested = os.path.join(self._top, "00_summary")
+        self._truncated: set[str] = set()
+        self._entries = _walk_files(self._top, limits, self._truncated, profiler, directories)
+        self._best: tuple[int, str] | None = None
+        self._fallbacks: list[str | None] = [None] * len(_FALLBACK_IMAGE_PATTERNS)
+        self.complete = False
+
+    def _advance(self, stop_at_summary: bool) -> None:
+        for entry in self._entries:
+            name = entry.name
+            if name == _SUMMARY_NAME:
+                parent = os.path.dirname(entry.path)
+                rank = 0 if parent == self._top else 1 if parent == self._nested else 2
+                if self._best is None or (rank, entry.path) < self._best:
+                    self._best = (rank, entry.path)
+                if rank < 2 and stop_at_summary:
+                    return
+                continue
+            for index, pattern in enumerate(_FALLBACK_IMAGE_PATTERNS):
+                if fnmatchcase(name, pattern):
+                    current = self._fallbacks[index]
+                    if current is None or entry.path < current:
+                        self._fallbacks[index] = entry.path
+        self.complete = True
+
+    def summary(self) -> Path | None:
+        """Return ``00_summary.html``, else ``00_summary/00_summary.html``, else the lexically first deeper one."""
+        if self._best is None and not self.complete:
+            self._advance(stop_at_summary=True)
+        return Path(self._best[1]) if self._best is not None else None
+
+    def fallbacks(self) -> list[Path | None]:
+        """Return the lexically first file matching each of `_FALLBACK_IMAGE_PATTERNS`."""
+        if not self.complete:
+            self._advance(stop_at_summary=False)
+        return [Path(path) if path is not None else None for path in self._fallbacks]
+
+    def truncation(self) -> dict[str, list[str]]:
+        return _truncation_metadata(self._truncated) if self.complete else {}
+
+
+def _summary_image_refs(
+    summary_file: Path,
+    summary_cache: SummaryCache | None,
+    profiler: Profiler | None = None,
+) -> list[str] | None:
+    """Return the raw plot references in `summary_file`, or None if it is unreadable."""
+    stat = None
+    if summary_cache is not None:
+        try:
+            stat = summary_file.stat()
+        except OSError:
+            return None
+        refs = summary_cache.get(str(summary_file), stat)
+        if refs is not None:
+            return refs
+    with phase(profiler, "summary_parse"):
+        try:
+            data = summary_file.read_bytes()
+        except OSError:
+            return None
+        if profiler is not None:
+            profiler.count("summaries_parsed")
+            profiler.count("bytes_read", len(data))
+        content = data.decode("utf-8", errors="ignore")
+        refs = [match.group(1) for match in _SUMMARY_IMG_PATTERN.finditer(content)]
+    if summary_cache is not None and stat is not None:
+        summary_cache.put(str(summary_file), stat, refs)
+    return refs
+
+
+def _collect_processing_metadata(
+    processing_dir: Path,
+    *,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
+    stamps: dict[str, int] | None = None,
+) -> dict[str, str | list[str]]:
+    """Extract summary image paths from processing directory.
+
+    Paths are stored relative to the processing directory when they lie inside
+    it, like camera metadata. The tree is walked at most once, stopping at a
+    preferred summary whose plots exist. Limits the walk had to go past are
+    listed under ``truncated``, even when no summary was found. With
+    `summary_cache`, unchanged summaries are not read or parsed again.
+
+    The mtimes of the directories walked and of the summary and its plots are
+    recorded in `stamps`.
+    """
+    with phase(profiler, "processing_metadata"):
+        return _processing_metadata(
+            processing_dir,
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            profiler=profiler,
+            stamps=stamps,
+        )
+
+
+def _processing_metadata(
+    processing_dir: Path,
+    *,
+    follow_symlinks: bool,
+    limits: ScanLimits | None,
+    summary_cache: SummaryCache | None,
+    profiler: Profiler | None,
+    stamps: dict[str, int] | None,
+) -> dict[str, str | list[str]]:
+    scan = _ProcessingScan(processing_dir, limits, profiler, stamps)
+    summary_file = scan.summary()
     if summary_file is None:
-        return {}
+        return scan.truncation()
 
-    try:
-        content = summary_file.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return {}
+    refs = _summary_image_refs(summary_file, summary_cache, profiler)
+    if refs is None:
+        return scan.truncation()
 
     images: list[Path] = []
     seen: set[Path] = set()
-    for match in _SUMMARY_IMG_PATTERN.finditer(content):
-        img_path = match.group(1)
-        image_file = _normalize_summary_path(img_path, processing_dir, summary_file)
-        if image_file and image_file.exists():
-            resolved = image_file.resolve()
-            if resolved not in seen:
-                seen.add(resolved)
-                images.append(resolved)
+    for img_path in refs:
+        image_file = _normalize_summary_path(
+            img_path, processing_dir, summary_file, follow_symlinks=follow_symlinks
+        )
+        if image_file is not None and image_file not in seen:
+            seen.add(image_file)
+            images.append(image_file)
 
     if not images:
-        search_patterns = (
-            "SPOT.XDS*SpotsPerImage*.png",
-            "INTEGRATE_select2.mrfana.fitness_batch_select2.png",
-        )
-        for pattern in search_patterns:
-            fallback = next(
-                (
-                    candidate.resolve()
-                    for candidate in sorted(processing_dir.rglob(pattern))
-                    if candidate.is_file()
-                ),
-                None,
-            )
-            if fallback and fallback not in seen:
-                seen.add(fallback)
-                images.append(fallback)
-            if images:
-                break
+        fallback = next((path for path in scan.fallbacks() if path is not None), None)
+        if fallback is not None:
+            images.append(fallback.resolve() if follow_symlinks else fallback)
 
     if not images:
-        return {}
+        return scan.truncation()
 
+    base = str(processing_dir.resolve()) if follow_symlinks else os.fspath(processing_dir)
+    summary_source = summary_file.resolve() if follow_symlinks else summary_file
+    summary_images = [_relative_to(str(path), base) for path in images]
     result: dict[str, str | list[str]] = {
-        "summary_source": str(summary_file.resolve()),
-        "summary_images": [str(path) for path in images],
+        "summary_source": _relative_to(str(summary_source), base),
+        "summary_images": summary_images,
     }
-    if images:
-        result["summary_image"] = str(images[0])
+    if summary_images:
+        result["summary_image"] = summary_images[0]
+    result.update(scan.truncation())
+    if stamps is not None:
+        for key, path in zip([result["summary_source"], *summary_images], [summary_source, *images]):
+            try:
+                stamps[key] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
     return result
 
 
+def _entry_mtime_ns(entry: os.DirEntry[str]) -> int | None:
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _collect_expected_metadata(
+    name: str,
+    path: Path,
+    *,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
+    stamps: dict[str, int] | None = None,
+) -> dict:
+    if name == "camera":
+        return _collect_camera_metadata(
+            path, follow_symlinks=follow_symlinks, limits=limits, profiler=profiler, stamps=stamps
+        )
+    if name == "processing":
+        return _collect_processing_metadata(
+            path,
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            profiler=profiler,
+            stamps=stamps,
+        )
+    return {}
+
+
+_worker_summary_cache: SummaryCache | None = None
+_worker_profiler: Profiler | None = None
+
+
+def _init_metadata_worker(summary_cache: SummaryCache | None, profiler: Profiler | None = None) -> None:
+    global _worker_summary_cache, _worker_profiler
+    _worker_summary_cache = summary_cache
+    _worker_profiler = profiler
+
+
+def _collect_expected_metadata_job(
+    job: tuple[str, str, bool, ScanLimits | None],
+) -> tuple[dict, dict[str, int], SummaryCacheDelta | None, Profiler | None]:
+    """Picklable `_collect_expected_metadata` wrapper for process pools.
+
+    Also returns the stamps and the worker's summary cache activity and profile
+    so the parent can record them.
+    """
+    name, path, follow_symlinks, limits = job
+    summary_cache = _worker_summary_cache
+    profiler = _worker_profiler
+    stamps: dict[str, int] = {}
+    metadata = _collect_expected_metadata(
+        name,
+        Path(path),
+        follow_symlinks=follow_symlinks,
+        limits=limits,
+        summary_cache=summary_cache,
+        profiler=profiler,
+        stamps=stamps,
+    )
+    return (
+        metadata,
+        stamps,
+        summary_cache.take_pending() if summary_cache is not None else None,
+        profiler.take() if profiler is not None else None,
+    )
+
+
+def _extract_metadata_in_processes(
+    entries: list[ExpectedDirectoryStatus],
+    processes: int,
+    *,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
+) -> None:
+    """Fill in `entries` metadata using a pool of `processes` worker processes.
+
+    Jobs are submitted in path order in chunks of several directories each, so
+    pickling overhead is amortised, and results are assigned back in that order.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+    entries = sorted(entries, key=lambda entry: str(entry.path))
+    jobs = [(entry.name, str(entry.path), follow_symlinks, limits) for entry in entries]
+    chunksize = max(1, len(jobs) // (processes * 4))
+    worker_profiler = Profiler() if profiler is not None else None
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_metadata_worker,
+        initargs=(summary_cache, worker_profiler),
+    ) as executor:
+        for entry, (metadata, stamps, cache_delta, profile_delta) in zip(
+            entries, executor.map(_collect_expected_metadata_job, jobs, chunksize=chunksize)
+        ):
+            entry.metadata = metadata
+            entry.stamps = stamps
+            if summary_cache is not None and cache_delta is not None:
+                summary_cache.merge(cache_delta)
+            if profiler is not None and profile_delta is not None:
+                profiler.merge(profile_delta)
+
+
+def _stamps_changed(entry: ExpectedDirectoryStatus) -> bool:
+    """Return whether anything `entry.metadata` was derived from has moved.
+
+    Camera and processing entries without stamps (from older caches) count as
+    changed.
+    """
+    if not entry.stamps:
+        return entry.name in ("camera", "processing")
+    for key, mtime_ns in entry.stamps.items():
+        path = os.fspath(entry.path) if key == "." else entry.absolute_path(key)
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _refresh_cached_collection(
+    cached: CollectionStatus,
+    collection_path: str,
+    expected_dirs: Sequence[str],
+    *,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
+) -> CollectionStatus | None:
+    """Reuse a cached collection whose directory mtime is unchanged.
+
+    The collection's own mtime only covers its direct children, so each present
+    expected directory, the subdirectories its metadata walk listed, and the
+    summary and plots it found are re-stat'ed, and the metadata is recollected
+    when any of them moved. Processing directories without a summary yet are
+    always recollected because results usually land in nested subdirectories.
+    Returns None when the cached entry cannot be reused and a full scan is
+    required.
+    """
+    if [entry.name for entry in cached.expected] != list(expected_dirs):
+        return None
+    refreshed: list[ExpectedDirectoryStatus] = []
+    for entry in cached.expected:
+        if not entry.present:
+            refreshed.append(entry)
+            continue
+        expected_path = os.path.join(collection_path, entry.name)
+        try:
+            mtime_ns = os.stat(expected_path).st_mtime_ns
+        except OSError:
+            return None
+        stale = (
+            mtime_ns != entry.mtime_ns
+            or (entry.name == "processing" and "summary_source" not in entry.metadata)
+            or _stamps_changed(entry)
+        )
+        if not stale:
+            refreshed.append(entry)
+            continue
+        stamps: dict[str, int] = {}
+        metadata = _collect_expected_metadata(
+            entry.name,
+            Path(expected_path),
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            profiler=profiler,
+            stamps=stamps,
+        )
+        refreshed.append(
+            ExpectedDirectoryStatus(
+                name=entry.name,
+                present=True,
+                path=entry.path,
+                metadata=metadata,
+                mtime_ns=mtime_ns,
+                stamps=stamps,
+            )
+        )
+    return CollectionStatus(
+        name=cached.name,
+        path=cached.path,
+        expected=refreshed,
+        extras=list(cached.extras),
+        mtime_ns=cached.mtime_ns,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _Child:
+    """A directory to scan: its name, path, and mtime from a listing or a stat."""
+
+    name: str
+    path: str
+    mtime_ns: int | None
+
+
+class _TripScan:
+    """Scan state shared by `build_hierarchy` and `abuild_hierarchy`.
+
+    Pucks are the unit of work: `puck_jobs` lists them, `process_puck` scans one,
+    and `result` assembles the hierarchy from the per-puck results in order.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        expected_collection_dirs: Sequence[str] | None,
+        logger: Callable[[str], None] | None,
+        *,
+        no_site_level: bool,
+        previous: HierarchyResult | None,
+        follow_symlinks: bool,
+        limits: ScanLimits | None,
+        summary_cache: SummaryCache | None = None,
+        defer_metadata: bool = False,
+        profiler: Profiler | None = None,
+    ) -> None:
+        root_path = Path(root).expanduser().resolve()
+        if not root_path.exists():
+            raise FileNotFoundError(root_path)
+        if not root_path.is_dir():
+            raise NotADirectoryError(root_path)
+        self.root_path = root_path
+        self.expected_dirs = tuple(expected_collection_dirs or DEFAULT_EXPECTED_COLLECTION_DIRS)
+        self.logger = logger
+        self.no_site_level = no_site_level
+        self.follow_symlinks = follow_symlinks
+        self.limits = limits
+        self.summary_cache = summary_cache
+        self.profiler = profiler
+        self.cancelled = threading.Event()
+        self.deferred: list[ExpectedDirectoryStatus] | None = [] if defer_metadata else None
+        self._deferred_lock = threading.Lock()
+        self.previous_collections: dict[str, CollectionStatus] = {}
+        self.previous_pins: dict[str, PinStatus] = {}
+        self.previous_pucks: dict[str, PuckStatus] = {}
+        if previous is not None:
+            self.previous_collections = {
+                str(collection.path): collection
+                for _, _, _, collection in previous.trip.iter_collections()
+                if collection.mtime_ns is not None
+            }
+            for site in previous.trip.sites:
+                for puck in site.pucks:
+                    if puck.mtime_ns is not None:
+                        self.previous_pucks[str(puck.path)] = puck
+                    for pin in puck.pins:
+                        if pin.mtime_ns is not None:
+                            self.previous_pins[str(pin.path)] = pin
+        self.trip = TripHierarchy(name=root_path.name, path=root_path)
+
+    def log(self, message: str) -> None:
+        if self.logger:
+            self.logger(message)
+
+    def puck_jobs(self) -> list[tuple[SiteStatus, os.DirEntry[str]]]:
+        """Register sites on the trip and return the pucks to scan under each."""
+        with phase(self.profiler, "walk"):
+            return self._puck_jobs()
+
+    def _puck_jobs(self) -> list[tuple[SiteStatus, os.DirEntry[str]]]:
+        self.log(f"Scanning trip directory: {self.root_path}")
+        puck_jobs: list[tuple[SiteStatus, os.DirEntry[str]]] = []
+        if self.no_site_level:
+            self.log("No site level detected; grouping pucks directly under trip.")
+            site_status = SiteStatus(name="root", path=self.root_path)
+            self.trip.add_site(site_status)
+            puck_jobs.extend((site_status, puck_dir) for puck_dir in _scan_dirs(self.root_path))
+        else:
+            for site_dir in _scan_dirs(self.root_path):
+                self.log(f" Found site: {site_dir.name}")
+                site_status = SiteStatus(
+                    name=site_dir.name,
+                    path=Path(site_dir.path),
+                    mtime_ns=_entry_mtime_ns(site_dir),
+                )
+                self.trip.add_site(site_status)
+                puck_jobs.extend((site_status, puck_dir) for puck_dir in _scan_dirs(site_dir.path))
+        return puck_jobs
+
+    def _unchanged_children(
+        self, path: str, mtime_ns: int | None, cached: PinStatus | PuckStatus | None
+    ) -> list[_Child] | None:
+        """Return the cached children of a directory whose mtime is unchanged.
+
+        A directory's mtime moves whenever an entry is added, removed, or renamed,
+        so the cached listing still holds and only the children are re-stat'ed.
+        Returns None when the directory has to be listed again.
+        """
+        if cached is None or mtime_ns is None or cached.mtime_ns != mtime_ns:
+            return None
+        children = cached.collections if isinstance(cached, PinStatus) else cached.pins
+        try:
+            with phase(self.profiler, "walk"):
+                return [
+                    _Child(child.name, str(child.path), os.stat(child.path).st_mtime_ns)
+                    for child in children
+                ]
+        except OSError:
+            return None
+
+    def process_collection(self, collection_dir: os.DirEntry[str]) -> CollectionStatus:
+        return self._process_collection(
+            _Child(collection_dir.name, collection_dir.path, _entry_mtime_ns(collection_dir))
+        )
+
+    def _process_collection(self, collection_dir: _Child) -> CollectionStatus:
+        if self.cancelled.is_set():
+            raise CancelledError()
+        log = self.log
+        expected_dirs = self.expected_dirs
+        follow_symlinks = self.follow_symlinks
+        limits = self.limits
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.count("collections")
+        mtime_ns = collection_dir.mtime_ns
+        cached = self.previous_collections.get(collection_dir.path)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            refreshed = _refresh_cached_collection(
+                cached,
+                collection_dir.path,
+                expected_dirs,
+                follow_symlinks=follow_symlinks,
+                limits=limits,
+                summary_cache=self.summary_cache,
+                profiler=profiler,
+            )
+            if refreshed is not None:
+                log(f"    Collection {collection_dir.name}: unchanged, reusing cached scan")
+                return refreshed
+
+        log(f"    Collection {collection_dir.name}: analysing expected folders")
+        with phase(profiler, "walk"):
+            present_dirs = {
+                child.name: child for child in _scan_dirs(collection_dir.path)
+            }
+        expected_status: list[ExpectedDirectoryStatus] = []
+        for expected in expected_dirs:
+            expected_entry = present_dirs.get(expected)
+            if expected_entry is None:
+                expected_status.append(ExpectedDirectoryStatus(name=expected, present=False))
+                continue
+            expected_path = Path(expected_entry.path)
+            status = ExpectedDirectoryStatus(
+                name=expected,
+                present=True,
+                path=expected_path.resolve() if follow_symlinks else expected_path,
+                mtime_ns=_entry_mtime_ns(expected_entry),
+            )
+            if self.deferred is None:
+                status.metadata = _collect_expected_metadata(
+                    expected,
+                    expected_path,
+                    follow_symlinks=follow_symlinks,
+                    limits=limits,
+                    summary_cache=self.summary_cache,
+                    profiler=profiler,
+                    stamps=status.stamps,
+                )
+            elif expected in ("camera", "processing"):
+                with self._deferred_lock:
+                    self.deferred.append(status)
+            expected_status.append(status)
+        extras = sorted(present_dirs.keys() - set(expected_dirs))
+        if extras:
+            log(
+                f"     ℹ️  Extra directories detected: {', '.join(extras)}"
+            )
+        return CollectionStatus(
+            name=collection_dir.name,
+            path=Path(collection_dir.path),
+            expected=expected_status,
+            extras=extras,
+            mtime_ns=mtime_ns,
+        )
+
+    def process_pin(self, pin_dir: os.DirEntry[str]) -> tuple[PinStatus, bool]:
+        return self._process_pin(_Child(pin_dir.name, pin_dir.path, _entry_mtime_ns(pin_dir)))
+
+    def _process_pin(self, pin_dir: _Child) -> tuple[PinStatus, bool]:
+        log = self.log
+        log(f"   Inspecting pin: {pin_dir.name}")
+        pin_status = PinStatus(
+            name=pin_dir.name,
+            path=Path(pin_dir.path),
+            mtime_ns=pin_dir.mtime_ns,
+        )
+        collection_dirs = self._unchanged_children(
+            pin_dir.path, pin_dir.mtime_ns, self.previous_pins.get(pin_dir.path)
+        )
+        if collection_dirs is None:
+            with phase(self.profiler, "walk"):
+                collection_dirs = [
+                    _Child(child.name, child.path, _entry_mtime_ns(child))
+                    for child in _scan_dirs(pin_dir.path)
+                    if len(child.name) == 1 and child.name.isalpha() and child.name.isupper()
+                ]
+        if not collection_dirs:
+            log(f"    ⚠️  No collection directory found under pin {pin_dir.name}")
+            pin_status.missing_collections = True
+            return pin_status, False
+
+        pin_ok = True
+        for collection_dir in collection_dirs:
+            collection_status = self._process_collection(collection_dir)
+            if collection_status.missing_expected:
+                log(
+                    f"     ⚠️  Missing expected directories: "
+                    f"{', '.join(s.name for s in collection_status.expected if not s.present)}"
+                )
+                pin_ok = False
+            pin_status.add_collection(collection_status)
+        return pin_status, pin_ok
+
+    def process_puck(self, puck_dir: os.DirEntry[str]) -> tuple[PuckStatus, bool]:
+        self.log(f"  Processing puck: {puck_dir.name}")
+        mtime_ns = _entry_mtime_ns(puck_dir)
+        puck_status = PuckStatus(
+            name=puck_dir.name,
+            path=Path(puck_dir.path),
+            mtime_ns=mtime_ns,
+        )
+        puck_ok = True
+        pin_dirs = self._unchanged_children(
+            puck_dir.path, mtime_ns, self.previous_pucks.get(puck_dir.path)
+        )
+        if pin_dirs is None:
+            with phase(self.profiler, "walk"):
+                pin_dirs = [
+                    _Child(child.name, child.path, _entry_mtime_ns(child))
+                    for child in _scan_dirs(puck_dir.path)
+                ]
+        for pin_dir in pin_dirs:
+            pin_status, pin_ok = self._process_pin(pin_dir)
+            puck_status.add_pin(pin_status)
+            puck_ok = puck_ok and pin_ok
+        return puck_status, puck_ok
+
+    def result(
+        self,
+        puck_jobs: list[tuple[SiteStatus, os.DirEntry[str]]],
+        puck_results: Sequence[tuple[PuckStatus, bool]],
+    ) -> HierarchyResult:
+        all_ok = True
+        for (site_status, _), (puck_status, puck_ok) in zip(puck_jobs, puck_results):
+            site_status.add_puck(puck_status)
+            all_ok = all_ok and puck_ok
+        return HierarchyResult(trip=self.trip, all_expected_present=all_ok)
+
+
 def build_hierarchy(
     root: Path | str,
     expected_collection_dirs: Sequence[str] | None = None,
     logger: Callable[[str], None] | None = None,
     *,
     no_site_level: bool = False,
+    workers: int | None = None,
+    previous: HierarchyResult | None = None,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    metadata_processes: int | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
 ) -> HierarchyResult:
     """
     Build a TripHierarchy representation rooted at `root`.
 
+    Pucks are independent subtrees; when `workers` is greater than one they are
+    scanned on a thread pool of that size. Ordering is identical to a serial scan.
+
+    When `previous` is given (typically loaded from a JSON cache of the same trip),
+    pucks and pins whose directory mtimes are unchanged are not listed again, and
+    unchanged collections are reused instead of being walked again; see
+    `_refresh_cached_collection` for the exact rules.
+
+    The root is resolved once and every other path is derived lexically from it.
+    Set `follow_symlinks` to resolve expected directories, camera files, and
+    summary images to their real locations instead (one ``realpath`` each).
+
+    `limits` bounds the camera and processing walks; expected directories that
+    hit a limit list it under ``metadata["truncated"]``.
+
+    With `metadata_processes` greater than one, camera and processing metadata
+    of newly scanned collections is extracted afterwards on a process pool of
+    that size, which sidesteps the GIL when parsing many large summaries.
+
+    `summary_cache` skips re-parsing ``00_summary.html`` files whose size and
+    mtime are unchanged since an earlier run; the caller closes it to persist
+    new entries.
+
+    `profiler` records the scan's phases (``walk``, ``camera_metadata``,
+    ``processing_metadata``, ``summary_parse``) and file, directory, and byte
+    counters under an overall ``build_hierarchy`` phase.
+
     Returns HierarchyResult capturing whether every expected directory exists.
     """
-    root_path = Path(root).expanduser().resolve()
-    if not root_path.exists():
-        raise FileNotFoundError(root_path)
-    if not root_path.is_dir():
-        raise NotADirectoryError(root_path)
+    with phase(profiler, "build_hierarchy"):
+        return _build_hierarchy(
+            root,
+            expected_collection_dirs,
+            logger,
+            no_site_level=no_site_level,
+            workers=workers,
+            previous=previous,
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            metadata_processes=metadata_processes,
+            summary_cache=summary_cache,
+            profiler=profiler,
+        )
 
-    expected_dirs = tuple(expected_collection_dirs or DEFAULT_EXPECTED_COLLECTION_DIRS)
 
-    def log(message: str) -> None:
-        if logger:
-            logger(message)
+def _build_hierarchy(
+    root: Path | str,
+    expected_collection_dirs: Sequence[str] | None,
+    logger: Callable[[str], None] | None,
+    *,
+    no_site_level: bool,
+    workers: int | None,
+    previous: HierarchyResult | None,
+    follow_symlinks: bool,
+    limits: ScanLimits | None,
+    metadata_processes: int | None,
+    summary_cache: SummaryCache | None,
+    profiler: Profiler | None,
+) -> HierarchyResult:
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if metadata_processes is not None and metadata_processes < 1:
+        raise ValueError(f"metadata_processes must be at least 1, got {metadata_processes}")
+    scan = _TripScan(
+        root,
+        expected_collection_dirs,
+        logger,
+        no_site_level=no_site_level,
+        previous=previous,
+        follow_symlinks=follow_symlinks,
+        limits=limits,
+        summary_cache=summary_cache,
+        defer_metadata=bool(metadata_processes and metadata_processes > 1),
+        profiler=profiler,
+    )
+    puck_jobs = scan.puck_jobs()
+    puck_dirs = [puck_dir for _, puck_dir in puck_jobs]
+    if workers and workers > 1 and len(puck_dirs) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="imca-puck") as executor:
+            puck_results = list(executor.map(scan.process_puck, puck_dirs))
+    else:
+        puck_results = [scan.process_puck(puck_dir) for puck_dir in puck_dirs]
+    if scan.deferred:
+        scan.log(f"Extracting metadata for {len(scan.deferred)} directories on {metadata_processes} processes")
+        _extract_metadata_in_processes(
+            scan.deferred,
+            metadata_processes,
+            follow_symlinks=follow_symlinks,
+            limits=limits,
+            summary_cache=summary_cache,
+            profiler=profiler,
+        )
+    return scan.result(puck_jobs, puck_results)
 
-    log(f"Scanning trip directory: {root_path}")
 
-    trip = TripHierarchy(name=root_path.name, path=root_path)
-    all_ok = True
+async def abuild_hierarchy(
+    root: Path | str,
+    expected_collection_dirs: Sequence[str] | None = None,
+    logger: Callable[[str], None] | None = None,
+    *,
+    no_site_level: bool = False,
+    concurrency: int = 4,
+    executor: Executor | None = None,
+    previous: HierarchyResult | None = None,
+    follow_symlinks: bool = False,
+    limits: ScanLimits | None = None,
+    summary_cache: SummaryCache | None = None,
+    profiler: Profiler | None = None,
+) -> HierarchyResult:
+    """Async counterpart of `build_hierarchy` that never blocks the event loop.
 
-    def process_puck(parent_site: SiteStatus, puck_dir: Path) -> None:
-        nonlocal all_ok
-        log(f"  Processing puck: {puck_dir.name}")
-        puck_status = PuckStatus(name=puck_dir.name, path=puck_dir)
-        parent_site.add_puck(puck_status)
+    Root validation, site listing, and each puck scan run on `executor` (a
+    private thread pool of `concurrency` workers by default), and a semaphore
+    keeps at most `concurrency` of them in flight even on a shared executor.
+    `logger` is called from worker threads.
 
-        for pin_dir in _iter_dirs(puck_dir):
-            log(f"   Inspecting pin: {pin_dir.name}")
-            pin_status = PinStatus(name=pin_dir.name, path=pin_dir)
-            puck_status.add_pin(pin_status)
+    Cancelling the awaiting task drops pucks that have not started and makes
+    running ones stop before their next collection. `profiler` records the
+    same phases as in `build_hierarchy`.
+    """
+    import asyncio  # only async callers pay for the import
 
-            collection_dirs = [
-                child
-                for child in _iter_dirs(pin_dir)
-                if len(child.name) == 1 and child.name.isalpha() and child.name.isupper()
-            ]
-            if not collection_dirs:
-                log(f"    ⚠️  No collection directory found under pin {pin_dir.name}")
-                pin_status.missing_collections = True
-                all_ok = False
-                continue
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    own_executor = executor is None
+    pool = executor or ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="imca-async")
 
-            for collection_dir in collection_dirs:
-                log(f"    Collection {collection_dir.name}: analysing expected folders")
-                present_dirs = {
-                    child.name for child in _iter_dirs(collection_dir)
-                }
-                expected_status: list[ExpectedDirectoryStatus] = []
-                for expected in expected_dirs:
-                    expected_path = collection_dir / expected
-                    present = expected_path.is_dir()
-                    metadata: dict[str, list[str]] = {}
-                    if present and expected == "camera":
-                        metadata = _collect_camera_metadata(expected_path)
-                    elif present and expected == "processing":
-                        metadata = _collect_processing_metadata(expected_path)
-                    status = ExpectedDirectoryStatus(
-                        name=expected,
-                        present=present,
-                        path=expected_path.resolve() if present else None,
-                        metadata=metadata,
-                    )
-                    expected_status.append(status)
-                if any(not status.present for status in expected_status):
-                    log(
-                        f"     ⚠️  Missing expected directories: "
-                        f"{', '.join(s.name for s in expected_status if not s.present)}"
-                    )
-                    all_ok = False
-                extras = sorted(present_dirs - set(expected_dirs))
-                collection_status = CollectionStatus(
-                    name=collection_dir.name,
-                    path=collection_dir,
-                    expected=expected_status,
-                    extras=extras,
+    async def run(func: Callable[..., _T], *args: object) -> _T:
+        async with semaphore:
+            return await loop.run_in_executor(pool, func, *args)
+
+    with phase(profiler, "build_hierarchy"):
+        scan: _TripScan | None = None
+        try:
+            scan = await run(
+                partial(
+                    _TripScan,
+                    root,
+                    expected_collection_dirs,
+                    logger,
+                    no_site_level=no_site_level,
+                    previous=previous,
+                    follow_symlinks=follow_symlinks,
+                    limits=limits,
+                    summary_cache=summary_cache,
+                    profiler=profiler,
                 )
-                pin_status.add_collection(collection_status)
-                if extras:
-                    log(
-                        f"     ℹ️  Extra directories detected: {', '.join(extras)}"
-                    )
-
-    if no_site_level:
-        log("No site level detected; grouping pucks directly under trip.")
-        site_status = SiteStatus(name="root", path=root_path)
-        trip.add_site(site_status)
-        for puck_dir in _iter_dirs(root_path):
-            process_puck(site_status, puck_dir)
-    else:
-        for site_dir in _iter_dirs(root_path):
-            log(f" Found site: {site_dir.name}")
-            site_status = SiteStatus(name=site_dir.name, path=site_dir)
-            trip.add_site(site_status)
-            for puck_dir in _iter_dirs(site_dir):
-                process_puck(site_status, puck_dir)
-    return HierarchyResult(trip=trip, all_expected_present=all_ok)
+            )
+            puck_jobs = await run(scan.puck_jobs)
+            puck_results = await asyncio.gather(
+                *(run(scan.process_puck, puck_dir) for _, puck_dir in puck_jobs)
+            )
+        except BaseException:
+            if scan is not None:
+                scan.cancelled.set()
+            raise
+        finally:
+            if own_executor:
+                pool.shutdown(wait=False, cancel_futures=True)
+        return scan.result(puck_jobs, puck_results)
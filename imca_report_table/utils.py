@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import io
 import json
-from dataclasses import asdict, is_dataclass
+import os
+import pickle
+import zlib
+from dataclasses import fields, is_dataclass
 from pathlib import Path
 from typing import Any
 
@@ -18,9 +22,20 @@ from .models import (
 )
 
 
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory (honours ``XDG_CACHE_HOME``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base).expanduser() / "imca-report-table"
+
+
+CACHE_FORMATS: tuple[str, ...] = ("json", "binary")
+BINARY_CACHE_SUFFIX = ".imcache"
+_BINARY_MAGIC = b"IMCAHIER\x01"
+
+
 def _serialise(value: Any) -> Any:
     if is_dataclass(value):
-        return _serialise(asdict(value))
+        return {item.name: _serialise(getattr(value, item.name)) for item in fields(value)}
     if isinstance(value, dict):
         return {key: _serialise(val) for key, val in value.items()}
     if isinstance(value, (list, tuple, set)):
@@ -51,6 +66,8 @@ def _expected_from_dict(data: dict) -> ExpectedDirectoryStatus:
         present=data.get("present", False),
         path=Path(path_value) if path_value else None,
         metadata=data.get("metadata", {}),
+        mtime_ns=data.get("mtime_ns"),
+        stamps=data.get("stamps", {}),
     )
 
 
@@ -60,6 +77,7 @@ def _collection_from_dict(data: dict) -> CollectionStatus:
         path=Path(data["path"]),
         expected=[_expected_from_dict(item) for item in data.get("expected", [])],
         extras=list(data.get("extras", [])),
+        mtime_ns=data.get("mtime_ns"),
     )
 
 
@@ -69,13 +87,25 @@ def hierarchy_from_dict(payload: dict) -> HierarchyResult:
     trip = TripHierarchy(name=trip_data["name"], path=Path(trip_data["path"]))
 
     for site_data in trip_data.get("sites", []):
-        site = SiteStatus(name=site_data["name"], path=Path(site_data["path"]))
+        site = SiteStatus(
+            name=site_data["name"],
+            path=Path(site_data["path"]),
+            mtime_ns=site_data.get("mtime_ns"),
+        )
         trip.add_site(site)
         for puck_data in site_data.get("pucks", []):
-            puck = PuckStatus(name=puck_data["name"], path=Path(puck_data["path"]))
+            puck = PuckStatus(
+                name=puck_data["name"],
+                path=Path(puck_data["path"]),
+                mtime_ns=puck_data.get("mtime_ns"),
+            )
             site.add_puck(puck)
             for pin_data in puck_data.get("pins", []):
-                pin = PinStatus(name=pin_data["name"], path=Path(pin_data["path"]))
+                pin = PinStatus(
+                    name=pin_data["name"],
+                    path=Path(pin_data["path"]),
+                    mtime_ns=pin_data.get("mtime_ns"),
+                )
                 pin.missing_collections = pin_data.get("missing_collections", False)
                 for collection_data in pin_data.get("collections", []):
                     pin.add_collection(_collection_from_dict(collection_data))
@@ -91,3 +121,67 @@ def load_hierarchy_json(path: str | Path) -> HierarchyResult:
     source = Path(path).expanduser().resolve()
     data = json.loads(source.read_text(encoding="utf-8"))
     return hierarchy_from_dict(data)
+
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler that only accepts plain containers and scalars."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"hierarchy cache references unexpected object {module}.{name}")
+
+
+def write_hierarchy_binary(path: str | Path, result: HierarchyResult) -> Path:
+    """Serialize hierarchy result to the compact binary cache format.
+
+    The file holds a magic header followed by the `hierarchy_to_dict` payload,
+    pickled as plain containers and zlib-compressed; the compression folds the
+    long path prefixes repeated across metadata lists.
+    """
+    output = Path(path).expanduser().resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = pickle.dumps(hierarchy_to_dict(result), protocol=pickle.HIGHEST_PROTOCOL)
+    output.write_bytes(_BINARY_MAGIC + zlib.compress(payload, 1))
+    return output
+
+
+def load_hierarchy_binary(path: str | Path) -> HierarchyResult:
+    """Load hierarchy result from a binary cache file."""
+    source = Path(path).expanduser().resolve()
+    data = source.read_bytes()
+    if not data.startswith(_BINARY_MAGIC):
+        raise ValueError(f"{source} is not a binary hierarchy cache")
+    payload = zlib.decompress(data[len(_BINARY_MAGIC):])
+    return hierarchy_from_dict(_DataUnpickler(io.BytesIO(payload)).load())
+
+
+def _resolve_cache_format(path: str | Path, cache_format: str | None) -> str:
+    if cache_format is None:
+        return "binary" if Path(path).suffix == BINARY_CACHE_SUFFIX else "json"
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"unknown cache format {cache_format!r}; expected one of {', '.join(CACHE_FORMATS)}")
+    return cache_format
+
+
+def write_hierarchy(path: str | Path, result: HierarchyResult, *, cache_format: str | None = None) -> Path:
+    """Write a hierarchy cache, choosing the format from `cache_format` or the file suffix.
+
+    Files ending in ``.imcache`` use the binary format; anything else is JSON.
+    """
+    if _resolve_cache_format(path, cache_format) == "binary":
+        return write_hierarchy_binary(path, result)
+    return write_hierarchy_json(path, result)
+
+
+def load_hierarchy(path: str | Path, *, cache_format: str | None = None) -> HierarchyResult:
+    """Load a hierarchy cache written in either format.
+
+    Without an explicit `cache_format` the file contents decide, so a binary
+    cache loads regardless of its name.
+    """
+    if cache_format is None:
+        with Path(path).expanduser().open("rb") as handle:
+            is_binary = handle.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+        cache_format = "binary" if is_binary else "json"
+    if _resolve_cache_format(path, cache_format) == "binary":
+        return load_hierarchy_binary(path)
+    return load_hierarchy_json(path)
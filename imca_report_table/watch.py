@@ -0,0 +1,367 @@
+"""Keep a trip hierarchy up to date as new data lands on disk."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .models import HierarchyResult, PuckStatus, SiteStatus
+from .traversal import ScanLimits, _entry_mtime_ns, _scan_dirs, _TripScan
+
+if TYPE_CHECKING:
+    from .summary_cache import SummaryCache
+
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_DEBOUNCE = 2.0
+
+
+def _observer_class() -> Any:
+    """Return watchdog's ``Observer``, or None when watchdog is not installed.
+
+    watchdog is optional (``pip install imca-report-table[watch]``); polling is the fallback.
+    """
+    try:
+        from watchdog.observers import Observer
+    except ImportError:  # pragma: no cover - exercised only without watchdog
+        return None
+    return Observer
+
+
+def _child_dir(parent: Path, name: str) -> os.DirEntry[str] | None:
+    try:
+        return next((entry for entry in _scan_dirs(parent) if entry.name == name), None)
+    except OSError:
+        return None
+
+
+def _by_name(nodes: list, name: str):
+    return next((node for node in nodes if node.name == name), None)
+
+
+class TripWatcher:
+    """Apply changed paths to a `HierarchyResult` in place.
+
+    Only pins containing a changed path are rescanned; collections inside them
+    that saw no change are reused as in an incremental scan. Changes at the
+    trip, site, or puck level re-list those levels to pick up new or removed
+    pucks and pins.
+    """
+
+    def __init__(
+        self,
+        result: HierarchyResult,
+        expected_collection_dirs: Sequence[str] | None = None,
+        logger: Callable[[str], None] | None = None,
+        *,
+        no_site_level: bool = False,
+        follow_symlinks: bool = False,
+        limits: ScanLimits | None = None,
+        summary_cache: SummaryCache | None = None,
+    ) -> None:
+        self.result = result
+        self.root = Path(result.trip.path)
+        self.expected_collection_dirs = expected_collection_dirs
+        self.logger = logger
+        self.no_site_level = no_site_level
+        self.follow_symlinks = follow_symlinks
+        self.limits = limits
+        self.summary_cache = summary_cache
+        self._pin_depth = 2 if no_site_level else 3
+
+    def _scan(self) -> _TripScan:
+        return _TripScan(
+            self.root,
+            self.expected_collection_dirs,
+            self.logger,
+            no_site_level=self.no_site_level,
+            previous=None,
+            follow_symlinks=self.follow_symlinks,
+            limits=self.limits,
+            summary_cache=self.summary_cache,
+        )
+
+    def _parts(self, path: str | os.PathLike[str]) -> tuple[str, ...] | None:
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        if relative == os.curdir:
+            return ()
+        if relative.startswith(os.pardir):
+            return None
+        return tuple(relative.split(os.sep))
+
+    def _find_puck(self, pin_key: tuple[str, ...]) -> PuckStatus | None:
+        site_name = "root" if self.no_site_level else pin_key[0]
+        site = _by_name(self.result.trip.sites, site_name)
+        return _by_name(site.pucks, pin_key[-2]) if site is not None else None
+
+    def apply(self, paths: Iterable[str | os.PathLike[str]]) -> int:
+        """Update the nodes affected by `paths` and return how many pins changed."""
+        pin_keys: set[tuple[str, ...]] = set()
+        collection_keys: set[tuple[str, ...]] = set()
+        structural = False
+        for path in paths:
+            parts = self._parts(path)
+            if parts is None:
+                continue
+            if len(parts) < self._pin_depth:
+                structural = True
+                continue
+            pin_keys.add(parts[: self._pin_depth])
+            if len(parts) > self._pin_depth:
+                collection_keys.add(parts[: self._pin_depth + 1])
+        if any(self._find_puck(key) is None for key in pin_keys):
+            structural = True
+
+        changed = 0
+        if structural:
+            added, removed = self._sync_structure()
+            pin_keys |= added
+            changed += removed
+        for key in sorted(pin_keys):
+            changed += self._rescan_pin(key, collection_keys)
+        self.result.all_expected_present = not any(
+            pin.has_issues for pin in self.result.trip.iter_pins()
+        )
+        return changed
+
+    def _sync_structure(self) -> tuple[set[tuple[str, ...]], int]:
+        """Re-list sites, pucks, and pins; return new pin keys and the removed pin count."""
+        trip = self.result.trip
+        added: set[tuple[str, ...]] = set()
+        removed = 0
+        if self.no_site_level:
+            site_entries: list[tuple[str, Path, int | None]] = [("root", self.root, None)]
+        else:
+            site_entries = [
+                (entry.name, Path(entry.path), _entry_mtime_ns(entry)) for entry in _scan_dirs(self.root)
+            ]
+        sites: list[SiteStatus] = []
+        for site_name, site_path, site_mtime in site_entries:
+            site = _by_name(trip.sites, site_name) or SiteStatus(name=site_name, path=site_path)
+            site.mtime_ns = site_mtime
+            pucks: list[PuckStatus] = []
+            for puck_entry in _scan_dirs(site_path):
+                puck = _by_name(site.pucks, puck_entry.name) or PuckStatus(
+                    name=puck_entry.name, path=Path(puck_entry.path)
+                )
+                puck.mtime_ns = _entry_mtime_ns(puck_entry)
+                pin_names = [entry.name for entry in _scan_dirs(puck_entry.path)]
+                kept = [pin for pin in puck.pins if pin.name in pin_names]
+                removed += len(puck.pins) - len(kept)
+                puck.pins = kept
+                prefix = (puck.name,) if self.no_site_level else (site_name, puck.name)
+                known = {pin.name for pin in kept}
+                added.update(prefix + (name,) for name in pin_names if name not in known)
+                pucks.append(puck)
+            removed += sum(
+                len(puck.pins) for puck in site.pucks if puck.name not in {p.name for p in pucks}
+            )
+            site.pucks = pucks
+            sites.append(site)
+        removed += sum(
+            len(puck.pins)
+            for site in trip.sites
+            if site.name not in {s.name for s in sites}
+            for puck in site.pucks
+        )
+        trip.sites = sites
+        return added, removed
+
+    def _rescan_pin(self, key: tuple[str, ...], collection_keys: set[tuple[str, ...]]) -> int:
+        puck = self._find_puck(key)
+        if puck is None:
+            return 0
+        pin_name = key[-1]
+        existing = _by_name(puck.pins, pin_name)
+        entry = _child_dir(puck.path, pin_name)
+        if entry is None:
+            if existing is None:
+                return 0
+            puck.pins.remove(existing)
+            return 1
+
+        scan = self._scan()
+        if existing is not None:
+            scan.previous_collections = {
+                str(collection.path): collection
+                for collection in existing.collections
+                if collection.mtime_ns is not None and key + (collection.name,) not in collection_keys
+            }
+        pin_status, _ = scan.process_pin(entry)
+        if existing is not None:
+            puck.pins[puck.pins.index(existing)] = pin_status
+        else:
+            puck.pins.append(pin_status)
+            puck.pins.sort(key=lambda pin: pin.name)
+        return 1
+
+
+class _ChangeCollector:
+    """Gather changed paths from watchdog events for the watch loop.
+
+    Implements the ``dispatch`` hook of watchdog's event handlers directly so
+    that watchdog is only imported once inotify watching starts.
+    """
+
+    def __init__(self) -> None:
+        self.paths: set[str] = set()
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+
+    def dispatch(self, event) -> None:
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        with self.lock:
+            self.paths.add(os.fsdecode(event.src_path))
+            dest_path = getattr(event, "dest_path", "")
+            if dest_path:
+                self.paths.add(os.fsdecode(dest_path))
+        self.event.set()
+
+    def take(self) -> set[str]:
+        with self.lock:
+            paths, self.paths = self.paths, set()
+            self.event.clear()
+            return paths
+
+
+def _mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def snapshot_mtimes(result: HierarchyResult) -> dict[str, int | None]:
+    """Return the mtimes `result` was built from, keyed by path.
+
+    Covers the trip directory, every site, puck, pin, collection, and expected
+    directory, and the subdirectories and files recorded in each expected
+    directory's stamps, so results landing in nested ``processing/xds_*``
+    directories are noticed. Apart from the trip directory the values come
+    from the hierarchy, not from the disk.
+    """
+    trip = result.trip
+    mtimes: dict[str, int | None] = {os.fspath(trip.path): _mtime_ns(os.fspath(trip.path))}
+    for site in trip.sites:
+        mtimes.setdefault(os.fspath(site.path), site.mtime_ns)
+        for puck in site.pucks:
+            mtimes[os.fspath(puck.path)] = puck.mtime_ns
+            for pin in puck.pins:
+                mtimes[os.fspath(pin.path)] = pin.mtime_ns
+                for collection in pin.collections:
+                    mtimes[os.fspath(collection.path)] = collection.mtime_ns
+                    for entry in collection.expected:
+                        if not entry.present or entry.path is None:
+                            continue
+                        mtimes[os.fspath(entry.path)] = entry.mtime_ns
+                        for key, mtime_ns in entry.stamps.items():
+                            if key != ".":
+                                mtimes[entry.absolute_path(key)] = mtime_ns
+    return mtimes
+
+
+def _poll_changes(
+    watcher: TripWatcher,
+    flush: Callable[[set[str]], None],
+    stop: threading.Event,
+    poll_interval: float,
+    debounce: float,
+) -> None:
+    """Stat the paths in `snapshot_mtimes` every `poll_interval` seconds.
+
+    Nothing is listed while the trip is idle; a path whose mtime moved is
+    handed to `flush`, which re-lists only the levels it belongs to.
+    """
+    known = snapshot_mtimes(watcher.result)
+    pending: set[str] = set()
+    last_change = 0.0
+    while not stop.wait(min(poll_interval, debounce) if pending else poll_interval):
+        changes: set[str] = set()
+        for path, mtime_ns in known.items():
+            current = _mtime_ns(path)
+            if current != mtime_ns:
+                known[path] = current
+                changes.add(path)
+        now = time.monotonic()
+        if changes:
+            pending |= changes
+            last_change = now
+        elif pending and now - last_change >= debounce:
+            flush(pending)
+            pending = set()
+            known = snapshot_mtimes(watcher.result)
+
+
+def _inotify_changes(
+    observer,
+    collector: _ChangeCollector,
+    flush: Callable[[set[str]], None],
+    stop: threading.Event,
+    debounce: float,
+) -> None:
+    try:
+        while not stop.is_set():
+            if not collector.event.wait(0.5):
+                continue
+            # Keep collecting until the tree has been quiet for `debounce` seconds.
+            while collector.event.is_set() and not stop.is_set():
+                collector.event.clear()
+                stop.wait(debounce)
+            flush(collector.take())
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def watch_trip(
+    watcher: TripWatcher,
+    on_update: Callable[[HierarchyResult, int], None],
+    *,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    use_polling: bool | None = None,
+    stop: threading.Event | None = None,
+    logger: Callable[[str], None] | None = None,
+) -> None:
+    """Apply filesystem changes to `watcher` until `stop` is set.
+
+    Uses inotify (through watchdog) when available, otherwise, or when the
+    inotify watch limit is exhausted, polls the mtimes in `snapshot_mtimes`
+    every `poll_interval` seconds. Changes are batched until `debounce` seconds
+    pass without new ones, then applied, and `on_update` is called with the
+    result and the number of pins that changed.
+    """
+    stop = stop or threading.Event()
+    Observer = _observer_class() if not use_polling else None
+    if use_polling is None:
+        use_polling = Observer is None
+    if not use_polling and Observer is None:
+        raise RuntimeError("inotify watching requires watchdog; install it with `pip install imca-report-table[watch]`")
+
+    def log(message: str) -> None:
+        if logger:
+            logger(message)
+
+    def flush(paths: set[str]) -> None:
+        changed = watcher.apply(paths) if paths else 0
+        if changed:
+            on_update(watcher.result, changed)
+
+    if not use_polling:
+        collector = _ChangeCollector()
+        observer = Observer()
+        try:
+            observer.schedule(collector, os.fspath(watcher.root), recursive=True)
+            observer.start()
+        except OSError as exc:
+            log(f"inotify unavailable ({exc}); falling back to polling")
+        else:
+            log(f"Watching {watcher.root} for changes (inotify)")
+            _inotify_changes(observer, collector, flush, stop, debounce)
+            return
+    log(f"Polling {watcher.root} every {poll_interval:g}s for changes")
+    _poll_changes(watcher, flush, stop, poll_interval, debounce)
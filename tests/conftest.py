@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.render import html as html_render
+
+EXPECTED_SUBDIRS = ("camera", "diff-center", "images", "processing")
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGMAAQAABQABDQottAAAAABJRU5ErkJggg=="
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_home(tmp_path_factory: pytest.TempPathFactory, monkeypatch) -> Iterator[Path]:
+    """Keep template, thumbnail, and summary caches out of the real ``~/.cache``."""
+    cache_home = tmp_path_factory.mktemp("cache-home")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    html_render._environment.cache_clear()
+    yield cache_home
+    html_render._environment.cache_clear()
+
+
+def _create_collection(root: Path, *parts: str) -> Path:
+    base = root.joinpath(*parts)
+    for sub in EXPECTED_SUBDIRS:
+        (base / sub).mkdir(parents=True, exist_ok=True)
+    return base
+
+
+@pytest.fixture
+def create_collection() -> Callable[..., Path]:
+    """Return a helper creating ``root/<site>/<puck>/<pin>/<collection>`` with every expected subdirectory."""
+    return _create_collection
+
+
+@pytest.fixture
+def png_bytes() -> bytes:
+    """A valid 1x1 PNG to use as a preview image."""
+    return PNG_BYTES
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.profiling import Profiler
+from imca_report_table.render import html as html_render
+from imca_report_table.render.assets import AssetResolver
+from imca_report_table.traversal import build_hierarchy
+
+
+@pytest.fixture
+def trip(tmp_path: Path, create_collection, png_bytes: bytes) -> Path:
+    trip = tmp_path / "trip"
+    base = create_collection(trip, "site1", "puck01", "pin1", "A")
+    (base / "camera" / "loop-inter_4_000.jpeg").write_bytes(png_bytes)
+    return trip
+
+
+def test_linked_mode_references_relative_paths(tmp_path: Path, trip: Path) -> None:
+    output = tmp_path / "reports" / "report.html"
+
+    html = html_render.render_html_report(
+        build_hierarchy(trip), asset_mode="linked", output_path=output
+    )
+
+    assert 'src="../trip/site1/puck01/pin1/A/camera/loop-inter_4_000.jpeg"' in html
+    assert "base64," not in html
+
+
+def test_copy_mode_places_images_beside_report(tmp_path: Path, trip: Path, png_bytes: bytes) -> None:
+    output = tmp_path / "reports" / "report.html"
+    assets = AssetResolver("copy", output_path=output)
+
+    rows = html_render.flatten_collections(build_hierarchy(trip), assets=assets)
+
+    preview = rows[0]["camera_preview_cells"]["loop_inter_4_000"]
+    assert preview["src"].startswith("assets/")
+    assert preview["src"].endswith("_loop-inter_4_000.jpeg")
+    assert "data_uri" not in preview
+    assert (output.parent / preview["src"]).read_bytes() == png_bytes
+
+
+def test_inline_report_embeds_each_distinct_image_once(trip: Path, png_bytes: bytes) -> None:
+    first = trip / "site1" / "puck01" / "pin1" / "A" / "camera" / "loop-inter_4_000.jpeg"
+    for collection in "BCDEFGHIJKLMNOPQRSTUVWXYZ":
+        camera = trip / "site1" / "puck01" / "pin1" / collection / "camera"
+        camera.mkdir(parents=True)
+        (camera / "loop-inter_4_000.jpeg").symlink_to(first)
+    (camera / "loop-inter_4_090.jpeg").write_bytes(png_bytes)
+    profiler = Profiler()
+
+    html = html_render.render_html_report(build_hierarchy(trip), profiler=profiler)
+
+    assert html.count("data:image/jpeg;base64,") == 1
+    assert html.count("<img data-image=") == 26
+    assert "<script>" in html
+    counters = profiler.to_dict()["counters"]
+    # Prefetch threads asking for the same image concurrently share one read and encode.
+    assert counters["images_embedded"] == 1
+    assert counters["images_deduplicated"] == 26
+    # The symlinked copies are recognised without reading them again.
+    assert counters["bytes_read"] == 2 * len(png_bytes)
+
+
+def test_non_inline_modes_require_output_path() -> None:
+    with pytest.raises(ValueError):
+        AssetResolver("linked")
+    with pytest.raises(ValueError):
+        AssetResolver("embedded")
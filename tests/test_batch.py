@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from imca_report_table.batch import expand_roots, run_batch
+from imca_report_table.utils import load_hierarchy
+
+
+def test_expand_roots_globs_directories_once(tmp_path: Path) -> None:
+    for name in ("2025_01_IMCA", "2025_02_IMCA"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "2025_03_IMCA.txt").write_text("not a trip", encoding="utf-8")
+
+    roots = expand_roots([str(tmp_path / "2025_*"), str(tmp_path / "2025_01_IMCA"), str(tmp_path / "missing")])
+
+    assert [root.name for root in roots] == ["2025_01_IMCA", "2025_02_IMCA", "missing"]
+
+
+def test_run_batch_writes_per_trip_outputs_and_index(tmp_path: Path, create_collection) -> None:
+    create_collection(tmp_path / "a" / "trip", "site1", "puck01", "pin1", "A")
+    create_collection(tmp_path / "b" / "trip", "site1", "puck01", "pin1", "A")
+    (tmp_path / "b" / "trip" / "site1" / "puck01" / "pin1" / "A" / "images").rmdir()
+    roots = [tmp_path / "a" / "trip", tmp_path / "b" / "trip", tmp_path / "missing"]
+    output_html = tmp_path / "out" / "nightly.html"
+
+    outcomes = run_batch(
+        roots, output_html=output_html, output_json=tmp_path / "out" / "nightly.json", workers=2
+    )
+
+    assert [outcome.ok for outcome in outcomes] == [True, False, False]
+    assert outcomes[2].error and outcomes[2].html_path is None
+    assert [outcome.html_path.name for outcome in outcomes[:2]] == ["trip.html", "trip-2.html"]
+    assert outcomes[1].json_path == tmp_path / "out" / "nightly_trips" / "trip-2.json"
+    assert load_hierarchy(outcomes[1].json_path).all_expected_present is False
+    index = output_html.read_text(encoding="utf-8")
+    assert 'href="nightly_trips/trip.html"' in index
+    assert 'href="nightly_trips/trip-2.json"' in index
+    assert "FileNotFoundError" in index
+    assert 'href="../nightly.html"' in outcomes[0].html_path.read_text(encoding="utf-8")
+
+
+def test_unreadable_trip_recorded_without_stopping_batch(tmp_path: Path, monkeypatch, create_collection) -> None:
+    create_collection(tmp_path / "a" / "trip", "site1", "puck01", "pin1", "A")
+    create_collection(tmp_path / "locked", "site1", "puck01", "pin1", "A")
+    locked = tmp_path / "locked"
+    scandir = os.scandir
+
+    def guarded_scandir(path="."):
+        # Permission bits do not stop root, so refuse the listing directly.
+        if Path(path) == locked:
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded_scandir)
+    output_html = tmp_path / "out" / "nightly.html"
+
+    outcomes = run_batch([tmp_path / "a" / "trip", locked], output_html=output_html, workers=2)
+
+    assert outcomes[0].ok
+    assert outcomes[1].error.startswith("PermissionError") and outcomes[1].html_path is None
+    assert "PermissionError" in output_html.read_text(encoding="utf-8")
+
+
+def test_failed_report_write_recorded_without_stopping_batch(tmp_path: Path, monkeypatch, create_collection) -> None:
+    from imca_report_table import batch
+
+    create_collection(tmp_path / "a" / "trip", "site1", "puck01", "pin1", "A")
+    create_collection(tmp_path / "full", "site1", "puck01", "pin1", "A")
+    write_html_report = batch.write_html_report
+
+    def failing_write(path, chunks, **kwargs):
+        if Path(path).stem == "full":
+            raise OSError(28, "No space left on device", str(path))
+        return write_html_report(path, chunks, **kwargs)
+
+    monkeypatch.setattr(batch, "write_html_report", failing_write)
+    output_html = tmp_path / "out" / "nightly.html"
+
+    outcomes = run_batch(
+        [tmp_path / "a" / "trip", tmp_path / "full"],
+        output_html=output_html,
+        output_json=tmp_path / "out" / "nightly.json",
+        workers=2,
+    )
+
+    assert outcomes[0].ok and outcomes[0].json_path is not None
+    assert outcomes[1].error.startswith("OSError") and not outcomes[1].ok
+    assert outcomes[1].html_path is None and outcomes[1].json_path is None
+    assert "No space left on device" in output_html.read_text(encoding="utf-8")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from imca_report_table import __version__
 from imca_report_table.__main__ import parse_args
+from imca_report_table.traversal import build_hierarchy
+from imca_report_table.utils import write_hierarchy_json
 
 
 def test_version_flag_outputs_version_and_exits(capsys: pytest.CaptureFixture[str]) -> None:
@@ -12,3 +18,86 @@ def test_version_flag_outputs_version_and_exits(capsys: pytest.CaptureFixture[st
     assert exc.value.code == 0
     captured = capsys.readouterr()
     assert __version__ in captured.out
+
+
+def test_jobs_flag_parsed() -> None:
+    assert parse_args(["trip", "--jobs", "4"]).jobs == 4
+    assert parse_args(["trip"]).jobs == 1
+
+
+def test_jobs_flag_rejects_zero() -> None:
+    with pytest.raises(SystemExit):
+        parse_args(["trip", "--jobs", "0"])
+
+
+def test_scan_limit_flags_parsed() -> None:
+    args = parse_args(["trip", "--max-depth", "0", "--prune", "video_*", "--prune", "tmp", "--max-files", "50"])
+    assert (args.max_depth, args.prune, args.max_files) == (0, ["video_*", "tmp"], 50)
+    with pytest.raises(SystemExit):
+        parse_args(["trip", "--max-depth", "-1"])
+
+
+def test_metadata_processes_flag_parsed() -> None:
+    assert parse_args(["trip", "--metadata-processes", "4"]).metadata_processes == 4
+    assert parse_args(["trip"]).metadata_processes is None
+
+
+def test_watch_flag_parsed() -> None:
+    args = parse_args(["trip", "--watch", "--poll-interval", "1", "--output-html", "report.html"])
+    assert args.watch and args.root == "trip" and args.poll_interval == 1.0
+    assert parse_args(["trip"]).watch is False
+    # A trip directory may itself be called "watch".
+    args = parse_args(["watch"])
+    assert (args.root, args.watch) == ("watch", False)
+
+
+def test_multiple_roots_select_batch_mode() -> None:
+    single = parse_args(["trip"])
+    assert (single.root, single.batch) == ("trip", False)
+    many = parse_args(["trip1", "trip2"])
+    assert (many.root, many.roots, many.batch) == (None, ["trip1", "trip2"], True)
+    assert parse_args(["trips/2025_*"]).batch is True
+    assert parse_args([]).root is None
+
+
+# Imported only when their output is requested; see the note in __main__.
+HEAVY_MODULES = {"rich", "jinja2", "PIL", "watchdog", "sqlite3", "asyncio", "multiprocessing"}
+
+
+def imported_modules(*args: str) -> set[str]:
+    """Run Python with ``-X importtime`` and return the top-level packages it imported."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+
+
+def test_cli_import_skips_heavy_dependencies() -> None:
+    modules = imported_modules("-c", "import imca_report_table.__main__")
+    assert "imca_report_table" in modules
+    assert not modules & HEAVY_MODULES
+
+
+def test_json_only_run_skips_heavy_dependencies(tmp_path: Path) -> None:
+    (tmp_path / "trip" / "site1" / "puck01" / "pin1" / "A" / "camera").mkdir(parents=True)
+    cache = write_hierarchy_json(tmp_path / "cache.json", build_hierarchy(tmp_path / "trip"))
+    modules = imported_modules(
+        "-m",
+        "imca_report_table",
+        "--input-json",
+        str(cache),
+        "--output-json",
+        str(tmp_path / "copy.json"),
+        "--no-console",
+        "--quiet",
+    )
+    assert (tmp_path / "copy.json").exists()
+    assert not modules & HEAVY_MODULES
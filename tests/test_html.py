@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from types import GeneratorType
+
+import pytest
+
+from imca_report_table.render import html as html_render
+from imca_report_table.render.assets import AssetResolver
+from imca_report_table.traversal import build_hierarchy
+
+GENERATED_AT = datetime(2025, 9, 28, 12, 0, tzinfo=timezone.utc)
+
+
+def test_streamed_report_matches_rendered_report(tmp_path: Path, create_collection, png_bytes: bytes) -> None:
+    trip = tmp_path / "trip"
+    for pin in ("pin1", "pin2"):
+        base = create_collection(trip, "site1", "puck01", pin, "A")
+        (base / "camera" / "loop-inter_4_000.jpeg").write_bytes(png_bytes)
+    result = build_hierarchy(trip)
+
+    chunks = html_render.generate_html_report(result, generated_at=GENERATED_AT)
+    output = html_render.write_html_report(tmp_path / "out" / "report.html", chunks)
+
+    assert isinstance(chunks, GeneratorType)
+    expected = html_render.render_html_report(result, generated_at=GENERATED_AT)
+    assert output.read_text(encoding="utf-8") == expected
+    assert expected.count("data:image/jpeg;base64,") == 1
+    assert expected.count("<img data-image=") == 1
+
+
+def test_failed_render_keeps_previous_report(tmp_path: Path) -> None:
+    output = html_render.write_html_report(tmp_path / "report.html", "<html>previous</html>")
+    output.chmod(0o640)
+
+    def failing_chunks():
+        yield "<html>partial"
+        raise RuntimeError("template failed")
+
+    with pytest.raises(RuntimeError):
+        html_render.write_html_report(output, failing_chunks())
+
+    assert output.read_text(encoding="utf-8") == "<html>previous</html>"
+    assert [path.name for path in tmp_path.iterdir()] == ["report.html"]
+    html_render.write_html_report(output, iter(["<html>", "next</html>"]))
+    assert output.read_text(encoding="utf-8") == "<html>next</html>"
+    assert output.stat().st_mode & 0o777 == 0o640
+
+
+def test_empty_trip_reports_no_rows(tmp_path: Path) -> None:
+    html = html_render.render_html_report(build_hierarchy(tmp_path), generated_at=GENERATED_AT)
+
+    assert "No collection rows to display." in html
+
+
+class CountingResolver(AssetResolver):
+    def __init__(self) -> None:
+        super().__init__("inline")
+        self.requested: list[str] = []
+
+    def preview(self, path_str: str) -> dict[str, str] | None:
+        self.requested.append(Path(path_str).name)
+        return super().preview(path_str)
+
+
+def test_iter_flat_rows_defers_image_loading(tmp_path: Path, create_collection, png_bytes: bytes) -> None:
+    base = create_collection(tmp_path / "trip", "site1", "puck01", "pin1", "A")
+    (base / "camera" / "loop-inter_4_000.jpeg").write_bytes(png_bytes)
+    resolver = CountingResolver()
+
+    rows = html_render.iter_flat_rows(build_hierarchy(tmp_path / "trip"), assets=resolver)
+    row = next(rows)
+
+    assert row["collection"] == "A"
+    assert resolver.requested == []
+    assert row.get("camera_preview_cells")["loop_inter_4_000"]["basename"] == "loop-inter_4_000.jpeg"
+    assert resolver.requested == ["loop-inter_4_000.jpeg"]
+    assert row["processing_summary_missing"] == [
+        "SPOT.XDS.SpotsPerImage.png",
+        "INTEGRATE_select2.mrfana.fitness_batch_select2.png",
+    ]
+    assert row.materialize() == html_render.flatten_collections(build_hierarchy(tmp_path / "trip"))[0]
+
+
+def test_parallel_embedding_matches_serial(tmp_path: Path, create_collection, png_bytes: bytes) -> None:
+    trip = tmp_path / "trip"
+    for pin in ("pin1", "pin2", "pin3"):
+        for collection in ("A", "B"):
+            base = create_collection(trip, "site1", "puck01", pin, collection)
+            for name in ("loop-inter_4_000.jpeg", "loop-inter_4_090.jpeg", "raster_180.jpeg", "raster_90.jpeg"):
+                (base / "camera" / name).write_bytes(png_bytes + name.encode())
+    # Two images of the same column; the first vanishes after the scan, so the
+    # row falls back to an image the prefetch plan did not include.
+    (trip / "site1" / "puck01" / "pin2" / "A" / "camera" / "loop-inter_4_000_b.jpeg").write_bytes(png_bytes)
+    result = build_hierarchy(trip)
+    (trip / "site1" / "puck01" / "pin2" / "A" / "camera" / "loop-inter_4_000.jpeg").unlink()
+
+    serial = html_render.flatten_collections(result, embed_workers=1)
+    assert html_render.flatten_collections(result, embed_workers=4, embed_budget_bytes=100) == serial
+    assert serial[2]["camera_preview_cells"]["loop_inter_4_000"]["basename"] == "loop-inter_4_000_b.jpeg"
+    expected = html_render.render_html_report(result, generated_at=GENERATED_AT, embed_workers=1)
+    assert html_render.render_html_report(result, generated_at=GENERATED_AT, embed_workers=3) == expected
+
+
+def render_with(environment, tmp_path: Path, create_collection) -> str:
+    create_collection(tmp_path / "trip", "site1", "puck01", "pin1", "A")
+    context = html_render._report_context(
+        build_hierarchy(tmp_path / "trip"),
+        expected_collection_dirs=None,
+        generated_at=GENERATED_AT,
+        title=None,
+        assets=AssetResolver(),
+    )
+    return environment.get_template("report.html.j2").render(**context)
+
+
+def test_compiled_templates_reused_from_bytecode_cache(tmp_path: Path, monkeypatch, create_collection) -> None:
+    from jinja2 import Environment
+
+    from imca_report_table.render.templates import create_environment
+
+    cache_dir = tmp_path / "templates"
+    expected = render_with(create_environment(cache_dir), tmp_path, create_collection)
+    assert list(cache_dir.glob("*.jinja-cache"))
+
+    def fail_compile(self, *args, **kwargs):
+        raise AssertionError("template compiled again")
+
+    monkeypatch.setattr(Environment, "compile", fail_compile)
+    assert render_with(create_environment(cache_dir), tmp_path, create_collection) == expected
+
+
+def test_unwritable_template_cache_still_renders(tmp_path: Path, create_collection) -> None:
+    from imca_report_table.render.templates import create_environment
+
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("", encoding="utf-8")
+    environment = create_environment(blocker / "templates")
+    assert "Site" in render_with(environment, tmp_path, create_collection)
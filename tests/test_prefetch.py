@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.render.prefetch import PreviewPrefetcher
+
+
+def create_images(tmp_path: Path, count: int, size: int) -> list[str]:
+    paths = []
+    for index in range(count):
+        path = tmp_path / f"image_{index:02d}.jpeg"
+        path.write_bytes(b"x" * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_reads_ahead_within_byte_budget(tmp_path: Path) -> None:
+    paths = create_images(tmp_path, 12, 100)
+    lock = threading.Lock()
+    resolved: list[str] = []
+
+    def resolve(path: str) -> dict[str, str]:
+        with lock:
+            resolved.append(path)
+        return {"path": path}
+
+    with PreviewPrefetcher(resolve, paths, workers=4, max_inflight_bytes=250) as prefetcher:
+        for path in paths:
+            assert prefetcher.take(path) == {"path": path}
+            # Two 100-byte images fit in the budget: the one just taken has been
+            # released, so at most two more can have been read ahead of it.
+            with lock:
+                assert len(resolved) <= paths.index(path) + 3
+            assert prefetcher._used <= 250
+    assert sorted(resolved) == paths
+
+
+def test_skipped_and_unplanned_paths_resolved_on_demand(tmp_path: Path) -> None:
+    paths = create_images(tmp_path, 6, 10)
+    calls: list[str] = []
+
+    def resolve(path: str) -> dict[str, str]:
+        calls.append(path)
+        return {"path": path}
+
+    with PreviewPrefetcher(resolve, paths, workers=2, max_inflight_bytes=1000) as prefetcher:
+        assert prefetcher.take(paths[3]) == {"path": paths[3]}
+        # Earlier paths were discarded once a later one was taken.
+        assert prefetcher.take(paths[0]) == {"path": paths[0]}
+        assert prefetcher.take("unplanned.png") == {"path": "unplanned.png"}
+        assert prefetcher.take(paths[5]) == {"path": paths[5]}
+    assert "unplanned.png" in calls
+    assert prefetcher._used == 0
+
+
+def test_rejects_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        PreviewPrefetcher(lambda path: None, [], workers=0)
+    with pytest.raises(ValueError):
+        PreviewPrefetcher(lambda path: None, [], max_inflight_bytes=0)
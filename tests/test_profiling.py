@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.__main__ import main
+from imca_report_table.profiling import Profiler
+from imca_report_table.render.html import flatten_collections, render_html_report
+from imca_report_table.traversal import build_hierarchy
+
+
+@pytest.fixture
+def create_trip(tmp_path: Path, create_collection) -> Callable[..., Path]:
+    def create(collections: int = 2) -> Path:
+        root = tmp_path / "trip"
+        for index in range(collections):
+            collection_dir = create_collection(root, "site1", "puck01", "pin1", "ABCDEFGH"[index])
+            (collection_dir / "camera" / "loop-inter_4_000.jpeg").write_bytes(b"\xff\xd8" * 8)
+            processing_dir = collection_dir / "processing"
+            (processing_dir / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"\x89PNG" * 4)
+            (processing_dir / "00_summary.html").write_text(
+                '<img src="SPOT.XDS.SpotsPerImage.png"/>', encoding="utf-8"
+            )
+        return root
+
+    return create
+
+
+def test_profiler_phases_counters_and_merge() -> None:
+    profiler = Profiler()
+    with profiler.phase("walk"):
+        profiler.count("files", 3)
+    assert list(profiler.timed_chunks("render", iter(["a", "b"]))) == ["a", "b"]
+
+    copy = pickle.loads(pickle.dumps(profiler))
+    taken = copy.take()
+    assert copy.to_dict() == {"phases": {}, "counters": {}}
+    profiler.merge(taken)
+
+    profile = profiler.to_dict()
+    assert profile["phases"]["walk"]["calls"] == 2
+    assert profile["phases"]["render"]["calls"] == 2
+    assert profile["counters"] == {"files": 6}
+
+
+def test_scan_and_render_record_phases_and_counters(create_trip) -> None:
+    root = create_trip()
+    profiler = Profiler()
+
+    result = build_hierarchy(root, profiler=profiler)
+    flatten_collections(result, profiler=profiler)
+    render_html_report(result, profiler=profiler)
+
+    profile = profiler.to_dict()
+    for name in (
+        "build_hierarchy",
+        "walk",
+        "camera_metadata",
+        "processing_metadata",
+        "summary_parse",
+        "flatten_collections",
+        "image_embedding",
+        "render_html_report",
+    ):
+        assert name in profile["phases"], name
+    counters = profile["counters"]
+    assert counters["collections"] == 2
+    assert counters["summaries_parsed"] == 2
+    # Two collections, each embedding one 16-byte camera image and one 16-byte plot,
+    # once per row when flattening and once per distinct image in the report.
+    assert counters["images_embedded"] == 6
+    assert counters["bytes_embedded"] == 6 * 24
+    assert counters["images_deduplicated"] == 2
+    assert counters["bytes_read"] >= 8 * 16
+
+
+def test_process_pool_profile_merged_into_parent(create_trip) -> None:
+    root = create_trip(collections=3)
+    profiler = Profiler()
+    build_hierarchy(root, metadata_processes=2, profiler=profiler)
+
+    profile = profiler.to_dict()
+    assert profile["phases"]["processing_metadata"]["calls"] == 3
+    assert profile["counters"]["summaries_parsed"] == 3
+
+
+def test_cli_profile_json(tmp_path: Path, create_trip) -> None:
+    root = create_trip()
+    profile_path = tmp_path / "profile.json"
+    exit_code = main(
+        [
+            str(root),
+            "--quiet",
+            "--no-console",
+            "--output-html",
+            str(tmp_path / "report.html"),
+            "--profile-json",
+            str(profile_path),
+        ]
+    )
+
+    assert exit_code == 0
+    profile = json.loads(profile_path.read_text(encoding="utf-8"))
+    assert {"build_hierarchy", "render_html_report", "write_html"} <= profile["phases"].keys()
+    assert profile["counters"]["bytes_written"] == (tmp_path / "report.html").stat().st_size
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.render.sharded import shard_hierarchy, write_sharded_html_report
+from imca_report_table.traversal import build_hierarchy
+
+@pytest.fixture
+def trip(tmp_path: Path, create_collection, png_bytes: bytes) -> Path:
+    trip = tmp_path / "trip"
+    for site, puck, pin, collection in (
+        ("site1", "puck01", "pin1", "A"),
+        ("site1", "puck01", "pin1", "B"),
+        ("site1", "puck02", "pin1", "A"),
+        ("site2", "puck03", "pin1", "A"),
+    ):
+        base = create_collection(trip, site, puck, pin, collection)
+        (base / "camera" / f"loop-inter_4_000_{puck}{collection}.jpeg").write_bytes(png_bytes)
+    (trip / "site2" / "puck03" / "pin2").mkdir()
+    return trip
+
+
+def test_shard_by_puck_and_rows_per_page(trip: Path) -> None:
+    result = build_hierarchy(trip)
+
+    by_puck = shard_hierarchy(result, shard_by="puck")
+    assert [label for label, _ in by_puck] == [
+        "Site site1 / Puck puck01",
+        "Site site1 / Puck puck02",
+        "Site site2 / Puck puck03",
+    ]
+    assert by_puck[0][1].all_expected_present
+    assert not by_puck[2][1].all_expected_present
+
+    pages = shard_hierarchy(result, rows_per_page=1)
+    assert [sum(1 for _ in shard.trip.iter_collections()) for _, shard in pages] == [2, 1, 1]
+
+    with pytest.raises(ValueError):
+        shard_hierarchy(result)
+
+
+def test_sharded_report_pages_carry_only_their_previews(tmp_path: Path, trip: Path) -> None:
+    result = build_hierarchy(trip)
+    output = tmp_path / "out" / "report.html"
+
+    index_path = write_sharded_html_report(result, output, shard_by="site", workers=2)
+
+    index = index_path.read_text(encoding="utf-8")
+    assert 'href="report_pages/001-Site-site1.html"' in index
+    assert 'href="report_pages/002-Site-site2.html"' in index
+    assert "base64," not in index
+    site1 = (output.parent / "report_pages" / "001-Site-site1.html").read_text(encoding="utf-8")
+    # The three identical previews are embedded once and referenced twice.
+    assert site1.count("data:image/jpeg;base64,") == 1
+    assert site1.count("<img data-image=") == 2
+    site2 = (output.parent / "report_pages" / "002-Site-site2.html").read_text(encoding="utf-8")
+    assert site2.count("data:image/jpeg;base64,") == 1
+    assert "puck03" not in site1
+    assert 'href="../report.html"' in site1
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+from imca_report_table.summary_cache import SUMMARY_CACHE_FILENAME, SummaryCache
+from imca_report_table.traversal import build_hierarchy
+
+
+def write_summary(processing_dir: Path, plot: str = "SPOT.XDS.SpotsPerImage.png") -> Path:
+    processing_dir.mkdir(parents=True, exist_ok=True)
+    (processing_dir / plot).write_bytes(b"")
+    summary = processing_dir / "00_summary.html"
+    summary.write_text(f'<html><body><img src="{plot}"/></body></html>', encoding="utf-8")
+    return summary
+
+
+def test_summary_cache_persists_and_invalidates(tmp_path: Path) -> None:
+    summary = write_summary(tmp_path / "processing")
+    with SummaryCache(tmp_path / "cache") as cache:
+        assert cache.get(str(summary), summary.stat()) is None
+        cache.put(str(summary), summary.stat(), ["SPOT.XDS.SpotsPerImage.png"])
+
+    reopened = SummaryCache(tmp_path / "cache")
+    assert reopened.get(str(summary), summary.stat()) == ["SPOT.XDS.SpotsPerImage.png"]
+    stat = summary.stat()
+    os.utime(summary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert reopened.get(str(summary), summary.stat()) is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+    reopened.close()
+
+
+def test_summary_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    stat = os.stat(tmp_path)
+    with SummaryCache(tmp_path / "cache") as cache:
+        cache.put("/old/00_summary.html", stat, ["a" * 400])
+    with SummaryCache(tmp_path / "cache", limit_bytes=600) as cache:
+        cache.put("/new/00_summary.html", stat, ["b" * 400])
+
+    cache = SummaryCache(tmp_path / "cache")
+    assert cache.get("/old/00_summary.html", stat) is None
+    assert cache.get("/new/00_summary.html", stat) == ["b" * 400]
+    cache.close()
+
+
+def test_full_summary_cache_evicts_to_low_water_mark(tmp_path: Path) -> None:
+    stat = os.stat(tmp_path)
+    with SummaryCache(tmp_path / "cache") as cache:
+        for index in range(10):
+            cache.put(f"/old/{index}/00_summary.html", stat, ["a" * 8000])
+    with SummaryCache(tmp_path / "cache", limit_bytes=10 * 8100) as cache:
+        cache.put("/new/00_summary.html", stat, ["b" * 8000])
+
+    connection = sqlite3.connect(tmp_path / "cache" / SUMMARY_CACHE_FILENAME)
+    paths = [path for (path,) in connection.execute("SELECT path FROM summaries")]
+    (free,) = connection.execute("PRAGMA freelist_count").fetchone()
+    connection.close()
+    # Room is made for more than the one new entry, without rewriting the file.
+    assert len(paths) == 8 and "/new/00_summary.html" in paths
+    assert free > 0
+
+
+def test_build_hierarchy_reuses_parsed_summaries(tmp_path: Path, monkeypatch) -> None:
+    trip = tmp_path / "trip"
+    for letter in ("A", "B"):
+        write_summary(trip / "site1" / "puck01" / "pin1" / letter / "processing")
+    cold = SummaryCache(tmp_path / "cache")
+    expected = build_hierarchy(trip, summary_cache=cold)
+    cold.close()
+    assert (cold.hits, cold.misses) == (0, 2)
+
+    def fail_read(self, *args, **kwargs):
+        raise AssertionError(f"summary re-read: {self}")
+
+    monkeypatch.setattr(Path, "read_text", fail_read)
+    monkeypatch.setattr(Path, "read_bytes", fail_read)
+    warm = SummaryCache(tmp_path / "cache")
+    result = build_hierarchy(trip, summary_cache=warm)
+    warm.close()
+
+    assert (warm.hits, warm.misses) == (2, 0)
+    processing = result.trip.sites[0].pucks[0].pins[0].collections[0].expected[3]
+    assert processing.metadata == expected.trip.sites[0].pucks[0].pins[0].collections[0].expected[3].metadata
+    assert processing.metadata["summary_image"] == "SPOT.XDS.SpotsPerImage.png"
+
+
+def test_process_pool_records_summary_cache_entries(tmp_path: Path) -> None:
+    trip = tmp_path / "trip"
+    for letter in ("A", "B", "C"):
+        write_summary(trip / "site1" / "puck01" / "pin1" / letter / "processing")
+    with SummaryCache(tmp_path / "cache") as cache:
+        build_hierarchy(trip, metadata_processes=2, summary_cache=cache)
+    assert cache.misses == 3
+
+    with SummaryCache(tmp_path / "cache") as cache:
+        build_hierarchy(trip, metadata_processes=2, summary_cache=cache)
+    assert (cache.hits, cache.misses) == (3, 0)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from imca_report_table.render import html as html_render
+from imca_report_table.render.thumbnails import ThumbnailCache
+from imca_report_table.traversal import build_hierarchy
+
+
+def write_image(path: Path, size: tuple[int, int] = (1200, 800)) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, (120, 30, 200)).save(path, format="JPEG")
+    return path
+
+
+def test_thumbnail_is_downscaled_and_reused(tmp_path: Path) -> None:
+    source = write_image(tmp_path / "loop-inter_4_000.jpeg")
+    cache = ThumbnailCache(tmp_path / "cache", max_size=64)
+
+    first = cache.thumbnail(source)
+    second = cache.thumbnail(source)
+
+    assert first is not None and first == second
+    with Image.open(first) as thumb:
+        assert max(thumb.size) == 64
+    assert (cache.generated, cache.reused) == (1, 1)
+
+
+def test_thumbnail_regenerated_when_source_changes(tmp_path: Path) -> None:
+    source = write_image(tmp_path / "raster_000.jpeg")
+    cache = ThumbnailCache(tmp_path / "cache", max_size=32)
+    first = cache.thumbnail(source)
+
+    write_image(source, size=(300, 300))
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.thumbnail(source) != first
+    assert cache.generated == 2
+
+
+def test_thumbnail_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path / "cache", max_size=256, limit_bytes=1)
+    older = cache.thumbnail(write_image(tmp_path / "a.jpeg"))
+    newer = cache.thumbnail(write_image(tmp_path / "b.jpeg"))
+
+    assert older is not None and not older.exists()
+    assert newer is not None and newer.exists()
+
+
+def test_full_cache_evicts_in_batches(tmp_path: Path, monkeypatch) -> None:
+    sources = [write_image(tmp_path / f"{index:02d}.jpeg", size=(64 + index, 64)) for index in range(30)]
+    warm = ThumbnailCache(tmp_path / "cache", max_size=64)
+    sizes = [warm.thumbnail(source).stat().st_size for source in sources]
+    cache = ThumbnailCache(tmp_path / "cache", max_size=64, limit_bytes=sum(sizes[:10]))
+    walks = 0
+    entries = ThumbnailCache._entries
+
+    def counting_entries(self):
+        nonlocal walks
+        walks += 1
+        return entries(self)
+
+    monkeypatch.setattr(ThumbnailCache, "_entries", counting_entries)
+    for source in sources:
+        source.touch()
+        assert cache.thumbnail(source) is not None
+
+    # One walk to measure usage, then one per batch of evictions rather than per thumbnail.
+    assert walks <= 1 + len(sources) // 2
+    assert cache._usage == cache._measure_usage() <= cache.limit_bytes
+
+
+def test_unreadable_image_falls_back_to_original(tmp_path: Path) -> None:
+    trip = tmp_path / "trip"
+    camera_dir = trip / "site1" / "puck01" / "pin1" / "A" / "camera"
+    for sub in ("camera", "diff-center", "images", "processing"):
+        (camera_dir.parent / sub).mkdir(parents=True, exist_ok=True)
+    (camera_dir / "loop-inter_4_000.jpeg").write_bytes(b"not an image")
+    write_image(camera_dir / "loop-inter_4_045.jpeg")
+
+    cache = ThumbnailCache(tmp_path / "cache", max_size=16)
+    row = html_render.flatten_collections(build_hierarchy(trip), thumbnails=cache)[0]
+
+    assert row["camera_preview_cells"]["loop_inter_4_000"]["data_uri"] == "data:image/jpeg;base64,bm90IGFuIGltYWdl"
+    assert row["camera_preview_cells"]["loop_inter_4_045"]["basename"] == "loop-inter_4_045.jpeg"
+    assert cache.generated == 1
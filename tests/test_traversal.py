@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import asyncio
 import base64
 import json
+import threading
+
+import pytest
 
 from imca_report_table.render import html as html_render
-from imca_report_table.traversal import build_hierarchy
+from imca_report_table.traversal import abuild_hierarchy, build_hierarchy
 from imca_report_table.utils import hierarchy_from_dict, hierarchy_to_dict
 
 
@@ -42,6 +46,23 @@ def test_build_hierarchy_handles_extras(tmp_path: Path) -> None:
     assert "extra-folder" in collection.extras
 
 
+def test_build_hierarchy_ignores_stray_files(tmp_path: Path) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    (tmp_path / "notes.txt").write_text("", encoding="utf-8")
+    (tmp_path / "site1" / "puck01" / "readme").write_text("", encoding="utf-8")
+    (tmp_path / "site1" / "puck01" / "pin1" / "B").write_text("", encoding="utf-8")
+    (tmp_path / "site1" / "puck01" / "pin1" / "A" / "processing.log").write_text("", encoding="utf-8")
+
+    result = build_hierarchy(tmp_path)
+
+    assert [site.name for site in result.trip.sites] == ["site1"]
+    pin = result.trip.sites[0].pucks[0].pins[0]
+    assert [puck.name for puck in result.trip.sites[0].pucks] == ["puck01"]
+    assert [collection.name for collection in pin.collections] == ["A"]
+    assert pin.collections[0].extras == []
+    assert result.all_expected_present
+
+
 def test_camera_metadata_collected(tmp_path: Path, monkeypatch) -> None:
     create_collection(tmp_path, "site1", "puck01", "pin1", "C")
     camera_dir = tmp_path / "site1" / "puck01" / "pin1" / "C" / "camera"
@@ -58,13 +79,14 @@ def test_camera_metadata_collected(tmp_path: Path, monkeypatch) -> None:
     )
     assert camera_status.present
     assert camera_status.path == camera_dir.resolve()
-    assert sorted(camera_status.metadata["image_files"]) == sorted(
+    assert camera_status.metadata["image_files"] == ["image1.JPG", "subdir/image2.png"]
+    assert sorted(camera_status.metadata_paths("image_files")) == sorted(
         [
             str((camera_dir / "image1.JPG").resolve()),
             str((camera_dir / "subdir" / "image2.png").resolve()),
         ]
     )
-    assert camera_status.metadata["csv_files"] == [
+    assert camera_status.metadata_paths("csv_files") == [
         str((camera_dir / "metadata.csv").resolve())
     ]
 
@@ -277,3 +299,364 @@ def test_traversal_without_site_level(tmp_path: Path) -> None:
     assert site.name == "root"
     assert len(site.pucks) == 1
     assert site.pucks[0].name == "puck01"
+
+
+def test_parallel_traversal_matches_serial(tmp_path: Path) -> None:
+    for site in ("site1", "site2"):
+        for puck in ("puck01", "puck02", "puck03"):
+            create_collection(tmp_path, site, puck, "pin1", "A")
+            create_collection(tmp_path, site, puck, "pin2", "B")
+    (tmp_path / "site2" / "puck02" / "pin3").mkdir()
+
+    serial = build_hierarchy(tmp_path)
+    parallel = build_hierarchy(tmp_path, workers=4)
+
+    assert hierarchy_to_dict(parallel) == hierarchy_to_dict(serial)
+    assert not parallel.all_expected_present
+
+
+def test_incremental_rescan_reuses_unchanged_collections(tmp_path: Path, monkeypatch) -> None:
+    from imca_report_table import traversal
+
+    trip = tmp_path / "trip"
+    create_collection(trip, "site1", "puck01", "pin1", "A")
+    create_collection(trip, "site1", "puck01", "pin1", "B")
+    (trip / "site1" / "puck01" / "pin1" / "A" / "camera" / "loop-inter_4_000.jpeg").write_bytes(b"")
+    cached = hierarchy_from_dict(json.loads(json.dumps(hierarchy_to_dict(build_hierarchy(trip)))))
+
+    create_collection(trip, "site1", "puck01", "pin2", "A")
+    scanned: list[str] = []
+    original = traversal._collect_camera_metadata
+
+    def tracking(camera_dir: Path, **kwargs) -> dict[str, list[str]]:
+        scanned.append(str(camera_dir))
+        return original(camera_dir, **kwargs)
+
+    monkeypatch.setattr(traversal, "_collect_camera_metadata", tracking)
+    refreshed = build_hierarchy(trip, previous=cached)
+
+    assert scanned == [str(trip / "site1" / "puck01" / "pin2" / "A" / "camera")]
+    assert hierarchy_to_dict(refreshed) == hierarchy_to_dict(build_hierarchy(trip))
+
+
+def test_incremental_rescan_skips_listing_unchanged_pins_and_pucks(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from imca_report_table import traversal
+
+    trip = tmp_path / "trip"
+    create_collection(trip, "site1", "puck01", "pin1", "A")
+    create_collection(trip, "site1", "puck02", "pin1", "A")
+    create_collection(trip, "site1", "puck02", "pin2", "A")
+    cached = hierarchy_from_dict(json.loads(json.dumps(hierarchy_to_dict(build_hierarchy(trip)))))
+
+    create_collection(trip, "site1", "puck02", "pin2", "B")
+    (trip / "site1" / "puck01" / "pin1" / "A" / "camera" / "loop-inter_4_000.jpeg").write_bytes(b"")
+    listed: list[str] = []
+    original = traversal._scan_dirs
+
+    def tracking(path):
+        listed.append(str(path))
+        return original(path)
+
+    monkeypatch.setattr(traversal, "_scan_dirs", tracking)
+    refreshed = build_hierarchy(trip, previous=cached)
+    monkeypatch.undo()
+
+    puck02 = trip / "site1" / "puck02"
+    assert str(puck02 / "pin2") in listed
+    for unchanged in (trip / "site1" / "puck01", trip / "site1" / "puck01" / "pin1", puck02, puck02 / "pin1"):
+        assert str(unchanged) not in listed
+    assert hierarchy_to_dict(refreshed) == hierarchy_to_dict(build_hierarchy(trip))
+
+
+def _add_camera_image(collection: Path) -> None:
+    (collection / "camera" / "sub" / "loop-inter_4_090.jpeg").write_bytes(b"")
+
+
+def _rewrite_summary(collection: Path) -> None:
+    (collection / "processing" / "xds_run1" / "00_summary.html").write_text(
+        '<img src="INTEGRATE_select2.mrfana.fitness_batch_select2.png"/>', encoding="utf-8"
+    )
+
+
+def _delete_plots(collection: Path) -> None:
+    (collection / "processing" / "xds_run1" / "SPOT.XDS.SpotsPerImage.png").unlink()
+
+
+@pytest.mark.parametrize("edit", [_add_camera_image, _rewrite_summary, _delete_plots])
+def test_incremental_rescan_sees_changes_below_expected_directories(tmp_path: Path, edit) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    collection = tmp_path / "site1" / "puck01" / "pin1" / "A"
+    (collection / "camera" / "sub").mkdir()
+    (collection / "camera" / "sub" / "loop-inter_4_000.jpeg").write_bytes(b"")
+    run_dir = collection / "processing" / "xds_run1"
+    run_dir.mkdir()
+    (run_dir / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+    (run_dir / "INTEGRATE_select2.mrfana.fitness_batch_select2.png").write_bytes(b"")
+    (run_dir / "00_summary.html").write_text('<img src="SPOT.XDS.SpotsPerImage.png"/>', encoding="utf-8")
+    cached = hierarchy_from_dict(json.loads(json.dumps(hierarchy_to_dict(build_hierarchy(tmp_path)))))
+
+    edit(collection)
+    refreshed = build_hierarchy(tmp_path, previous=cached)
+
+    def metadata(result) -> list[dict]:
+        return [entry.metadata for *_, collection in result.trip.iter_collections() for entry in collection.expected]
+
+    assert hierarchy_to_dict(refreshed) == hierarchy_to_dict(build_hierarchy(tmp_path))
+    assert metadata(refreshed) != metadata(cached)
+
+
+def test_absolute_metadata_paths_from_older_caches_still_load(tmp_path: Path) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "K")
+    camera_dir = tmp_path / "site1" / "puck01" / "pin1" / "K" / "camera"
+    png_bytes = base64.b64decode(
+        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGMAAQAABQABDQottAAAAABJRU5ErkJggg=="
+    )
+    (camera_dir / "loop-inter_4_000.jpeg").write_bytes(png_bytes)
+    data = hierarchy_to_dict(build_hierarchy(tmp_path))
+    camera = data["trip"]["sites"][0]["pucks"][0]["pins"][0]["collections"][0]["expected"][0]
+    camera["metadata"]["image_files"] = [str(camera_dir.resolve() / "loop-inter_4_000.jpeg")]
+
+    restored = hierarchy_from_dict(data)
+    rows = html_render.flatten_collections(restored)
+
+    assert rows[0]["camera_preview_cells"]["loop_inter_4_000"]["basename"] == "loop-inter_4_000.jpeg"
+
+
+def test_camera_images_indexed_for_preview_columns(tmp_path: Path, monkeypatch) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "L")
+    camera_dir = tmp_path / "site1" / "puck01" / "pin1" / "L" / "camera"
+    for name in ("LOOP-INTER_4_000.JPG", "loop-inter_4_090.jpeg", "raster_180.jpeg", "raster_90.png", "snap.jpeg"):
+        (camera_dir / name).write_bytes(b"")
+
+    result = build_hierarchy(tmp_path)
+    camera = result.trip.sites[0].pucks[0].pins[0].collections[0].expected[0]
+    assert camera.metadata["image_index"] == {
+        "loop": {"loop-inter_4_000": [0], "loop-inter_4_045": [], "loop-inter_4_090": [1]},
+        "raster": [[90, 3], [180, 2]],
+    }
+
+    data = json.loads(json.dumps(hierarchy_to_dict(result)))
+    expected_rows = html_render.flatten_collections(hierarchy_from_dict(data))
+    del data["trip"]["sites"][0]["pucks"][0]["pins"][0]["collections"][0]["expected"][0]["metadata"]["image_index"]
+    older_cache = hierarchy_from_dict(data)
+    assert html_render.flatten_collections(older_cache) == expected_rows
+    cells = expected_rows[0]["camera_preview_cells"]
+    assert [cell and cell["basename"] for cell in cells.values()] == [
+        "LOOP-INTER_4_000.JPG",
+        None,
+        "loop-inter_4_090.jpeg",
+        "raster_90.png",
+        "raster_180.jpeg",
+    ]
+
+    def reclassify(*args, **kwargs):
+        raise AssertionError("camera images classified again")
+
+    # Scanned hierarchies, and older caches once indexed, are not classified again.
+    monkeypatch.setattr(html_render, "index_camera_images", reclassify)
+    assert html_render.flatten_collections(result) == expected_rows
+    assert html_render.flatten_collections(older_cache) == expected_rows
+
+
+def test_symlinks_followed_only_on_request(tmp_path: Path) -> None:
+    trip = tmp_path / "trip"
+    create_collection(trip, "site1", "puck01", "pin1", "A")
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "loop-inter_4_000.jpeg").write_bytes(b"")
+    camera_dir = trip / "site1" / "puck01" / "pin1" / "A" / "camera"
+    (camera_dir / "loop-inter_4_000.jpeg").symlink_to(shared / "loop-inter_4_000.jpeg")
+
+    lexical = build_hierarchy(trip).trip.sites[0].pucks[0].pins[0].collections[0].expected[0]
+    followed = build_hierarchy(trip, follow_symlinks=True).trip.sites[0].pucks[0].pins[0].collections[0].expected[0]
+
+    assert lexical.metadata["image_files"] == ["loop-inter_4_000.jpeg"]
+    assert lexical.metadata_paths("image_files") == [str(camera_dir / "loop-inter_4_000.jpeg")]
+    assert followed.metadata["image_files"] == [str((shared / "loop-inter_4_000.jpeg").resolve())]
+
+
+def test_processing_tree_walked_once_for_summary_and_fallback(tmp_path: Path, monkeypatch) -> None:
+    from imca_report_table import traversal
+
+    processing_dir = tmp_path / "processing"
+    (processing_dir / "run2" / "xds").mkdir(parents=True)
+    (processing_dir / "run1" / "xds").mkdir(parents=True)
+    (processing_dir / "run2" / "00_summary.html").write_text("<html></html>", encoding="utf-8")
+    (processing_dir / "run1" / "00_summary.html").write_text("<html></html>", encoding="utf-8")
+    (processing_dir / "run2" / "xds" / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+    (processing_dir / "run1" / "xds" / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+
+    scanned: list[str] = []
+    real_scandir = traversal.os.scandir
+
+    def counting_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(traversal.os, "scandir", counting_scandir)
+    metadata = traversal._collect_processing_metadata(processing_dir)
+
+    assert metadata["summary_source"] == "run1/00_summary.html"
+    assert metadata["summary_image"] == "run1/xds/SPOT.XDS.SpotsPerImage.png"
+    assert len(scanned) == len(set(scanned)) == 5
+
+
+def test_preferred_processing_summary_stops_walk(tmp_path: Path) -> None:
+    from imca_report_table import traversal
+
+    processing_dir = tmp_path / "processing"
+    (processing_dir / "00_summary" / "deeper").mkdir(parents=True)
+    (processing_dir / "00_summary" / "00_summary.html").write_text("<html></html>", encoding="utf-8")
+    (processing_dir / "00_summary" / "deeper" / "00_summary.html").write_text("<html></html>", encoding="utf-8")
+
+    scan = traversal._ProcessingScan(processing_dir)
+
+    assert scan.summary() == processing_dir / "00_summary" / "00_summary.html"
+    assert not scan.complete
+
+
+def test_fallback_search_resumes_the_summary_walk(tmp_path: Path, monkeypatch) -> None:
+    from imca_report_table import traversal
+
+    processing_dir = tmp_path / "processing"
+    (processing_dir / "00_summary").mkdir(parents=True)
+    (processing_dir / "xds" / "deep").mkdir(parents=True)
+    (processing_dir / "00_summary" / "00_summary.html").write_text("<html></html>", encoding="utf-8")
+    (processing_dir / "xds" / "deep" / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+
+    scanned: list[str] = []
+    real_scandir = traversal.os.scandir
+
+    def counting_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(traversal.os, "scandir", counting_scandir)
+    metadata = traversal._collect_processing_metadata(processing_dir)
+
+    assert metadata["summary_image"] == "xds/deep/SPOT.XDS.SpotsPerImage.png"
+    assert len(scanned) == len(set(scanned)) == 4
+
+
+def test_limits_skipped_after_preferred_summary_not_reported(tmp_path: Path) -> None:
+    from imca_report_table.traversal import ScanLimits
+
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    processing_dir = tmp_path / "site1" / "puck01" / "pin1" / "A" / "processing"
+    (processing_dir / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+    (processing_dir / "00_summary.html").write_text(
+        '<img src="SPOT.XDS.SpotsPerImage.png"/>', encoding="utf-8"
+    )
+    (processing_dir / "old_runs" / "run1").mkdir(parents=True)
+
+    def processing(limits: ScanLimits) -> dict:
+        return build_hierarchy(tmp_path, limits=limits).trip.sites[0].pucks[0].pins[0].collections[0].expected[3].metadata
+
+    unbounded = processing(ScanLimits())
+    assert processing(ScanLimits(max_depth=0)) == unbounded
+    assert processing(ScanLimits(prune=("old_*",))) == unbounded
+    assert "truncated" not in unbounded
+
+
+def test_scan_limits_recorded_as_truncation(tmp_path: Path) -> None:
+    from imca_report_table.traversal import ScanLimits
+
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    collection_dir = tmp_path / "site1" / "puck01" / "pin1" / "A"
+    camera_dir = collection_dir / "camera"
+    (camera_dir / "loop-inter_4_000.jpeg").write_bytes(b"")
+    (camera_dir / "frames" / "deep").mkdir(parents=True)
+    (camera_dir / "frames" / "frame_0001.png").write_bytes(b"")
+    (camera_dir / "frames" / "deep" / "frame_0002.png").write_bytes(b"")
+    (camera_dir / "video_dump").mkdir()
+    (camera_dir / "video_dump" / "frame_0003.png").write_bytes(b"")
+    (collection_dir / "processing" / "xds").mkdir()
+
+    def expected(limits: ScanLimits) -> dict[str, dict]:
+        result = build_hierarchy(tmp_path, limits=limits)
+        collection = result.trip.sites[0].pucks[0].pins[0].collections[0]
+        return {entry.name: entry.metadata for entry in collection.expected}
+
+    metadata = expected(ScanLimits(max_depth=1, prune=("video_*",)))
+    assert metadata["camera"]["image_files"] == ["frames/frame_0001.png", "loop-inter_4_000.jpeg"]
+    assert metadata["camera"]["truncated"] == ["max_depth", "prune"]
+    assert metadata["processing"] == {}
+
+    metadata = expected(ScanLimits(max_depth=0, max_files=1))
+    assert len(metadata["camera"]["image_files"]) == 1
+    assert metadata["processing"] == {"truncated": ["max_depth"]}
+
+    unbounded = expected(ScanLimits())
+    assert len(unbounded["camera"]["image_files"]) == 4
+    assert "truncated" not in unbounded["camera"]
+
+    rows = html_render.flatten_collections(build_hierarchy(tmp_path, limits=ScanLimits(max_depth=0)))
+    assert "Scan truncated: camera (max_depth), processing (max_depth)" in rows[0]["issues"]
+
+
+def test_abuild_hierarchy_matches_build_hierarchy(tmp_path: Path) -> None:
+
+    for puck in ("puck01", "puck02", "puck03"):
+        create_collection(tmp_path, "site1", puck, "pin1", "A")
+        create_collection(tmp_path, "site2", puck, "pin2", "B")
+    (tmp_path / "site2" / "puck02" / "pin2" / "B" / "images").rmdir()
+
+    result = asyncio.run(abuild_hierarchy(tmp_path, concurrency=2))
+
+    assert hierarchy_to_dict(result) == hierarchy_to_dict(build_hierarchy(tmp_path))
+    assert result.all_expected_present is False
+
+
+def test_abuild_hierarchy_cancellation_stops_remaining_pucks(tmp_path: Path) -> None:
+    for puck in ("puck01", "puck02", "puck03"):
+        create_collection(tmp_path, "site1", puck, "pin1", "A")
+    started = threading.Event()
+    release = threading.Event()
+    pucks: list[str] = []
+    collections: list[str] = []
+
+    def logger(message: str) -> None:
+        if "Processing puck" in message:
+            pucks.append(message)
+            started.set()
+            release.wait(5)
+        elif "analysing expected folders" in message:
+            collections.append(message)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(abuild_hierarchy(tmp_path, logger=logger, concurrency=1))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        try:
+            await task
+        finally:
+            release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(scenario())
+    assert len(pucks) == 1
+    assert collections == []
+
+
+def test_process_pool_metadata_matches_serial(tmp_path: Path) -> None:
+    from imca_report_table.traversal import ScanLimits
+
+    for pin, letter in (("pin1", "A"), ("pin1", "B"), ("pin2", "A")):
+        create_collection(tmp_path, "site1", "puck01", pin, letter)
+        collection_dir = tmp_path / "site1" / "puck01" / pin / letter
+        (collection_dir / "camera" / "loop-inter_4_000.jpeg").write_bytes(b"")
+        processing_dir = collection_dir / "processing"
+        (processing_dir / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+        (processing_dir / "00_summary.html").write_text(
+            '<img src="SPOT.XDS.SpotsPerImage.png"/>', encoding="utf-8"
+        )
+    limits = ScanLimits(max_files=10)
+
+    serial = build_hierarchy(tmp_path, limits=limits)
+    pooled = build_hierarchy(tmp_path, limits=limits, metadata_processes=2)
+
+    assert hierarchy_to_dict(pooled) == hierarchy_to_dict(serial)
+    processing = pooled.trip.sites[0].pucks[0].pins[0].collections[0].expected[3]
+    assert processing.metadata["summary_image"] == "SPOT.XDS.SpotsPerImage.png"
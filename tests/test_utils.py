@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pickle
+import zlib
+from pathlib import Path
+
+import pytest
+
+from imca_report_table.traversal import build_hierarchy
+from imca_report_table.utils import (
+    hierarchy_to_dict,
+    load_hierarchy,
+    load_hierarchy_binary,
+    write_hierarchy,
+)
+
+
+@pytest.fixture
+def trip(tmp_path: Path, create_collection) -> Path:
+    trip = tmp_path / "trip"
+    base = create_collection(trip, "site1", "puck01", "pin1", "A")
+    (base / "camera" / "loop-inter_4_000.jpeg").write_bytes(b"")
+    (trip / "site1" / "puck01" / "pin2").mkdir()
+    return trip
+
+
+def test_binary_cache_round_trip(tmp_path: Path, trip: Path) -> None:
+    result = build_hierarchy(trip)
+
+    binary_path = write_hierarchy(tmp_path / "cache.imcache", result)
+    json_path = write_hierarchy(tmp_path / "cache.json", result)
+
+    assert binary_path.read_bytes().startswith(b"IMCAHIER")
+    assert binary_path.stat().st_size < json_path.stat().st_size
+    assert hierarchy_to_dict(load_hierarchy(binary_path)) == hierarchy_to_dict(result)
+    assert hierarchy_to_dict(load_hierarchy(json_path)) == hierarchy_to_dict(result)
+
+
+def test_binary_format_selected_explicitly_and_detected_on_load(tmp_path: Path, trip: Path) -> None:
+    result = build_hierarchy(trip)
+
+    path = write_hierarchy(tmp_path / "cache.json", result, cache_format="binary")
+
+    assert path.read_bytes().startswith(b"IMCAHIER")
+    assert load_hierarchy(path).trip.name == result.trip.name
+    with pytest.raises(ValueError):
+        write_hierarchy(tmp_path / "cache.bin", result, cache_format="yaml")
+
+
+def test_binary_cache_rejects_arbitrary_objects(tmp_path: Path) -> None:
+    path = tmp_path / "evil.imcache"
+    path.write_bytes(b"IMCAHIER\x01" + zlib.compress(pickle.dumps({"trip": Path("/tmp")})))
+
+    with pytest.raises(pickle.UnpicklingError):
+        load_hierarchy_binary(path)
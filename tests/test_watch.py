@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from imca_report_table import watch
+from imca_report_table.traversal import build_hierarchy
+from imca_report_table.utils import hierarchy_to_dict
+from imca_report_table.watch import TripWatcher, snapshot_mtimes, watch_trip
+
+
+def test_apply_rescans_only_affected_pin(tmp_path: Path, create_collection) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    create_collection(tmp_path, "site1", "puck01", "pin2", "A")
+    result = build_hierarchy(tmp_path)
+    puck = result.trip.sites[0].pucks[0]
+    pin2 = puck.pins[1]
+    messages: list[str] = []
+
+    new_collection = create_collection(tmp_path, "site1", "puck01", "pin1", "B")
+    (new_collection / "images").rmdir()
+    changed = TripWatcher(result, logger=messages.append).apply([new_collection, new_collection / "camera"])
+
+    assert changed == 1
+    assert puck.pins[1] is pin2
+    assert [collection.name for collection in puck.pins[0].collections] == ["A", "B"]
+    assert [message.strip() for message in messages if "Collection" in message] == [
+        "Collection A: unchanged, reusing cached scan",
+        "Collection B: analysing expected folders",
+    ]
+    assert result.all_expected_present is False
+    assert hierarchy_to_dict(result) == hierarchy_to_dict(build_hierarchy(tmp_path))
+
+
+def test_apply_picks_up_new_and_removed_pucks(tmp_path: Path, create_collection) -> None:
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    create_collection(tmp_path, "site1", "puck02", "pin1", "A")
+    result = build_hierarchy(tmp_path)
+
+    create_collection(tmp_path, "site2", "puck03", "pin7", "C")
+    for child in sorted((tmp_path / "site1" / "puck02").rglob("*"), reverse=True):
+        child.rmdir()
+    (tmp_path / "site1" / "puck02").rmdir()
+    changed = TripWatcher(result).apply([tmp_path / "site2", tmp_path / "site1" / "puck02"])
+
+    assert changed == 2
+    assert hierarchy_to_dict(result) == hierarchy_to_dict(build_hierarchy(tmp_path))
+
+
+def test_snapshot_covers_nested_processing_directories(tmp_path: Path, create_collection) -> None:
+    base = create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    (base / "processing" / "xds").mkdir()
+
+    mtimes = snapshot_mtimes(build_hierarchy(tmp_path))
+
+    assert str(base / "processing") in mtimes
+    assert str(base / "processing" / "xds") in mtimes
+    assert str(base / "images") in mtimes
+
+
+def test_polling_stats_without_listing_and_sees_nested_results(tmp_path: Path, monkeypatch, create_collection) -> None:
+    base = create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    run_dir = base / "processing" / "xds_run1"
+    run_dir.mkdir()
+    watcher = TripWatcher(build_hierarchy(tmp_path))
+    stop = threading.Event()
+    listed: list[str] = []
+    real_scandir = watch.os.scandir
+
+    def counting_scandir(path):
+        listed.append(path)
+        return real_scandir(path)
+
+    def flush(paths: set[str]) -> None:
+        watcher.apply(paths)
+        stop.set()
+
+    monkeypatch.setattr(watch.os, "scandir", counting_scandir)
+    thread = threading.Thread(target=watch._poll_changes, args=(watcher, flush, stop, 0.05, 0.1))
+    thread.start()
+    try:
+        threading.Event().wait(0.3)
+        assert listed == []
+        (run_dir / "SPOT.XDS.SpotsPerImage.png").write_bytes(b"")
+        (run_dir / "00_summary.html").write_text('<img src="SPOT.XDS.SpotsPerImage.png"/>', encoding="utf-8")
+        thread.join(10)
+    finally:
+        stop.set()
+        thread.join()
+
+    processing = watcher.result.trip.sites[0].pucks[0].pins[0].collections[0].expected[3]
+    assert processing.metadata["summary_source"] == "xds_run1/00_summary.html"
+    assert hierarchy_to_dict(watcher.result) == hierarchy_to_dict(build_hierarchy(tmp_path))
+
+
+@pytest.mark.parametrize("use_polling", [True, False])
+def test_watch_trip_reports_new_collections(tmp_path: Path, use_polling: bool, create_collection) -> None:
+    if not use_polling and watch._observer_class() is None:
+        pytest.skip("watchdog not installed")
+    create_collection(tmp_path, "site1", "puck01", "pin1", "A")
+    watcher = TripWatcher(build_hierarchy(tmp_path))
+    stop = threading.Event()
+    updates: list[int] = []
+
+    def on_update(result, changed: int) -> None:
+        updates.append(changed)
+        stop.set()
+
+    thread = threading.Thread(
+        target=watch_trip,
+        args=(watcher, on_update),
+        kwargs={"poll_interval": 0.05, "debounce": 0.1, "use_polling": use_polling, "stop": stop},
+    )
+    thread.start()
+    try:
+        threading.Event().wait(0.3)
+        create_collection(tmp_path, "site1", "puck01", "pin1", "B")
+        thread.join(10)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert updates == [1]
+    assert [c.name for c in watcher.result.trip.sites[0].pucks[0].pins[0].collections] == ["A", "B"]